@@ -14,18 +14,91 @@ API_RELOAD: bool = (os.getenv("API_RELOAD").upper() or "TRUE") in ("TRUE", "YES"
 REDIS_HOST: str = os.getenv("REDIS_HOST") or "0.0.0.0"
 REDIS_PORT: int = int(os.getenv("REDIS_PORT") or 6379)
 REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD") or None
+REDIS_SOCKET_PATH: Optional[str] = os.getenv("REDIS_SOCKET_PATH") or None
+
+REDIS_REPLICAS: list[str] = [
+    endpoint.strip() for endpoint in (os.getenv("REDIS_REPLICAS") or "").split(",") if endpoint.strip()
+]
+REDIS_REPLICA_MAX_LAG: int = int(os.getenv("REDIS_REPLICA_MAX_LAG") or 10)
+
+REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS") or 50)
+REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT") or 2.0)
+REDIS_SOCKET_CONNECT_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT") or 2.0)
+REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL") or 30)
+REDIS_RECONNECT_INTERVAL: int = int(os.getenv("REDIS_RECONNECT_INTERVAL") or 5)
 
 REDIS_STOCK_INTERVAL: int = int(os.getenv("REDIS_STOCK_INTERVAL") or 900)
 REDIS_CRYPTO_INTERVAL: int = int(os.getenv("REDIS_CRYPTO_INTERVAL") or 300)
 REDIS_STEAM_INTERVAL: int = int(os.getenv("REDIS_STEAM_INTERVAL") or 900)
 
+REDIS_STOCK_META_INTERVAL: int = int(os.getenv("REDIS_STOCK_META_INTERVAL") or 7 * 86400)
 REDIS_STOCK_HISTORY_INTERVAL: int = int(os.getenv("REDIS_STOCK_HISTORY_INTERVAL") or 86400)
 REDIS_CRYPTO_HISTORY_INTERVAL: int = int(os.getenv("REDIS_CRYPTO_HISTORY_INTERVAL") or 86400)
 REDIS_STEAM_HISTORY_INTERVAL: int = int(os.getenv("REDIS_STEAM_HISTORY_INTERVAL") or 86400)
 
+REDIS_NOT_FOUND_INTERVAL: int = int(os.getenv("REDIS_NOT_FOUND_INTERVAL") or 300)
+
+REDIS_STALE_FACTOR: float = float(os.getenv("REDIS_STALE_FACTOR") or 2.0)
+REDIS_TTL_JITTER: float = float(os.getenv("REDIS_TTL_JITTER") or 0.1)
+
+REDIS_CACHE_CODEC: str = os.getenv("REDIS_CACHE_CODEC") or "json"
+REDIS_CACHE_COMPRESSION: str = os.getenv("REDIS_CACHE_COMPRESSION") or "zlib"
+REDIS_CACHE_COMPRESS_MIN_BYTES: int = int(os.getenv("REDIS_CACHE_COMPRESS_MIN_BYTES") or 4096)
+
+REDIS_SCHEMA_VERSIONING: bool = (os.getenv("REDIS_SCHEMA_VERSIONING") or "TRUE").upper() in ("TRUE", "YES", "ON", "1")
+REDIS_SCHEMA_DUAL_READ_SECONDS: int = int(os.getenv("REDIS_SCHEMA_DUAL_READ_SECONDS") or 86400)
+REDIS_SCHEMA_REGISTRY_REFRESH: int = int(os.getenv("REDIS_SCHEMA_REGISTRY_REFRESH") or 300)
+
+REDIS_HISTORY_STORAGE: str = (os.getenv("REDIS_HISTORY_STORAGE") or "blob").lower()
+REDIS_SPOT_STORAGE: str = (os.getenv("REDIS_SPOT_STORAGE") or "keys").lower()
+REDIS_TRUSTED_DECODE: bool = (os.getenv("REDIS_TRUSTED_DECODE") or "TRUE").upper() in ("TRUE", "YES", "ON", "1")
+
+REDIS_CLIENT_TRACKING: bool = (os.getenv("REDIS_CLIENT_TRACKING") or "FALSE").upper() in ("TRUE", "YES", "ON", "1")
+
+REDIS_WRITE_BEHIND: bool = (os.getenv("REDIS_WRITE_BEHIND") or "TRUE").upper() in ("TRUE", "YES", "ON", "1")
+REDIS_WRITE_BEHIND_MAX_PENDING: int = int(os.getenv("REDIS_WRITE_BEHIND_MAX_PENDING") or 10000)
+REDIS_WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("REDIS_WRITE_BEHIND_BATCH_SIZE") or 200)
+
+REDIS_FETCH_LEASE_MS: int = int(os.getenv("REDIS_FETCH_LEASE_MS") or 10000)
+REDIS_FETCH_LEASE_WAIT_MS: int = int(os.getenv("REDIS_FETCH_LEASE_WAIT_MS") or 5000)
+REDIS_FETCH_LEASE_POLL_MS: int = int(os.getenv("REDIS_FETCH_LEASE_POLL_MS") or 100)
+
 CRYPTO_HISTORY_PERIOD: int = int(os.getenv("CRYPTO_HISTORY_PERIOD") or 365)
+YFINANCE_MAX_WORKERS: int = int(os.getenv("YFINANCE_MAX_WORKERS") or 8)
+YFINANCE_MAX_QUEUE: int = int(os.getenv("YFINANCE_MAX_QUEUE") or 64)
+STOCK_BATCH_WINDOW_MS: int = int(os.getenv("STOCK_BATCH_WINDOW_MS") or 20)
+STOCK_BATCH_MAX_SIZE: int = int(os.getenv("STOCK_BATCH_MAX_SIZE") or 50)
 STOCK_HISTORY_PERIOD: str = os.getenv("STOCK_HISTORY_PERIOD") or "max"
+HISTORY_INCREMENTAL_REFRESH: bool = (os.getenv("HISTORY_INCREMENTAL_REFRESH") or "TRUE").upper() in ("TRUE", "YES", "ON", "1")
+HISTORY_INCREMENTAL_OVERLAP_DAYS: int = int(os.getenv("HISTORY_INCREMENTAL_OVERLAP_DAYS") or 3)
+STOCK_HISTORY_REBUILD_DAYS: int = int(os.getenv("STOCK_HISTORY_REBUILD_DAYS") or 7)
+STOCK_HISTORY_OVERLAP_TOLERANCE: float = float(os.getenv("STOCK_HISTORY_OVERLAP_TOLERANCE") or 0.0001)
+HISTORY_SLICE_WINDOWS: list[int] = [
+    int(days) for days in os.getenv("HISTORY_SLICE_WINDOWS", "7,30,90,365").split(",") if days.strip()
+]
 
 STOCK_PROVIDER_NAME: str = os.getenv("STOCK_PROVIDER_NAME") or "Yahoo Finance API"
 CRYPTO_PROVIDER_NAME: str = os.getenv("CRYPTO_PROVIDER_NAME") or "Coin Gecko API"
-STEAM_PROVIDER_NAME: str = os.getenv("STEAM_PROVIDER_NAME") or "Steam Market"
\ No newline at end of file
+STEAM_PROVIDER_NAME: str = os.getenv("STEAM_PROVIDER_NAME") or "Steam Market"
+
+REDIS_L1_ENABLED: bool = (os.getenv("REDIS_L1_ENABLED") or "TRUE").upper() in ("TRUE", "YES", "ON", "1")
+REDIS_L1_MAX_ENTRIES: int = int(os.getenv("REDIS_L1_MAX_ENTRIES") or 2048)
+# Estimated memory of the decoded models; REDIS_L1_MAX_BYTES is the former name.
+REDIS_L1_MAX_MEMORY: int = int(
+    os.getenv("REDIS_L1_MAX_MEMORY") or os.getenv("REDIS_L1_MAX_BYTES") or 32 * 1024 * 1024
+)
+REDIS_L1_STOCK_INTERVAL: int = int(os.getenv("REDIS_L1_STOCK_INTERVAL") or 30)
+REDIS_L1_CRYPTO_INTERVAL: int = int(os.getenv("REDIS_L1_CRYPTO_INTERVAL") or 30)
+REDIS_L1_STEAM_INTERVAL: int = int(os.getenv("REDIS_L1_STEAM_INTERVAL") or 60)
+REDIS_L1_HISTORY_INTERVAL: int = int(os.getenv("REDIS_L1_HISTORY_INTERVAL") or 300)
+
+REDIS_FALLBACK_MAX_ENTRIES: int = int(os.getenv("REDIS_FALLBACK_MAX_ENTRIES") or 10000)
+REDIS_FALLBACK_MAX_MEMORY: int = int(
+    os.getenv("REDIS_FALLBACK_MAX_MEMORY") or os.getenv("REDIS_FALLBACK_MAX_BYTES") or 64 * 1024 * 1024
+)
+
+CACHE_SNAPSHOT_PATH: Optional[str] = os.getenv("CACHE_SNAPSHOT_PATH") or None
+CACHE_SNAPSHOT_MAX_KEYS: int = int(os.getenv("CACHE_SNAPSHOT_MAX_KEYS") or 50000)
+
+ADMIN_API_KEY: Optional[str] = os.getenv("ADMIN_API_KEY") or None
+CACHE_STATS_SAMPLE_SIZE: int = int(os.getenv("CACHE_STATS_SAMPLE_SIZE") or 1000)
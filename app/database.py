@@ -1,58 +1,1351 @@
-from typing import TypeVar
+import json
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Generic, NamedTuple, TypeVar
 
 import redis.asyncio as aioredis
 from pydantic import BaseModel
+from pydantic_core import from_json
+from redis.exceptions import ConnectionError as RedisConnectionError, MaxConnectionsError
 
-from app.config import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
+from app.config import (
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_PASSWORD,
+    REDIS_SOCKET_PATH,
+    REDIS_REPLICAS,
+    REDIS_REPLICA_MAX_LAG,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_RECONNECT_INTERVAL,
+    REDIS_CLIENT_TRACKING,
+    REDIS_STOCK_INTERVAL,
+    REDIS_CRYPTO_INTERVAL,
+    REDIS_STEAM_INTERVAL,
+    REDIS_STOCK_HISTORY_INTERVAL,
+    REDIS_CRYPTO_HISTORY_INTERVAL,
+    REDIS_STEAM_HISTORY_INTERVAL,
+    REDIS_NOT_FOUND_INTERVAL,
+    REDIS_FALLBACK_MAX_ENTRIES,
+    REDIS_FALLBACK_MAX_MEMORY,
+    REDIS_L1_ENABLED,
+    REDIS_L1_MAX_ENTRIES,
+    REDIS_L1_MAX_MEMORY,
+    REDIS_L1_STOCK_INTERVAL,
+    REDIS_L1_CRYPTO_INTERVAL,
+    REDIS_L1_STEAM_INTERVAL,
+    REDIS_L1_HISTORY_INTERVAL,
+    REDIS_STALE_FACTOR,
+    REDIS_TTL_JITTER,
+    REDIS_CACHE_CODEC,
+    REDIS_CACHE_COMPRESSION,
+    REDIS_CACHE_COMPRESS_MIN_BYTES,
+    REDIS_HISTORY_STORAGE,
+    REDIS_SPOT_STORAGE,
+    REDIS_TRUSTED_DECODE,
+    REDIS_SCHEMA_VERSIONING,
+    REDIS_SCHEMA_DUAL_READ_SECONDS,
+    REDIS_SCHEMA_REGISTRY_REFRESH,
+    REDIS_WRITE_BEHIND,
+    REDIS_WRITE_BEHIND_MAX_PENDING,
+    REDIS_WRITE_BEHIND_BATCH_SIZE,
+    HISTORY_SLICE_WINDOWS,
+)
+from app.schemas.history_responses import HistoryPoint
+from app.utils.cache_codec import EntryCodec, build_entry_codec
+from app.utils.cache_schema import (
+    SchemaRegistry,
+    schema_version,
+    unversioned_key,
+    versioned_key,
+)
+from app.utils.cache_tracking import ClientTracking
+from app.utils.history_points import construct_point, filter_points_by_days
 from app.utils.logging import logger
+from app.utils.metrics import metrics
+from app.utils.redis_replicas import ReplicaRouter
+from app.utils.write_behind import Write, WriteBehindQueue
 
 T = TypeVar("T", bound=BaseModel)
 
+HISTORY_KEY_MARKER = ":history:"
+META_KEY_MARKER = ":meta:"
+LEASE_KEY_PREFIX = "lease:"
+NOT_FOUND_KEY_PREFIX = "missing:"
+
+TRACKED_KEY_PREFIXES = ["stock:", "coin:", "steam:", NOT_FOUND_KEY_PREFIX]
+
+HISTORY_STORAGE_BLOB = "blob"
+HISTORY_STORAGE_ZSET = "zset"
+
+SPOT_STORAGE_KEYS = "keys"
+SPOT_STORAGE_HASH = "hash"
+SPOT_HASH_SUFFIX = ":prices"
+
+DECODE_SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+VALUE_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+# Measured with tracemalloc for pydantic v2 models: one HistoryPoint with its
+# datetime and floats, and a spot response with its strings.
+MODEL_MEMORY_BYTES = 640
+POINT_MEMORY_BYTES = 576
+
+
+def model_memory(model: BaseModel) -> int:
+    """Approximate resident size of a decoded model, dominated by its history points."""
+    points = getattr(model, "points", None) or ()
+    return MODEL_MEMORY_BYTES + POINT_MEMORY_BYTES * len(points)
+
+
+class LocalCache:
+    """Per-process LRU cache of decoded models that sits in front of Redis.
+
+    Entries expire after the TTL configured for their key prefix, capped by the
+    time the Redis entry stays fresh, and the least recently used entries are
+    evicted once either the entry count or the memory budget is exceeded. The
+    memory of an entry is the ``size`` it was set with, ``model_memory`` for
+    the entries ``RedisClient`` keeps.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_memory: int,
+        prefix_ttls: dict[str, int],
+        history_ttl: int,
+    ):
+        self._max_entries = max_entries
+        self._max_memory = max_memory
+        self._prefix_ttls = prefix_ttls
+        self._history_ttl = history_ttl
+        self._entries: OrderedDict[str, tuple[float, BaseModel, int]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def ttl_for(self, cache_key: str) -> int:
+        if HISTORY_KEY_MARKER in cache_key:
+            return self._history_ttl
+        return self._prefix_ttls.get(cache_key.split(":", 1)[0], 0)
+
+    def get(self, cache_key: str, model_cls: type[T]) -> T | None:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, model, _ = entry
+        if expires_at <= time.monotonic() or not isinstance(model, model_cls):
+            self.pop(cache_key)
+            return None
+
+        self._entries.move_to_end(cache_key)
+        return model
+
+    def set(
+        self, cache_key: str, model: BaseModel, size: int, ttl: float, capped: bool = True
+    ) -> None:
+        """Keep ``model`` for ``ttl`` seconds, or less when its prefix TTL is shorter.
+
+        ``capped=False`` skips the prefix TTL, for entries that are dropped on
+        invalidation instead of going stale.
+        """
+        if capped:
+            ttl = min(self.ttl_for(cache_key), ttl)
+        if ttl <= 0 or size > self._max_memory:
+            self.pop(cache_key)
+            return
+
+        self.pop(cache_key)
+        self._entries[cache_key] = (time.monotonic() + ttl, model, size)
+        self._size += size
+
+        while len(self._entries) > self._max_entries or self._size > self._max_memory:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def entries(self) -> list[tuple[str, BaseModel, float]]:
+        """Live entries with their remaining TTL, least recently used first."""
+        now = time.monotonic()
+        return [
+            (cache_key, model, expires_at - now)
+            for cache_key, (expires_at, model, _) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def pop(self, cache_key: str) -> None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def pop_where(self, predicate: Callable[[str], bool]) -> None:
+        for cache_key in [key for key in self._entries if predicate(key)]:
+            self.pop(cache_key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+def build_local_cache() -> LocalCache | None:
+    if not REDIS_L1_ENABLED:
+        return None
+    return LocalCache(
+        max_entries=REDIS_L1_MAX_ENTRIES,
+        max_memory=REDIS_L1_MAX_MEMORY,
+        prefix_ttls={
+            "stock": REDIS_L1_STOCK_INTERVAL,
+            "coin": REDIS_L1_CRYPTO_INTERVAL,
+            "steam": REDIS_L1_STEAM_INTERVAL,
+            "missing": REDIS_NOT_FOUND_INTERVAL,
+        },
+        history_ttl=REDIS_L1_HISTORY_INTERVAL,
+    )
+
+
+SPOT_TTLS = {
+    "stock": REDIS_STOCK_INTERVAL,
+    "coin": REDIS_CRYPTO_INTERVAL,
+    "steam": REDIS_STEAM_INTERVAL,
+}
+
+
+def build_fallback_cache() -> LocalCache:
+    """In-memory cache used in place of Redis while it is unreachable."""
+    return LocalCache(
+        max_entries=REDIS_FALLBACK_MAX_ENTRIES,
+        max_memory=REDIS_FALLBACK_MAX_MEMORY,
+        prefix_ttls={**SPOT_TTLS, "missing": REDIS_NOT_FOUND_INTERVAL},
+        history_ttl=max(
+            REDIS_STOCK_HISTORY_INTERVAL,
+            REDIS_CRYPTO_HISTORY_INTERVAL,
+            REDIS_STEAM_HISTORY_INTERVAL,
+        ),
+    )
+
+
+def build_redis(endpoint: str | None = None) -> aioredis.Redis:
+    """Connect to the primary, or to ``endpoint`` given as ``host[:port]``."""
+    options = {
+        "password": REDIS_PASSWORD,
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": REDIS_SOCKET_CONNECT_TIMEOUT,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+    }
+    if endpoint is not None:
+        host, _, port = endpoint.rpartition(":")
+        if not host:
+            host, port = endpoint, REDIS_PORT
+        return aioredis.Redis(host=host, port=int(port), **options)
+    if REDIS_SOCKET_PATH:
+        return aioredis.Redis(unix_socket_path=REDIS_SOCKET_PATH, **options)
+    return aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, **options)
+
+
+class NotFoundEntry(BaseModel):
+    detail: str
+
+
+class CacheEntry(NamedTuple, Generic[T]):
+    value: T
+    stale: bool
+
+
+def soft_ttl(ttl: int) -> float:
+    """Spread expiries of keys written together by ``REDIS_TTL_JITTER``."""
+    return ttl * random.uniform(1 - REDIS_TTL_JITTER, 1 + REDIS_TTL_JITTER)
+
+
+def hard_ttl(soft: float) -> int:
+    return max(math.ceil(soft * REDIS_STALE_FACTOR), 1)
+
+
+def history_points_key(cache_key: str) -> str:
+    return f"{cache_key}:points"
+
+
+def history_meta_key(cache_key: str) -> str:
+    return f"{cache_key}:meta"
+
+
+def history_slice_key(cache_key: str, days: int) -> str:
+    return f"{cache_key}:{days}d"
+
+
+def cache_key_prefix(key: str) -> str:
+    """Metric label of a cache key: its asset class, or ``{class}:history`` / ``{class}:meta``."""
+    head, _, rest = key.partition(":")
+    kind = rest.partition(":")[0]
+    return f"{head}:{kind}" if kind in ("history", "meta") else head
+
+
+def local_cache_key(key: str) -> str:
+    """Map a Redis key, versioned or a history sorted set part, to its L1 key."""
+    for suffix in (":points", ":meta"):
+        if key.endswith(suffix):
+            key = key.removesuffix(suffix)
+            break
+    return unversioned_key(key)
+
+
+def _encode_point(point: HistoryPoint) -> bytes:
+    return json.dumps(
+        [point.timestamp.isoformat(), point.price, point.volume], separators=(",", ":")
+    ).encode()
+
+
+def _decode_point(member: bytes) -> HistoryPoint:
+    timestamp, price, volume = json.loads(member)
+    return HistoryPoint(
+        timestamp=datetime.fromisoformat(timestamp), price=price, volume=volume
+    )
+
+
+def _construct_points(members: list[bytes]) -> list[HistoryPoint]:
+    """Decode members written by ``_encode_point`` in one parse, without validation."""
+    if not members:
+        return []
+    fromisoformat = datetime.fromisoformat
+    return [
+        construct_point(fromisoformat(timestamp), price, volume)
+        for timestamp, price, volume in from_json(b"[" + b",".join(members) + b"]")
+    ]
+
+
+def _construct_history(model_cls: type[T], data: dict) -> T:
+    """Build a history model from its parsed cache body, its points without validation."""
+    fromisoformat = datetime.fromisoformat
+    points = [
+        construct_point(fromisoformat(point["timestamp"]), point["price"], point.get("volume"))
+        for point in data.pop("points", ())
+    ]
+    return model_cls.model_validate(data).model_copy(update={"points": points})
+
 
 class RedisClient:
-    def __init__(self):
-        self._client = aioredis.Redis(
-            host=REDIS_HOST,
-            port=REDIS_PORT,
-            password=REDIS_PASSWORD,
-            decode_responses=True,
+    """Redis cache with an in-process L1 in front of it.
+
+    When a command fails to reach Redis, or ``test_connection`` gets no answer,
+    the client switches to an in-memory fallback cache and skips Redis until a
+    later ``test_connection`` succeeds.
+
+    With schema versioning, every Redis key is suffixed with the schema version
+    of its model, and a missing key falls back to the newest peer version that
+    still validates, so workers on different schemas never overwrite each other.
+
+    With read replicas, cache reads go round-robin to the healthy replicas and
+    fall back to the primary on errors and misses; writes, leases and the
+    schema registry always use the primary.
+    """
+
+    def __init__(
+        self,
+        local_cache: LocalCache | None = None,
+        entry_codec: EntryCodec | None = None,
+        history_storage: str | None = None,
+        schema_versioning: bool | None = None,
+        trusted_decode: bool | None = None,
+        history_slices: list[int] | None = None,
+        write_behind: bool | None = None,
+        client_tracking: bool | None = None,
+        replicas: list[str] | None = None,
+        spot_storage: str | None = None,
+    ):
+        self._client = build_redis()
+        replicas = REDIS_REPLICAS if replicas is None else replicas
+        self._replicas = (
+            ReplicaRouter([build_redis(endpoint) for endpoint in replicas], REDIS_REPLICA_MAX_LAG)
+            if replicas
+            else None
+        )
+        self._available = True
+        self._fallback_cache = build_fallback_cache()
+        self._local_cache = local_cache if local_cache is not None else build_local_cache()
+        self._codec = entry_codec or build_entry_codec(
+            REDIS_CACHE_CODEC, REDIS_CACHE_COMPRESSION, REDIS_CACHE_COMPRESS_MIN_BYTES
+        )
+        if schema_versioning is None:
+            schema_versioning = REDIS_SCHEMA_VERSIONING
+        self._schema_registry = (
+            SchemaRegistry(REDIS_SCHEMA_DUAL_READ_SECONDS, REDIS_SCHEMA_REGISTRY_REFRESH)
+            if schema_versioning
+            else None
+        )
+        self._history_storage = history_storage or REDIS_HISTORY_STORAGE
+        if self._history_storage not in (HISTORY_STORAGE_BLOB, HISTORY_STORAGE_ZSET):
+            logger.warning(
+                f"Unknown history storage {self._history_storage}, using {HISTORY_STORAGE_BLOB}"
+            )
+            self._history_storage = HISTORY_STORAGE_BLOB
+        self._spot_storage = spot_storage or REDIS_SPOT_STORAGE
+        if self._spot_storage not in (SPOT_STORAGE_KEYS, SPOT_STORAGE_HASH):
+            logger.warning(f"Unknown spot storage {self._spot_storage}, using {SPOT_STORAGE_KEYS}")
+            self._spot_storage = SPOT_STORAGE_KEYS
+        self._trusted_decode = REDIS_TRUSTED_DECODE if trusted_decode is None else trusted_decode
+        self._history_slices = sorted(
+            set(HISTORY_SLICE_WINDOWS if history_slices is None else history_slices)
+        )
+        if write_behind is None:
+            write_behind = REDIS_WRITE_BEHIND
+        self._write_behind = (
+            WriteBehindQueue(
+                self._flush_writes, REDIS_WRITE_BEHIND_MAX_PENDING, REDIS_WRITE_BEHIND_BATCH_SIZE
+            )
+            if write_behind
+            else None
+        )
+        if client_tracking is None:
+            client_tracking = REDIS_CLIENT_TRACKING
+        self._tracking = (
+            ClientTracking(
+                TRACKED_KEY_PREFIXES,
+                self._invalidate,
+                REDIS_HEALTH_CHECK_INTERVAL,
+                REDIS_RECONNECT_INTERVAL,
+            )
+            if client_tracking and self._local_cache is not None
+            else None
         )
 
     @property
     def client(self):
         return self._client
 
+    @property
+    def local_cache(self) -> LocalCache | None:
+        return self._local_cache
+
+    @property
+    def codec(self) -> EntryCodec:
+        return self._codec
+
+    @property
+    def history_storage(self) -> str:
+        return self._history_storage
+
+    @property
+    def spot_storage(self) -> str:
+        return self._spot_storage
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def fallback_cache(self) -> LocalCache:
+        return self._fallback_cache
+
+    @property
+    def write_behind(self) -> WriteBehindQueue | None:
+        return self._write_behind
+
+    @property
+    def tracking(self) -> ClientTracking | None:
+        return self._tracking
+
+    @property
+    def replicas(self) -> ReplicaRouter | None:
+        return self._replicas
+
+    def _replica(self) -> aioredis.Redis | None:
+        return self._replicas.reader() if self._replicas is not None else None
+
+    async def _get(self, key: str) -> bytes | None:
+        """GET from a replica, or from the primary when none is usable or it misses."""
+        replica = self._replica()
+        if replica is not None:
+            try:
+                cache = await replica.get(key)
+                if cache:
+                    return cache
+            except Exception as e:
+                self._replicas.mark_down(replica, str(e))
+        return await self._client.get(key)
+
+    async def _hmget(self, key: str, fields: list[str]) -> list[bytes | None]:
+        replica = self._replica()
+        if replica is None:
+            return await self._client.hmget(key, fields)
+        try:
+            values = await replica.hmget(key, fields)
+        except Exception as e:
+            self._replicas.mark_down(replica, str(e))
+            return await self._client.hmget(key, fields)
+
+        missing = [index for index, cache in enumerate(values) if not cache]
+        if missing:
+            retried = await self._client.hmget(key, [fields[index] for index in missing])
+            for index, cache in zip(missing, retried):
+                values[index] = cache
+        return values
+
+    async def _mget(self, keys: list[str]) -> list[bytes | None]:
+        replica = self._replica()
+        if replica is None:
+            return await self._client.mget(keys)
+        try:
+            values = await replica.mget(keys)
+        except Exception as e:
+            self._replicas.mark_down(replica, str(e))
+            return await self._client.mget(keys)
+
+        # A miss on a replica may only be replication lag, so ask the primary.
+        missing = [index for index, cache in enumerate(values) if not cache]
+        if missing:
+            retried = await self._client.mget([keys[index] for index in missing])
+            for index, cache in zip(missing, retried):
+                values[index] = cache
+        return values
+
+    def _invalidate(self, keys: list[str] | None) -> None:
+        """Drop L1 entries whose Redis keys were written, or all of them on ``None``."""
+        if keys is None:
+            self._local_cache.clear()
+            return
+        for key in keys:
+            cache_key = local_cache_key(key)
+            self._local_cache.pop(cache_key)
+            if HISTORY_KEY_MARKER in cache_key:
+                # Sorted-set windows are cached locally as {key}:{days}d.
+                self._local_cache.pop_where(lambda local: local.startswith(f"{cache_key}:"))
+            elif cache_key.endswith(SPOT_HASH_SUFFIX):
+                # Any field of the hash may have changed.
+                prefix = f"{cache_key.removesuffix(SPOT_HASH_SUFFIX)}:"
+                self._local_cache.pop_where(
+                    lambda local: local.startswith(prefix) and HISTORY_KEY_MARKER not in local
+                )
+
+    def _set_available(self, available: bool) -> None:
+        if available == self._available:
+            return
+        self._available = available
+        if available:
+            self._fallback_cache.clear()
+            logger.info("Redis storage found, leaving in-memory fallback cache")
+        else:
+            logger.warning("Redis storage not found, caching in memory until it is back")
+
+    def _handle_error(self, e: Exception) -> None:
+        if isinstance(e, RedisConnectionError) and not isinstance(e, MaxConnectionsError):
+            self._set_available(False)
+
+    @staticmethod
+    def _count_errors(cache_keys: list[str]) -> None:
+        for prefix in {cache_key_prefix(cache_key) for cache_key in cache_keys}:
+            metrics.increment("cache_errors", prefix=prefix)
+
+    @staticmethod
+    def _count_read(cache_key: str, entry: CacheEntry | None) -> None:
+        prefix = cache_key_prefix(cache_key)
+        if entry is None:
+            metrics.increment("cache_misses", prefix=prefix)
+            return
+        metrics.increment("cache_hits", prefix=prefix)
+        if entry.stale:
+            metrics.increment("cache_stale_hits", prefix=prefix)
+
     async def test_connection(self) -> bool:
         try:
-            pong = await self._client.ping()
-            if not pong:
-                logger.info("Redis storage not found")
-                return False
-            logger.info("Redis storage found")
-            return True
+            pong = bool(await self._client.ping())
         except Exception as e:
-            logger.error(f"Error testing Redis connection: {e}")
-            return False
+            if self._available:
+                logger.error(f"Error testing Redis connection: {e}")
+            pong = False
+        self._set_available(pong)
+        if self._replicas is not None:
+            await self._replicas.check()
+        return pong
+
+    def _remember(self, cache_key: str, model: BaseModel, ttl: float) -> None:
+        size = model_memory(model)
+        if not self._available:
+            self._fallback_cache.set(cache_key, model, size, ttl)
+        elif self._local_cache is not None:
+            # Tracked entries are invalidated by Redis, so they live as long as they are fresh.
+            tracked = self._tracking is not None and self._tracking.active
+            self._local_cache.set(cache_key, model, size, ttl, capped=not tracked)
+
+    def _local_entry(self, cache_key: str, model_cls: type[T]) -> CacheEntry[T] | None:
+        caches = [self._local_cache]
+        if not self._available:
+            caches.insert(0, self._fallback_cache)
+        for cache in caches:
+            local = cache.get(cache_key, model_cls) if cache is not None else None
+            if local is not None:
+                return CacheEntry(local, stale=False)
+        return None
+
+    def _key(self, cache_key: str, model_cls: type[BaseModel]) -> str:
+        if self._schema_registry is None:
+            return cache_key
+        return versioned_key(cache_key, schema_version(model_cls))
+
+    async def _peer_key(self, cache_key: str, model_cls: type[BaseModel]) -> str | None:
+        if self._schema_registry is None:
+            return None
+        peers = await self._schema_registry.peers(self._client, model_cls)
+        return versioned_key(cache_key, peers[0]) if peers else None
+
+    def _decode_peer(
+        self,
+        cache_key: str,
+        peer_key: str,
+        cache: bytes,
+        model_cls: type[T],
+        points: list[bytes] | None = None,
+    ) -> CacheEntry[T] | None:
+        try:
+            return self._decode(cache_key, cache, model_cls, points)
+        except Exception as e:
+            logger.info(f"Cache {peer_key} does not fit the current schema: {e}")
+            return None
+
+    def _decode(
+        self,
+        cache_key: str,
+        cache: bytes,
+        model_cls: type[T],
+        points: list[bytes] | None = None,
+    ) -> CacheEntry[T]:
+        started = time.perf_counter()
+        if points is None and self._trusted_decode and "points" in model_cls.model_fields:
+            # Blob history: one parse, then the points are built like sorted-set members.
+            data, soft_expires_at, _ = self._codec.decode_raw(cache)
+            model = _construct_history(model_cls, data)
+        else:
+            model, soft_expires_at, _ = self._codec.decode(cache, model_cls)
+        stored = len(cache)
+        if points is not None:
+            decoded = (
+                _construct_points(points)
+                if self._trusted_decode
+                else [_decode_point(point) for point in points]
+            )
+            model = model.model_copy(update={"points": decoded})
+            stored += sum(len(point) for point in points)
+        prefix = cache_key_prefix(cache_key)
+        metrics.observe(
+            "cache_decode_seconds", time.perf_counter() - started, DECODE_SECONDS_BUCKETS,
+            prefix=prefix,
+        )
+        metrics.observe("cache_value_bytes", stored, VALUE_BYTES_BUCKETS, prefix=prefix)
+        if soft_expires_at is None:
+            return CacheEntry(model, stale=False)
+
+        fresh_for = soft_expires_at - time.time()
+        if fresh_for > 0:
+            self._remember(cache_key, model, fresh_for)
+        return CacheEntry(model, stale=fresh_for <= 0)
+
+    def _spot_field(self, cache_key: str) -> tuple[str, str] | None:
+        """Hash key and field of a spot price kept in its asset class hash."""
+        if self._spot_storage != SPOT_STORAGE_HASH:
+            return None
+        if HISTORY_KEY_MARKER in cache_key or META_KEY_MARKER in cache_key:
+            return None
+        prefix, _, field = cache_key.partition(":")
+        if not field or prefix not in SPOT_TTLS:
+            return None
+        return f"{prefix}{SPOT_HASH_SUFFIX}", field
+
+    def _spot_expired(self, cache_key: str, cache: bytes) -> bool:
+        """Whether a hash field is past its stale window, i.e. its hard expiry."""
+        stale_for = (REDIS_STALE_FACTOR - 1) * SPOT_TTLS[cache_key.partition(":")[0]]
+        soft_expires_at = self._codec.soft_expiry(cache)
+        return soft_expires_at is not None and soft_expires_at + stale_for <= time.time()
+
+    def _decode_spot(
+        self, cache_key: str, cache: bytes, model_cls: type[T]
+    ) -> CacheEntry[T] | None:
+        # Hash fields cannot expire on their own; ignore them once past the stale window.
+        if self._spot_expired(cache_key, cache):
+            return None
+        return self._decode(cache_key, cache, model_cls)
+
+    async def _prune_spot_fields(self, key: str, fields: list[str]) -> None:
+        """HDEL fields past their hard expiry, so dead symbols do not stay in the hash."""
+        try:
+            await self._write(lambda pipe: pipe.hdel(key, *fields))
+        except Exception as e:
+            logger.error(f"Error while pruning {len(fields)} expired fields of {key}: {e}")
+
+    async def _get_spot_entries(
+        self, cache_keys: list[str], model_cls: type[T]
+    ) -> dict[str, CacheEntry[T]]:
+        """One HMGET per asset class hash, then the peer schema hash for the misses."""
+        fields_by_hash: dict[str, dict[str, str]] = {}
+        for cache_key in cache_keys:
+            hash_key, field = self._spot_field(cache_key)
+            fields_by_hash.setdefault(hash_key, {})[field] = cache_key
+
+        results: dict[str, CacheEntry[T]] = {}
+        for hash_key, fields in fields_by_hash.items():
+            key = self._key(hash_key, model_cls)
+            values = await self._hmget(key, list(fields))
+            misses: dict[str, str] = {}
+            expired: list[str] = []
+            for (field, cache_key), cache in zip(fields.items(), values):
+                entry = None
+                if cache and self._spot_expired(cache_key, cache):
+                    expired.append(field)
+                elif cache:
+                    try:
+                        entry = self._decode_spot(cache_key, cache, model_cls)
+                    except Exception as e:
+                        logger.error(f"Error while getting {cache_key} cache: {e}")
+                        self._count_errors([cache_key])
+                if entry is None:
+                    misses[field] = cache_key
+                else:
+                    results[cache_key] = entry
+            if expired:
+                await self._prune_spot_fields(key, expired)
+
+            peer_key = await self._peer_key(hash_key, model_cls) if misses else None
+            if peer_key is None:
+                continue
+            for (field, cache_key), cache in zip(
+                misses.items(), await self._hmget(peer_key, list(misses))
+            ):
+                entry = self._decode_peer_spot(cache_key, peer_key, cache, model_cls) if cache else None
+                if entry is not None:
+                    results[cache_key] = entry
+        return results
+
+    def _decode_peer_spot(
+        self, cache_key: str, peer_key: str, cache: bytes, model_cls: type[T]
+    ) -> CacheEntry[T] | None:
+        try:
+            return self._decode_spot(cache_key, cache, model_cls)
+        except Exception as e:
+            logger.info(f"Cache {peer_key} does not fit the current schema: {e}")
+            return None
+
+    def _spot_write(
+        self, payloads: dict[str, tuple[type[BaseModel], bytes, float]]
+    ) -> Write:
+        """HSET the encoded entries into their hashes and keep each hash alive."""
+        writes: dict[str, tuple[dict[str, bytes], int]] = {}
+        for cache_key, (model_cls, payload, soft) in payloads.items():
+            hash_key, field = self._spot_field(cache_key)
+            key = self._key(hash_key, model_cls)
+            mapping, ttl = writes.get(key, ({}, 0))
+            mapping[field] = payload
+            writes[key] = (mapping, max(ttl, hard_ttl(soft)))
+
+        def write(pipe) -> None:
+            for key, (mapping, ttl) in writes.items():
+                pipe.hset(key, mapping=mapping)
+                # Only ever extend the hash TTL, so short-lived writes keep longer ones.
+                # EXPIRE NX and GT need Redis 7.0+.
+                pipe.expire(key, ttl, nx=True)
+                pipe.expire(key, ttl, gt=True)
+
+        return write
+
+    def _in_sorted_set(self, cache_key: str) -> bool:
+        return (
+            self._history_storage == HISTORY_STORAGE_ZSET
+            and HISTORY_KEY_MARKER in cache_key
+            and not cache_key.startswith(NOT_FOUND_KEY_PREFIX)
+        )
+
+    async def get_entry(self, cache_key: str, model_cls: type[T]) -> CacheEntry[T] | None:
+        entry = await self._get_entry(cache_key, model_cls)
+        self._count_read(cache_key, entry)
+        return entry
+
+    async def _get_entry(self, cache_key: str, model_cls: type[T]) -> CacheEntry[T] | None:
+        if self._in_sorted_set(cache_key):
+            return await self._get_history_window(cache_key, model_cls, None)
+
+        if self._spot_field(cache_key) is not None:
+            return (await self._get_many_entries([cache_key], model_cls)).get(cache_key)
+
+        local = self._local_entry(cache_key, model_cls)
+        if local is not None:
+            logger.info(f"Local cache match for {cache_key}")
+            return local
+        if not self._available:
+            return None
+
+        try:
+            cache = await self._get(self._key(cache_key, model_cls))
+            if cache:
+                entry = self._decode(cache_key, cache, model_cls)
+            else:
+                entry = await self._get_peer_entry(cache_key, model_cls)
+            if entry is None:
+                logger.info(f"Cache {cache_key} not found")
+                return None
+
+            logger.info(f"{'Stale cache' if entry.stale else 'Cache'} match for {cache_key}")
+            return entry
+        except Exception as e:
+            logger.error(f"Error while getting {cache_key} cache: {e}")
+            self._handle_error(e)
+            self._count_errors([cache_key])
+            return None
+
+    async def _get_peer_entry(self, cache_key: str, model_cls: type[T]) -> CacheEntry[T] | None:
+        peer_key = await self._peer_key(cache_key, model_cls)
+        if peer_key is None:
+            return None
+        cache = await self._get(peer_key)
+        return self._decode_peer(cache_key, peer_key, cache, model_cls) if cache else None
 
     async def get_cache(self, cache_key: str, model_cls: type[T]) -> T | None:
+        entry = await self.get_entry(cache_key, model_cls)
+        return entry.value if entry is not None else None
+
+    async def get_history_entry(
+        self, cache_key: str, model_cls: type[T], days: int | None = None
+    ) -> CacheEntry[T] | None:
+        """Read a history entry with only the points of the last ``days`` days.
+
+        A precomputed slice from ``HISTORY_SLICE_WINDOWS`` is used when one covers
+        ``days``; it may hold a few more points than asked for. Otherwise, with
+        sorted-set storage the window is selected by Redis, so only those points
+        are transferred and decoded. Blob storage returns every point and leaves
+        the slicing to the caller.
+        """
+        window = self._slice_window(days)
+        entry = None
+        if window is not None:
+            entry = await self._get_history_slice(cache_key, model_cls, window)
+        if entry is None:
+            if self._in_sorted_set(cache_key):
+                entry = await self._get_history_window(cache_key, model_cls, days)
+            else:
+                entry = await self._get_entry(cache_key, model_cls)
+        self._count_read(cache_key, entry)
+        return entry
+
+    def _slice_window(self, days: int | None) -> int | None:
+        """Smallest precomputed window that covers ``days``."""
+        if days is None:
+            return None
+        return next((window for window in self._history_slices if window >= days), None)
+
+    def _history_slice_models(self, cache_key: str, model: BaseModel) -> dict[str, BaseModel]:
+        if HISTORY_KEY_MARKER not in cache_key or cache_key.startswith(NOT_FOUND_KEY_PREFIX):
+            return {}
+        return {
+            history_slice_key(cache_key, window): model.model_copy(
+                update={"points": filter_points_by_days(model.points, window)}
+            )
+            for window in self._history_slices
+        }
+
+    async def _get_history_slice(
+        self, cache_key: str, model_cls: type[T], window: int
+    ) -> CacheEntry[T] | None:
+        slice_key = history_slice_key(cache_key, window)
+        local = self._local_entry(slice_key, model_cls)
+        if local is not None:
+            logger.info(f"Local cache match for {slice_key}")
+            return local
+        if not self._available:
+            return None
+
         try:
-            cache = await self._client.get(cache_key)
+            cache = await self._get(self._key(slice_key, model_cls))
             if not cache:
+                return None
+            entry = self._decode(slice_key, cache, model_cls)
+            logger.info(f"{'Stale cache' if entry.stale else 'Cache'} match for {slice_key}")
+            return entry
+        except Exception as e:
+            logger.error(f"Error while getting {slice_key} cache: {e}")
+            self._handle_error(e)
+            return None
+
+    async def _get_history_window(
+        self, cache_key: str, model_cls: type[T], days: int | None
+    ) -> CacheEntry[T] | None:
+        local_key = cache_key if days is None else history_slice_key(cache_key, days)
+        local = self._local_entry(local_key, model_cls)
+        if local is not None:
+            logger.info(f"Local cache match for {local_key}")
+            return local
+        if not self._available:
+            return None
+
+        since = "-inf" if days is None else (datetime.now() - timedelta(days=days)).timestamp()
+        try:
+            meta, points = await self._read_history(self._key(cache_key, model_cls), since)
+            if meta:
+                entry = self._decode(local_key, meta, model_cls, points)
+            else:
+                entry = None
+                peer_key = await self._peer_key(cache_key, model_cls)
+                if peer_key is not None:
+                    meta, points = await self._read_history(peer_key, since)
+                    if meta:
+                        entry = self._decode_peer(local_key, peer_key, meta, model_cls, points)
+            if entry is None:
                 logger.info(f"Cache {cache_key} not found")
                 return None
 
-            logger.info(f"Cache match for {cache_key}")
-            return model_cls.model_validate_json(cache)
+            logger.info(
+                f"{'Stale cache' if entry.stale else 'Cache'} match for {local_key} "
+                f"({len(points)} points)"
+            )
+            return entry
         except Exception as e:
             logger.error(f"Error while getting {cache_key} cache: {e}")
+            self._handle_error(e)
+            self._count_errors([cache_key])
             return None
 
+    async def _read_history(
+        self, key: str, since: float | str
+    ) -> tuple[bytes | None, list[bytes]]:
+        async def read(client: aioredis.Redis) -> tuple[bytes | None, list[bytes]]:
+            pipe = client.pipeline(transaction=False)
+            pipe.hget(history_meta_key(key), "entry")
+            pipe.zrangebyscore(history_points_key(key), since, "+inf")
+            meta, points = await pipe.execute()
+            return meta, points
+
+        replica = self._replica()
+        if replica is not None:
+            try:
+                meta, points = await read(replica)
+                if meta:
+                    return meta, points
+            except Exception as e:
+                self._replicas.mark_down(replica, str(e))
+        return await read(self._client)
+
+    def _history_write(
+        self, key: str, model: BaseModel, soft: float, slices: dict[str, bytes]
+    ) -> Write:
+        """Replace the sorted set of points and the metadata hash of a history entry."""
+        points = {_encode_point(point): point.timestamp.timestamp() for point in model.points}
+        meta, _ = self._codec.encode(
+            model.model_copy(update={"points": []}), time.time() + soft
+        )
+        points_key, meta_key = history_points_key(key), history_meta_key(key)
+
+        def write(pipe) -> None:
+            pipe.delete(points_key)
+            if points:
+                pipe.zadd(points_key, points)
+            pipe.hset(meta_key, mapping={"entry": meta, "points": len(points)})
+            pipe.expire(points_key, hard_ttl(soft))
+            pipe.expire(meta_key, hard_ttl(soft))
+            for slice_key, payload in slices.items():
+                pipe.setex(slice_key, hard_ttl(soft), payload)
+
+        return write
+
+    async def _write(self, write: Write, transaction: bool = False) -> None:
+        """Send a write now, or hand it to the write-behind queue when enabled."""
+        if self._write_behind is not None:
+            self._write_behind.put(write)
+            return
+        pipe = self._client.pipeline(transaction=transaction)
+        write(pipe)
+        await pipe.execute()
+
+    async def _flush_writes(self, writes: list[Write]) -> None:
+        if not self._available:
+            raise RedisConnectionError("Redis is unavailable")
+        try:
+            # One transaction keeps multi-command writes, like history, atomic.
+            pipe = self._client.pipeline(transaction=True)
+            for write in writes:
+                write(pipe)
+            await pipe.execute()
+        except Exception as e:
+            self._handle_error(e)
+            raise
+
+    async def flush_writes(self) -> None:
+        """Wait for queued write-behind writes to reach Redis."""
+        if self._write_behind is not None:
+            await self._write_behind.flush()
+
+    async def close(self) -> None:
+        if self._write_behind is not None:
+            await self._write_behind.close()
+        if self._replicas is not None:
+            await self._replicas.close()
+        await self._client.close()
+
     async def set_cache(self, cache_key: str, model: BaseModel, ttl: int) -> None:
         try:
             if ttl > 0:
-                await self._client.setex(cache_key, ttl, model.model_dump_json())
-                logger.info(f"{cache_key} cache set for {ttl} seconds")
+                soft = soft_ttl(ttl)
+                slices = {
+                    slice_key: (slice_model, self._codec.encode(slice_model, time.time() + soft)[0])
+                    for slice_key, slice_model in self._history_slice_models(cache_key, model).items()
+                }
+                if self._available:
+                    await self._register_schemas([type(model)])
+                    key = self._key(cache_key, type(model))
+                    slice_payloads = {
+                        self._key(slice_key, type(model)): payload
+                        for slice_key, (_, payload) in slices.items()
+                    }
+                    if self._in_sorted_set(cache_key):
+                        write = self._history_write(key, model, soft, slice_payloads)
+                    elif self._spot_field(cache_key) is not None:
+                        payload, _ = self._codec.encode(
+                            model, time.time() + soft, exclude_defaults=True
+                        )
+                        write = self._spot_write({cache_key: (type(model), payload, soft)})
+                    else:
+                        payload, _ = self._codec.encode(model, time.time() + soft)
+                        payloads = {key: payload, **slice_payloads}
+
+                        def write(pipe) -> None:
+                            for payload_key, payload_value in payloads.items():
+                                pipe.setex(payload_key, hard_ttl(soft), payload_value)
+
+                    # A sorted-set rewrite must never be seen half done, and slices go in
+                    # the same transaction so they never outlive the full entry.
+                    await self._write(
+                        write, transaction=self._in_sorted_set(cache_key) or bool(slice_payloads)
+                    )
+                self._remember(cache_key, model, soft)
+                for slice_key, (slice_model, _) in slices.items():
+                    self._remember(slice_key, slice_model, soft)
+                logger.info(f"{cache_key} cache set for {soft:.0f} seconds")
             else:
                 logger.warning(f"{cache_key} not cached. TTL must be greater than 0")
         except Exception as e:
             logger.error(f"Error while setting {cache_key} cache: {e}")
+            self._handle_error(e)
+            self._count_errors([cache_key])
+
+    async def get_many_entries(
+        self, cache_keys: list[str], model_cls: type[T]
+    ) -> dict[str, CacheEntry[T]]:
+        results = await self._get_many_entries(cache_keys, model_cls)
+        for cache_key in cache_keys:
+            self._count_read(cache_key, results.get(cache_key))
+        return results
+
+    async def _get_many_entries(
+        self, cache_keys: list[str], model_cls: type[T]
+    ) -> dict[str, CacheEntry[T]]:
+        if not cache_keys:
+            return {}
+
+        results: dict[str, CacheEntry[T]] = {}
+        remote_keys: list[str] = []
+        spot_keys: list[str] = []
+        for cache_key in cache_keys:
+            local = self._local_entry(cache_key, model_cls)
+            if local is not None:
+                results[cache_key] = local
+            elif self._spot_field(cache_key) is not None:
+                spot_keys.append(cache_key)
+            else:
+                remote_keys.append(cache_key)
+
+        if not remote_keys and not spot_keys:
+            logger.info(f"Local cache match for {len(cache_keys)} keys")
+            return results
+        if not self._available:
+            return results
+
+        try:
+            if spot_keys:
+                results.update(await self._get_spot_entries(spot_keys, model_cls))
+            values = await self._mget(
+                [self._key(cache_key, model_cls) for cache_key in remote_keys]
+            ) if remote_keys else []
+            misses = [cache_key for cache_key, cache in zip(remote_keys, values) if not cache]
+            peer_values = await self._get_many_peers(misses, model_cls) if misses else {}
+        except Exception as e:
+            logger.error(f"Error while getting {len(remote_keys)} cache keys: {e}")
+            self._handle_error(e)
+            self._count_errors(remote_keys + spot_keys)
+            return results
+
+        for cache_key, cache in zip(remote_keys, values):
+            if not cache:
+                continue
+            try:
+                results[cache_key] = self._decode(cache_key, cache, model_cls)
+            except Exception as e:
+                logger.error(f"Error while getting {cache_key} cache: {e}")
+                self._count_errors([cache_key])
+        for cache_key, (peer_key, cache) in peer_values.items():
+            entry = self._decode_peer(cache_key, peer_key, cache, model_cls)
+            if entry is not None:
+                results[cache_key] = entry
+
+        logger.info(f"Cache match for {len(results)}/{len(cache_keys)} keys")
+        return results
+
+    async def _get_many_peers(
+        self, cache_keys: list[str], model_cls: type[T]
+    ) -> dict[str, tuple[str, bytes]]:
+        if self._schema_registry is None:
+            return {}
+        peers = await self._schema_registry.peers(self._client, model_cls)
+        if not peers:
+            return {}
+        peer_keys = [versioned_key(cache_key, peers[0]) for cache_key in cache_keys]
+        values = await self._mget(peer_keys)
+        return {
+            cache_key: (peer_key, cache)
+            for cache_key, peer_key, cache in zip(cache_keys, peer_keys, values)
+            if cache
+        }
+
+    async def _register_schemas(self, model_classes: list[type[BaseModel]]) -> None:
+        if self._schema_registry is None:
+            return
+        for model_cls in set(model_classes):
+            await self._schema_registry.peers(self._client, model_cls)
+
+    async def get_many_json(self, cache_keys: list[str], model_cls: type[T]) -> dict[str, bytes]:
+        """Return the stored JSON of the fresh entries without validating them.
+
+        Stale, non-JSON and sorted-set entries are left out for ``get_entry`` to
+        handle, as are entries written under another schema version. Hash fields
+        are stored without their defaults, so those are validated and dumped.
+        Only hits are counted: a key left out is read again through ``get_entry``.
+        """
+        results = await self._get_many_json(cache_keys, model_cls)
+        for cache_key in results:
+            metrics.increment("cache_hits", prefix=cache_key_prefix(cache_key))
+        return results
+
+    async def _get_many_json(
+        self, cache_keys: list[str], model_cls: type[T]
+    ) -> dict[str, bytes]:
+        results: dict[str, bytes] = {}
+        remote_keys: list[str] = []
+        spot_keys: list[str] = []
+        for cache_key in cache_keys:
+            local = self._local_entry(cache_key, model_cls)
+            if local is not None:
+                results[cache_key] = local.value.model_dump_json().encode()
+            elif self._spot_field(cache_key) is not None:
+                spot_keys.append(cache_key)
+            elif not self._in_sorted_set(cache_key):
+                remote_keys.append(cache_key)
+
+        if (not remote_keys and not spot_keys) or not self._available:
+            return results
+
+        try:
+            if spot_keys:
+                entries = await self._get_spot_entries(spot_keys, model_cls)
+                results.update({
+                    cache_key: entry.value.model_dump_json().encode()
+                    for cache_key, entry in entries.items()
+                    if not entry.stale
+                })
+            if not remote_keys:
+                return results
+            values = await self._mget(
+                [self._key(cache_key, model_cls) for cache_key in remote_keys]
+            )
+        except Exception as e:
+            logger.error(f"Error while getting {len(remote_keys)} cache keys: {e}")
+            self._handle_error(e)
+            return results
+
+        now = time.time()
+        for cache_key, cache in zip(remote_keys, values):
+            if not cache:
+                continue
+            try:
+                decoded = self._codec.decode_json(cache)
+            except Exception as e:
+                logger.error(f"Error while getting {cache_key} cache: {e}")
+                continue
+            if decoded is not None and (decoded[1] is None or decoded[1] > now):
+                results[cache_key] = decoded[0]
+
+        logger.info(f"Raw cache match for {len(results)}/{len(cache_keys)} keys")
+        return results
+
+    async def get_many(self, cache_keys: list[str], model_cls: type[T]) -> dict[str, T]:
+        entries = await self.get_many_entries(cache_keys, model_cls)
+        return {cache_key: entry.value for cache_key, entry in entries.items()}
+
+    async def set_many(self, models: dict[str, BaseModel], ttl: int) -> None:
+        if not models:
+            return
+        if ttl <= 0:
+            logger.warning(f"{len(models)} keys not cached. TTL must be greater than 0")
+            return
+        if not self._available:
+            for cache_key, model in models.items():
+                self._remember(cache_key, model, soft_ttl(ttl))
+            logger.info(f"{len(models)} keys cached in memory for ~{ttl} seconds")
+            return
+
+        try:
+            now = time.time()
+            softs = {cache_key: soft_ttl(ttl) for cache_key in models}
+            payloads = {
+                cache_key: self._codec.encode(
+                    model,
+                    now + softs[cache_key],
+                    exclude_defaults=self._spot_field(cache_key) is not None,
+                )
+                for cache_key, model in models.items()
+            }
+            await self._register_schemas([type(model) for model in models.values()])
+            spot_write = self._spot_write({
+                cache_key: (type(models[cache_key]), payload, softs[cache_key])
+                for cache_key, (payload, _) in payloads.items()
+                if self._spot_field(cache_key) is not None
+            })
+
+            def write(pipe) -> None:
+                for cache_key, (payload, _) in payloads.items():
+                    if self._spot_field(cache_key) is not None:
+                        continue
+                    pipe.setex(
+                        self._key(cache_key, type(models[cache_key])),
+                        hard_ttl(softs[cache_key]),
+                        payload,
+                    )
+                spot_write(pipe)
+
+            await self._write(write)
+            for cache_key in payloads:
+                self._remember(cache_key, models[cache_key], softs[cache_key])
+            logger.info(f"{len(models)} keys cache set for ~{ttl} seconds")
+        except Exception as e:
+            logger.error(f"Error while setting {len(models)} cache keys: {e}")
+            self._handle_error(e)
+            self._count_errors(list(models))
+
+    async def get_not_found(self, cache_key: str) -> str | None:
+        """Return the error detail cached when ``cache_key`` was last not found."""
+        entry = await self.get_entry(f"{NOT_FOUND_KEY_PREFIX}{cache_key}", NotFoundEntry)
+        return entry.value.detail if entry is not None and not entry.stale else None
+
+    async def get_many_not_found(self, cache_keys: list[str]) -> dict[str, str]:
+        entries = await self.get_many_entries(
+            [f"{NOT_FOUND_KEY_PREFIX}{cache_key}" for cache_key in cache_keys], NotFoundEntry
+        )
+        return {
+            cache_key: entry.value.detail
+            for cache_key in cache_keys
+            if (entry := entries.get(f"{NOT_FOUND_KEY_PREFIX}{cache_key}")) is not None
+            and not entry.stale
+        }
+
+    async def set_not_found(self, cache_key: str, detail: str) -> None:
+        await self.set_cache(
+            f"{NOT_FOUND_KEY_PREFIX}{cache_key}",
+            NotFoundEntry(detail=detail),
+            REDIS_NOT_FOUND_INTERVAL,
+        )
+
+    async def set_many_not_found(self, details: dict[str, str]) -> None:
+        await self.set_many(
+            {
+                f"{NOT_FOUND_KEY_PREFIX}{cache_key}": NotFoundEntry(detail=detail)
+                for cache_key, detail in details.items()
+            },
+            REDIS_NOT_FOUND_INTERVAL,
+        )
+
+    async def acquire_lease(self, cache_key: str, ttl_ms: int) -> str | None:
+        """Try to become the only fetcher of ``cache_key`` across all workers.
+
+        Returns the lease token on success, ``None`` if another worker holds the
+        lease, and an empty token if Redis failed so the caller fetches anyway.
+        """
+        if not self._available:
+            return ""
+        token = uuid.uuid4().hex
+        try:
+            if await self._client.set(f"{LEASE_KEY_PREFIX}{cache_key}", token, nx=True, px=ttl_ms):
+                return token
+            logger.info(f"Fetch lease for {cache_key} is held by another worker")
+            return None
+        except Exception as e:
+            logger.error(f"Error while acquiring {cache_key} fetch lease: {e}")
+            self._handle_error(e)
+            return ""
+
+    async def acquire_leases(self, cache_keys: list[str], ttl_ms: int) -> dict[str, str | None]:
+        if not self._available:
+            return {cache_key: "" for cache_key in cache_keys}
+        tokens = {cache_key: uuid.uuid4().hex for cache_key in cache_keys}
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for cache_key, token in tokens.items():
+                pipe.set(f"{LEASE_KEY_PREFIX}{cache_key}", token, nx=True, px=ttl_ms)
+            acquired = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error while acquiring {len(cache_keys)} fetch leases: {e}")
+            self._handle_error(e)
+            return {cache_key: "" for cache_key in cache_keys}
+
+        return {
+            cache_key: token if ok else None
+            for (cache_key, token), ok in zip(tokens.items(), acquired)
+        }
+
+    async def release_lease(self, cache_key: str, token: str) -> None:
+        if not token:
+            return
+        try:
+            # Queued behind the value it guarded, so waiters never see the lease
+            # gone before the value is written.
+            await self._write(
+                lambda pipe: pipe.eval(
+                    _RELEASE_LEASE_SCRIPT, 1, f"{LEASE_KEY_PREFIX}{cache_key}", token
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error while releasing {cache_key} fetch lease: {e}")
+            self._handle_error(e)
+
+    async def release_leases(self, tokens: dict[str, str]) -> None:
+        tokens = {cache_key: token for cache_key, token in tokens.items() if token}
+        if not tokens:
+            return
+        def write(pipe) -> None:
+            for cache_key, token in tokens.items():
+                pipe.eval(_RELEASE_LEASE_SCRIPT, 1, f"{LEASE_KEY_PREFIX}{cache_key}", token)
+
+        try:
+            await self._write(write)
+        except Exception as e:
+            logger.error(f"Error while releasing {len(tokens)} fetch leases: {e}")
+            self._handle_error(e)
+
+    async def lease_held(self, cache_key: str) -> bool:
+        if not self._available:
+            return False
+        try:
+            return bool(await self._client.exists(f"{LEASE_KEY_PREFIX}{cache_key}"))
+        except Exception as e:
+            logger.error(f"Error while checking {cache_key} fetch lease: {e}")
+            self._handle_error(e)
+            return False
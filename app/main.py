@@ -6,12 +6,16 @@ import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from app.config import API_HOST, API_PORT, API_RELOAD, LOG_LEVEL
+from app.config import API_HOST, API_PORT, API_RELOAD, CACHE_SNAPSHOT_PATH, LOG_LEVEL
 from app.database import RedisClient
 from app.routers import router
+from app.utils.cache_fetch import cancel_background_refreshes
 from app.utils.exceptions import AssetNotFoundError, ExternalServiceError
 from app.utils.logging import logger
+from app.utils.thread_executor import yfinance_executor
+from app.tasks.cache_snapshot import dump_snapshot, restore_snapshot
 from app.tasks.crypto_cache import crypto_cache_refresh_loop
+from app.tasks.redis_health import redis_health_check_loop
 
 
 @asynccontextmanager
@@ -21,38 +25,66 @@ async def lifespan(app: FastAPI):
         if await app.state.redis_client.test_connection():
             logger.info("Redis connection established successfully.")
         else:
-            logger.warning("Redis connection failed. Falling back to no-cache mode.")
-            app.state.redis_client = None
+            logger.warning(
+                "Redis connection failed. Caching in memory until it reconnects."
+            )
     except Exception as e:
         logger.error(f"Critical error during Redis startup: {e}")
         app.state.redis_client = None
 
+    if app.state.redis_client and CACHE_SNAPSHOT_PATH:
+        try:
+            await restore_snapshot(app.state.redis_client, CACHE_SNAPSHOT_PATH)
+        except Exception as e:
+            logger.warning(f"Error restoring cache snapshot: {e}")
+
     app.state.http_session = aiohttp.ClientSession()
 
-    crypto_cache_task: asyncio.Task | None = None
+    background_tasks: list[asyncio.Task] = []
     if app.state.redis_client is not None:
-        crypto_cache_task = asyncio.create_task(
-            crypto_cache_refresh_loop(
-                redis_client=app.state.redis_client,
-                http_session=app.state.http_session,
+        background_tasks.append(
+            asyncio.create_task(
+                crypto_cache_refresh_loop(
+                    redis_client=app.state.redis_client,
+                    http_session=app.state.http_session,
+                )
+            )
+        )
+        background_tasks.append(
+            asyncio.create_task(
+                redis_health_check_loop(redis_client=app.state.redis_client)
             )
         )
+        if app.state.redis_client.tracking is not None:
+            background_tasks.append(
+                asyncio.create_task(
+                    app.state.redis_client.tracking.run(app.state.redis_client.client)
+                )
+            )
 
     yield
 
-    if crypto_cache_task is not None:
-        crypto_cache_task.cancel()
+    for task in background_tasks:
+        task.cancel()
 
-        await asyncio.gather(
-            crypto_cache_task,
-            return_exceptions=True,
-        )
+    await asyncio.gather(
+        *background_tasks,
+        return_exceptions=True,
+    )
 
+    await cancel_background_refreshes()
     await app.state.http_session.close()
+    yfinance_executor.shutdown()
+
+    if app.state.redis_client and CACHE_SNAPSHOT_PATH:
+        try:
+            await dump_snapshot(app.state.redis_client, CACHE_SNAPSHOT_PATH)
+        except Exception as e:
+            logger.warning(f"Error saving cache snapshot: {e}")
 
     if app.state.redis_client:
         try:
-            await app.state.redis_client.client.close()
+            await app.state.redis_client.close()
             logger.info("Redis connection closed.")
         except Exception as e:
             logger.warning(f"Error closing Redis: {e}")
@@ -1,3 +1,10 @@
-from app.routers.assets import router
+from fastapi import APIRouter
+
+from app.routers.admin import router as admin_router
+from app.routers.assets import router as assets_router
+
+router = APIRouter()
+router.include_router(assets_router)
+router.include_router(admin_router)
 
 __all__ = ["router"]
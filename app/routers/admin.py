@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.config import CACHE_STATS_SAMPLE_SIZE
+from app.routers.dependencies import RedisDep, require_admin_key
+from app.schemas import CacheStatsResponse
+from app.services import get_cache_stats
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_key)])
+
+
+@router.get(
+    "/cache/stats",
+    response_model=CacheStatsResponse,
+    tags=["Admin"],
+    summary="Cache key space and hit ratio statistics",
+    description=(
+        "Samples the Redis key space with `SCAN` and reports key counts, memory and TTL "
+        "distribution per key prefix, along with the cache counters and histograms of this worker. "
+        "Requires the `X-Admin-Key` header."
+    ),
+)
+async def cache_stats(
+    redis_client: RedisDep,
+    sample: int = Query(
+        CACHE_STATS_SAMPLE_SIZE,
+        ge=1,
+        le=100000,
+        description="Number of keys to sample",
+    ),
+):
+    return await get_cache_stats(redis_client, sample)
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Query
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 
 from app.routers.dependencies import HttpSessionDep, RedisDep
 from app.schemas import (
     StockResponse,
+    StockPricesResponse,
     CryptoPricesResponse,
     SteamResponse,
     StockHistoryResponse,
@@ -13,8 +14,13 @@ from app.schemas import (
 )
 from app.services import (
     get_stock_price,
+    get_stock_prices,
     get_crypto_prices,
     get_steam_item_price,
+    get_cached_stock_price_json,
+    get_cached_stock_prices_json,
+    get_cached_crypto_prices_json,
+    get_cached_steam_item_price_json,
     get_stock_history,
     get_crypto_history,
     get_steam_item_history,
@@ -25,6 +31,11 @@ from app.types.enums.enums import AssetType
 router = APIRouter()
 
 
+def _json_response(body: bytes) -> Response:
+    # Cached JSON was validated when it was written; skip response_model on hits.
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/")
 async def index():
     return RedirectResponse(url="/docs")
@@ -59,11 +70,25 @@ async def search(
 
 @router.get(
     "/stock/{ticker}",
-    response_model=StockResponse,
+    response_model=StockResponse | StockPricesResponse,
     tags=["Stocks"],
     summary="Get stock price",
+    description=(
+        "Fetch the spot price of one stock, e.g. `AAPL`. "
+        "Pass comma-separated tickers (e.g. `AAPL,MSFT,NVDA`) to get a `stocks` list "
+        "in request order, fetched from the provider in a single batch."
+    ),
 )
 async def stock_price(ticker: str, redis_client: RedisDep):
+    if "," in ticker:
+        cached = await get_cached_stock_prices_json(ticker, redis_client)
+        if cached is not None:
+            return _json_response(cached)
+        return await get_stock_prices(ticker, redis_client)
+
+    cached = await get_cached_stock_price_json(ticker, redis_client)
+    if cached is not None:
+        return _json_response(cached)
     return await get_stock_price(ticker, redis_client)
 
 
@@ -97,6 +122,9 @@ async def crypto_price(
     redis_client: RedisDep,
     http_session: HttpSessionDep,
 ):
+    cached = await get_cached_crypto_prices_json(coins, redis_client)
+    if cached is not None:
+        return _json_response(cached)
     return await get_crypto_prices(coins, redis_client, http_session)
 
 
@@ -127,6 +155,9 @@ async def steam_price(
     redis_client: RedisDep,
     http_session: HttpSessionDep,
 ):
+    cached = await get_cached_steam_item_price_json(app_id, market_hash_name, redis_client)
+    if cached is not None:
+        return _json_response(cached)
     return await get_steam_item_price(app_id, market_hash_name, redis_client, http_session)
 
 
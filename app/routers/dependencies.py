@@ -1,8 +1,10 @@
+import secrets
 from typing import Annotated
 
 import aiohttp
-from fastapi import Depends, Request
+from fastapi import Depends, Header, HTTPException, Request
 
+from app.config import ADMIN_API_KEY
 from app.database import RedisClient
 
 
@@ -14,5 +16,13 @@ def get_http_session(request: Request) -> aiohttp.ClientSession:
     return request.app.state.http_session
 
 
+def require_admin_key(x_admin_key: Annotated[str | None, Header()] = None) -> None:
+    # Admin routes do not exist unless a key is configured.
+    if ADMIN_API_KEY is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+
+
 RedisDep = Annotated[RedisClient | None, Depends(get_redis_client)]
 HttpSessionDep = Annotated[aiohttp.ClientSession, Depends(get_http_session)]
@@ -1,10 +1,13 @@
 from app.schemas.asset_responses import (
     BaseAssetResponse,
     StockResponse,
+    StockPricesResponse,
     CryptoResponse,
     CryptoPricesResponse,
     SteamResponse,
 )
+from app.schemas.cache_stats import CacheStatsResponse, PrefixStats
+from app.schemas.metadata import StockMetadata
 from app.schemas.history_responses import (
     CryptoHistoryResponse,
     HistoryPoint,
@@ -22,6 +25,7 @@ from app.schemas.search_responses import (
 __all__ = [
     "BaseAssetResponse",
     "StockResponse",
+    "StockPricesResponse",
     "CryptoResponse",
     "CryptoPricesResponse",
     "SteamResponse",
@@ -34,4 +38,7 @@ __all__ = [
     "SearchResponse",
     "SteamSearchHit",
     "StockSearchHit",
+    "CacheStatsResponse",
+    "StockMetadata",
+    "PrefixStats",
 ]
@@ -27,6 +27,10 @@ class CryptoResponse(BaseAssetResponse):
     full_name: str
 
 
+class StockPricesResponse(BaseModel):
+    stocks: list[StockResponse]
+
+
 class CryptoPricesResponse(BaseModel):
     coins: list[CryptoResponse]
 
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class PrefixStats(BaseModel):
+    sampled_keys: int
+    estimated_keys: int
+    memory_bytes: int
+    avg_value_bytes: int
+    ttl: dict[str, int]
+
+
+class CacheStatsResponse(BaseModel):
+    total_keys: int
+    sampled_keys: int
+    prefixes: dict[str, PrefixStats]
+    metrics: dict[str, float]
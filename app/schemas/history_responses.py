@@ -24,6 +24,16 @@ class StockHistoryResponse(BaseModel):
     cached_at: datetime
 
 
+class CachedStockHistory(StockHistoryResponse):
+    """Cached form of a full stock history; ``rebuilt_at`` never reaches the API.
+
+    ``rebuilt_at`` is when the series was last downloaded whole, kept across
+    incremental refreshes.
+    """
+
+    rebuilt_at: datetime | None = None
+
+
 class CryptoHistoryResponse(BaseModel):
     asset_type: AssetType = AssetType.CRYPTO
     name: str
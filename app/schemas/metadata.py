@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class StockMetadata(BaseModel):
+    name: str
+    full_name: str
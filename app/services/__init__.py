@@ -1,17 +1,29 @@
-from app.services.stock_price import get_stock_price
-from app.services.crypto_price import get_crypto_prices
-from app.services.steam_price import get_steam_item_price
+from app.services.stock_price import (
+    get_cached_stock_price_json,
+    get_cached_stock_prices_json,
+    get_stock_price,
+    get_stock_prices,
+)
+from app.services.crypto_price import get_cached_crypto_prices_json, get_crypto_prices
+from app.services.steam_price import get_cached_steam_item_price_json, get_steam_item_price
 from app.services.stock_history import get_stock_history
 from app.services.crypto_history import get_crypto_history
 from app.services.steam_history import get_steam_item_history
 from app.services.asset_search import get_asset_search
+from app.services.cache_stats import get_cache_stats
 
 __all__ = [
     "get_stock_price",
+    "get_stock_prices",
     "get_crypto_prices",
     "get_steam_item_price",
+    "get_cached_stock_price_json",
+    "get_cached_stock_prices_json",
+    "get_cached_crypto_prices_json",
+    "get_cached_steam_item_price_json",
     "get_stock_history",
     "get_crypto_history",
     "get_steam_item_history",
     "get_asset_search",
+    "get_cache_stats",
 ]
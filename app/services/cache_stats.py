@@ -0,0 +1,81 @@
+from app.database import RedisClient, cache_key_prefix
+from app.schemas import CacheStatsResponse, PrefixStats
+from app.utils.exceptions import ExternalServiceError
+from app.utils.logging import logger
+from app.utils.metrics import metrics
+
+SAMPLE_BATCH_SIZE = 500
+TTL_BUCKETS = ((60, "<1m"), (600, "<10m"), (3600, "<1h"), (86400, "<1d"))
+
+
+def _ttl_bucket(ttl_ms: int) -> str:
+    if ttl_ms < 0:
+        return "persistent"
+    for bound, label in TTL_BUCKETS:
+        if ttl_ms < bound * 1000:
+            return label
+    return ">=1d"
+
+
+async def _sample_keys(redis_client: RedisClient, sample_size: int) -> list[bytes | str]:
+    keys: list[bytes | str] = []
+    async for key in redis_client.client.scan_iter(count=SAMPLE_BATCH_SIZE):
+        keys.append(key)
+        if len(keys) >= sample_size:
+            break
+    return keys
+
+
+async def get_cache_stats(redis_client: RedisClient | None, sample_size: int) -> CacheStatsResponse:
+    """Key count, memory and TTL distribution per prefix over a SCAN sample.
+
+    Counts are scaled from the sample to ``DBSIZE``, so they are estimates once
+    the key space is larger than ``sample_size``.
+    """
+    if redis_client is None or not redis_client.available:
+        raise ExternalServiceError("Redis is not available", status_code=503)
+
+    try:
+        total_keys = await redis_client.client.dbsize()
+        keys = await _sample_keys(redis_client, sample_size)
+
+        prefixes: dict[str, dict] = {}
+        for start in range(0, len(keys), SAMPLE_BATCH_SIZE):
+            batch = keys[start:start + SAMPLE_BATCH_SIZE]
+            pipe = redis_client.client.pipeline(transaction=False)
+            for key in batch:
+                pipe.memory_usage(key)
+                pipe.pttl(key)
+            results = await pipe.execute()
+            for key, memory, ttl_ms in zip(batch, results[::2], results[1::2]):
+                if ttl_ms == -2:
+                    continue
+                name = key.decode() if isinstance(key, bytes) else key
+                stats = prefixes.setdefault(
+                    cache_key_prefix(name), {"keys": 0, "memory": 0, "ttl": {}}
+                )
+                stats["keys"] += 1
+                stats["memory"] += memory or 0
+                bucket = _ttl_bucket(ttl_ms)
+                stats["ttl"][bucket] = stats["ttl"].get(bucket, 0) + 1
+    except Exception as e:
+        logger.error(f"Error while sampling the cache key space: {e}")
+        raise ExternalServiceError("Could not read cache statistics", status_code=503) from e
+
+    sampled = sum(stats["keys"] for stats in prefixes.values())
+    scale = total_keys / sampled if sampled else 0.0
+    return CacheStatsResponse(
+        total_keys=total_keys,
+        sampled_keys=sampled,
+        prefixes={
+            prefix: PrefixStats(
+                sampled_keys=stats["keys"],
+                estimated_keys=round(stats["keys"] * scale),
+                memory_bytes=stats["memory"],
+                avg_value_bytes=stats["memory"] // stats["keys"],
+                ttl=stats["ttl"],
+            )
+            for prefix, stats in sorted(prefixes.items())
+        },
+        metrics=metrics.snapshot(),
+    )
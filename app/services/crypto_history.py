@@ -2,14 +2,22 @@ from datetime import datetime, timezone
 
 import aiohttp
 
-from app.config import CRYPTO_HISTORY_PERIOD, REDIS_CRYPTO_HISTORY_INTERVAL, CRYPTO_PROVIDER_NAME
+from app.config import (
+    CRYPTO_HISTORY_PERIOD,
+    CRYPTO_PROVIDER_NAME,
+    HISTORY_INCREMENTAL_OVERLAP_DAYS,
+    HISTORY_INCREMENTAL_REFRESH,
+    REDIS_CRYPTO_HISTORY_INTERVAL,
+)
 from app.database import RedisClient
 from app.schemas.history_responses import CryptoHistoryResponse, HistoryPoint
 from app.utils import AssetNotFoundError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch
 from app.utils.crypto_parser import ResolvedCrypto, resolve_crypto_coin
 from app.utils.history_points import (
     collapse_to_daily,
     filter_points_by_days,
+    merge_points,
 )
 from app.utils.logging import logger
 
@@ -20,7 +28,8 @@ def _slice_cached(
     points = filter_points_by_days(cached.points, days)
     if not points:
         raise AssetNotFoundError(f"Cryptocurrency history for {coin.id} not found")
-    return CryptoHistoryResponse(
+    # The points were validated before they were cached.
+    return CryptoHistoryResponse.model_construct(
         name=coin.id,
         symbol=coin.symbol,
         full_name=coin.full_name,
@@ -32,15 +41,20 @@ def _slice_cached(
 async def _fetch_history(
     coin: ResolvedCrypto,
     http_session: aiohttp.ClientSession,
+    days: int = CRYPTO_HISTORY_PERIOD,
 ) -> list[HistoryPoint]:
     logger.info(
-        f"Fetching crypto history for {coin.id} ({CRYPTO_HISTORY_PERIOD} days) "
+        f"Fetching crypto history for {coin.id} ({days} days) "
         f"from {CRYPTO_PROVIDER_NAME}"
     )
     url = (
         "https://api.coingecko.com/api/v3/coins/"
-        f"{coin.id}/market_chart?vs_currency=usd&days={CRYPTO_HISTORY_PERIOD}"
+        f"{coin.id}/market_chart?vs_currency=usd&days={days}"
     )
+    if days <= 90:
+        # CoinGecko answers short ranges with hourly points; their 24h volumes
+        # must not be summed into one day.
+        url += "&interval=daily"
 
     async with http_session.get(url) as response:
         data = await response.json()
@@ -76,6 +90,50 @@ async def _fetch_history(
     return points
 
 
+async def _load_history(
+    coin: ResolvedCrypto,
+    cache_key: str,
+    redis_client: RedisClient | None,
+    http_session: aiohttp.ClientSession,
+) -> CryptoHistoryResponse:
+    cached = None
+    if redis_client and HISTORY_INCREMENTAL_REFRESH:
+        cached = await redis_client.get_cache(cache_key, CryptoHistoryResponse)
+
+    missing_days = CRYPTO_HISTORY_PERIOD
+    if cached and cached.points:
+        missing_days = (
+            (datetime.now(timezone.utc).replace(tzinfo=None) - cached.points[-1].timestamp).days
+            + HISTORY_INCREMENTAL_OVERLAP_DAYS
+        )
+
+    if missing_days < CRYPTO_HISTORY_PERIOD:
+        points = filter_points_by_days(
+            merge_points(
+                cached.points,
+                await _fetch_history(coin, http_session, days=missing_days),
+            ),
+            CRYPTO_HISTORY_PERIOD,
+        )
+    else:
+        points = await _fetch_history(coin, http_session)
+
+    full_response = CryptoHistoryResponse(
+        name=coin.id,
+        symbol=coin.symbol,
+        full_name=coin.full_name,
+        points=points,
+        cached_at=datetime.now(),
+    )
+
+    if redis_client:
+        await redis_client.set_cache(
+            cache_key, full_response, REDIS_CRYPTO_HISTORY_INTERVAL
+        )
+
+    return full_response
+
+
 async def get_crypto_history(
     coin: str,
     days: int,
@@ -85,28 +143,17 @@ async def get_crypto_history(
     coin: ResolvedCrypto = resolve_crypto_coin(coin)
     cache_key = f"coin:history:{coin.id}"
 
-    if redis_client:
-        cached = await redis_client.get_cache(cache_key, CryptoHistoryResponse)
-        if cached and cached.points:
-            return _slice_cached(cached, coin, days)
-
     try:
-        points = await _fetch_history(coin, http_session)
-        cached_at = datetime.now()
-
-        full_response = CryptoHistoryResponse(
-            name=coin.id,
-            symbol=coin.symbol,
-            full_name=coin.full_name,
-            points=points,
-            cached_at=cached_at,
+        full_response = await cached_fetch(
+            redis_client,
+            cache_key,
+            CryptoHistoryResponse,
+            lambda: _load_history(coin, cache_key, redis_client, http_session),
+            read=lambda: redis_client.get_history_entry(
+                cache_key, CryptoHistoryResponse, days
+            ),
         )
 
-        if redis_client:
-            await redis_client.set_cache(
-                cache_key, full_response, REDIS_CRYPTO_HISTORY_INTERVAL
-            )
-
         return _slice_cached(full_response, coin, days)
     except AssetNotFoundError:
         raise
@@ -6,6 +6,7 @@ from app.config import CRYPTO_PROVIDER_NAME, REDIS_CRYPTO_INTERVAL
 from app.database import RedisClient
 from app.schemas import CryptoPricesResponse, CryptoResponse
 from app.utils import AssetNotFoundError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch_many
 from app.utils.crypto_parser import ResolvedCrypto, resolve_crypto_coins
 from app.utils.logging import logger
 
@@ -39,29 +40,49 @@ async def _fetch_crypto_prices(
         response.raise_for_status()
 
     results: dict[str, CryptoResponse] = {}
-    missing: list[str] = []
 
     for coin in coins:
         coin_data = data.get(coin.id)
         if not coin_data or "usd" not in coin_data:
-            missing.append(coin.id)
             continue
 
         price = coin_data.get("usd")
         if price is None or not isinstance(price, (int, float)):
-            missing.append(coin.id)
             continue
 
         results[coin.id] = _build_crypto_response(coin, price)
 
-    if missing:
-        raise AssetNotFoundError(
-            f"Price not available for cryptocurrencies: {', '.join(missing)}"
-        )
+    return results
+
+
+async def _load_crypto_prices(
+    coins: list[ResolvedCrypto],
+    redis_client: RedisClient | None,
+    http_session: aiohttp.ClientSession,
+) -> dict[str, CryptoResponse]:
+    fetched = await _fetch_crypto_prices(coins, http_session)
+    results = {f"coin:{coin_id}": response_data for coin_id, response_data in fetched.items()}
+
+    if redis_client:
+        await redis_client.set_many(results, REDIS_CRYPTO_INTERVAL)
 
     return results
 
 
+async def get_cached_crypto_prices_json(
+    coins: str,
+    redis_client: RedisClient | None,
+) -> bytes | None:
+    """Return the ``CryptoPricesResponse`` JSON if every coin has a fresh cached entry."""
+    if redis_client is None:
+        return None
+    cache_keys = [f"coin:{coin.id}" for coin in resolve_crypto_coins(coins)]
+    cached = await redis_client.get_many_json(cache_keys, CryptoResponse)
+    if len(cached) < len(set(cache_keys)):
+        return None
+    return b'{"coins":[' + b",".join(cached[cache_key] for cache_key in cache_keys) + b"]}"
+
+
 async def get_crypto_prices(
     coins: str,
     redis_client: RedisClient | None,
@@ -69,33 +90,25 @@ async def get_crypto_prices(
 ) -> CryptoPricesResponse:
     resolved = resolve_crypto_coins(coins)
 
-    cached: dict[str, CryptoResponse] = {}
-    to_fetch: list[ResolvedCrypto] = []
-
-    if redis_client:
-        for coin in resolved:
-            cache_key = f"coin:{coin.id}"
-            cache = await redis_client.get_cache(cache_key, CryptoResponse)
-            if cache:
-                cached[coin.id] = cache
-            else:
-                to_fetch.append(coin)
-    else:
-        to_fetch = resolved
+    by_key = {f"coin:{coin.id}": coin for coin in resolved}
 
     try:
-        if to_fetch:
-            fetched = await _fetch_crypto_prices(to_fetch, http_session)
-            if redis_client:
-                for coin_id, response_data in fetched.items():
-                    await redis_client.set_cache(
-                        f"coin:{coin_id}",
-                        response_data,
-                        REDIS_CRYPTO_INTERVAL,
-                    )
-            cached.update(fetched)
-
-        ordered = [cached[coin.id] for coin in resolved]
+        cached = await cached_fetch_many(
+            redis_client,
+            list(by_key),
+            CryptoResponse,
+            lambda keys: _load_crypto_prices(
+                [by_key[key] for key in keys], redis_client, http_session
+            ),
+        )
+
+        missing = [coin.id for cache_key, coin in by_key.items() if cache_key not in cached]
+        if missing:
+            raise AssetNotFoundError(
+                f"Price not available for cryptocurrencies: {', '.join(missing)}"
+            )
+
+        ordered = [cached[cache_key] for cache_key in by_key]
         return CryptoPricesResponse(coins=ordered)
     except AssetNotFoundError:
         raise
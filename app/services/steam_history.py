@@ -7,6 +7,7 @@ from app.config import REDIS_STEAM_HISTORY_INTERVAL, STEAM_PROVIDER_NAME
 from app.database import RedisClient
 from app.schemas.history_responses import SteamHistoryResponse, HistoryPoint
 from app.utils import AssetNotFoundError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch
 from app.schemas.history_responses import DAILY_INTERVAL
 from app.utils.history_points import collapse_to_daily, filter_points_by_days
 from app.utils.logging import logger
@@ -22,7 +23,8 @@ def _slice_cached(
     points = filter_points_by_days(cached.points, days)
     if not points:
         raise AssetNotFoundError(f"Steam item history for {market_hash_name} not found")
-    return SteamHistoryResponse(
+    # The points were validated before they were cached.
+    return SteamHistoryResponse.model_construct(
         app_id=app_id,
         name=market_hash_name,
         points=points,
@@ -62,6 +64,23 @@ async def _fetch_history(
     )
 
 
+async def _load_history(
+    app_id: int,
+    market_hash_name: str,
+    cache_key: str,
+    redis_client: RedisClient | None,
+    http_session: aiohttp.ClientSession,
+) -> SteamHistoryResponse:
+    full_response = await _fetch_history(app_id, market_hash_name, http_session)
+
+    if redis_client:
+        await redis_client.set_cache(
+            cache_key, full_response, REDIS_STEAM_HISTORY_INTERVAL
+        )
+
+    return full_response
+
+
 async def get_steam_item_history(
     app_id: int,
     market_hash_name: str,
@@ -71,18 +90,18 @@ async def get_steam_item_history(
 ) -> SteamHistoryResponse:
     cache_key = f"steam:history:{app_id}:{market_hash_name}"
 
-    if redis_client:
-        cached = await redis_client.get_cache(cache_key, SteamHistoryResponse)
-        if cached and cached.points:
-            return _slice_cached(cached, app_id, market_hash_name, days)
-
     try:
-        full_response = await _fetch_history(app_id, market_hash_name, http_session)
-
-        if redis_client:
-            await redis_client.set_cache(
-                cache_key, full_response, REDIS_STEAM_HISTORY_INTERVAL
-            )
+        full_response = await cached_fetch(
+            redis_client,
+            cache_key,
+            SteamHistoryResponse,
+            lambda: _load_history(
+                app_id, market_hash_name, cache_key, redis_client, http_session
+            ),
+            read=lambda: redis_client.get_history_entry(
+                cache_key, SteamHistoryResponse, days
+            ),
+        )
 
         return _slice_cached(full_response, app_id, market_hash_name, days)
     except AssetNotFoundError:
@@ -8,6 +8,7 @@ from app.config import REDIS_STEAM_INTERVAL, STEAM_PROVIDER_NAME
 from app.database import RedisClient
 from app.schemas import SteamResponse
 from app.utils import AssetNotFoundError, ExternalServiceError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch
 from app.utils.logging import logger
 
 
@@ -48,30 +49,49 @@ async def _fetch_steam_price(
     )
 
 
-async def get_steam_item_price(
+async def _load_steam_price(
     app_id: int,
     market_hash_name: str,
+    cache_key: str,
     redis_client: RedisClient | None,
     http_session: aiohttp.ClientSession,
 ) -> SteamResponse:
-    cache_key = f"steam:{app_id}:{market_hash_name}"
+    response_data = await _fetch_steam_price(app_id, market_hash_name, http_session)
 
     if redis_client:
-        cache = await redis_client.get_cache(cache_key, SteamResponse)
-        if cache:
-            return cache
+        await redis_client.set_cache(cache_key, response_data, REDIS_STEAM_INTERVAL)
 
-    try:
-        response_data = await _fetch_steam_price(
-            app_id,
-            market_hash_name,
-            http_session
-        )
+    return response_data
+
+
+async def get_cached_steam_item_price_json(
+    app_id: int,
+    market_hash_name: str,
+    redis_client: RedisClient | None,
+) -> bytes | None:
+    if redis_client is None:
+        return None
+    cache_key = f"steam:{app_id}:{market_hash_name}"
+    return (await redis_client.get_many_json([cache_key], SteamResponse)).get(cache_key)
 
-        if redis_client:
-            await redis_client.set_cache(cache_key, response_data, REDIS_STEAM_INTERVAL)
 
-        return response_data
+async def get_steam_item_price(
+    app_id: int,
+    market_hash_name: str,
+    redis_client: RedisClient | None,
+    http_session: aiohttp.ClientSession,
+) -> SteamResponse:
+    cache_key = f"steam:{app_id}:{market_hash_name}"
+
+    try:
+        return await cached_fetch(
+            redis_client,
+            cache_key,
+            SteamResponse,
+            lambda: _load_steam_price(
+                app_id, market_hash_name, cache_key, redis_client, http_session
+            ),
+        )
     except (AssetNotFoundError, ExternalServiceError):
         raise
     except Exception as e:
@@ -1,62 +1,70 @@
-import asyncio
-from datetime import datetime
+import math
+from datetime import date, datetime, timedelta
 
 import pandas as pd
 import yfinance as yf
 
-from app.config import REDIS_STOCK_HISTORY_INTERVAL, STOCK_HISTORY_PERIOD, STOCK_PROVIDER_NAME
+from app.config import (
+    HISTORY_INCREMENTAL_OVERLAP_DAYS,
+    HISTORY_INCREMENTAL_REFRESH,
+    REDIS_STOCK_HISTORY_INTERVAL,
+    STOCK_HISTORY_OVERLAP_TOLERANCE,
+    STOCK_HISTORY_PERIOD,
+    STOCK_HISTORY_REBUILD_DAYS,
+    STOCK_PROVIDER_NAME,
+)
 from app.database import RedisClient
-from app.schemas.history_responses import HistoryPoint, StockHistoryResponse
-from app.utils import AssetNotFoundError, handle_error_exception
+from app.schemas.history_responses import (
+    CachedStockHistory,
+    HistoryPoint,
+    StockHistoryResponse,
+)
+from app.services.stock_metadata import get_stock_metadata
+from app.utils import AssetNotFoundError, ExternalServiceError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch
 from app.schemas.history_responses import DAILY_INTERVAL
-from app.utils.history_points import filter_points_by_days
+from app.utils.history_points import construct_point, filter_points_by_days, merge_points
 from app.utils.logging import logger
+from app.utils.thread_executor import yfinance_executor
 
 
-def _fetch_history(ticker: str) -> tuple[pd.DataFrame, str | None]:
-    yf_ticker = yf.Ticker(ticker)
-    df = yf_ticker.history(period=STOCK_HISTORY_PERIOD, interval=DAILY_INTERVAL)
-    full_name: str | None = None
-    try:
-        info = yf_ticker.info
-        if info:
-            full_name = info.get("shortName")
-    except Exception:
-        pass
-    return df, full_name
+def _fetch_history(ticker: str) -> pd.DataFrame:
+    return yf.Ticker(ticker).history(period=STOCK_HISTORY_PERIOD, interval=DAILY_INTERVAL)
+
+
+def _fetch_history_since(ticker: str, start: date) -> pd.DataFrame:
+    return yf.Ticker(ticker).history(start=start.isoformat(), interval=DAILY_INTERVAL)
 
 
 def _dataframe_to_points(df: pd.DataFrame) -> list[HistoryPoint]:
-    points: list[HistoryPoint] = []
-    for index, row in df.iterrows():
-        close = row.get("Close")
-        if close is None or pd.isna(close):
-            continue
-
-        ts = index.to_pydatetime() if hasattr(index, "to_pydatetime") else index
-        if getattr(ts, "tzinfo", None) is not None:
-            ts = ts.replace(tzinfo=None)
-
-        volume = row.get("Volume")
-        volume_value: float | None = None
-        if volume is not None and not pd.isna(volume):
-            volume_value = round(float(volume), 4)
-
-        points.append(
-            HistoryPoint(
-                timestamp=ts,
-                price=round(float(close), 4),
-                volume=volume_value,
-            )
-        )
-    return points
+    if df.empty or "Close" not in df:
+        return []
+
+    df = df[df["Close"].notna()]
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    prices = df["Close"].astype(float).round(4).tolist()
+    if "Volume" in df:
+        volume = df["Volume"].astype(float).round(4)
+        volumes = volume.astype(object).where(volume.notna(), None).tolist()
+    else:
+        volumes = [None] * len(prices)
 
+    # The columns are already floats and the index datetimes, so skip validation.
+    return [
+        construct_point(timestamp, price, volume)
+        for timestamp, price, volume in zip(index.to_pydatetime().tolist(), prices, volumes)
+    ]
 
-def _slice_cached(cached: StockHistoryResponse, ticker: str, days: int) -> StockHistoryResponse:
+
+def _slice_cached(cached: CachedStockHistory, ticker: str, days: int) -> StockHistoryResponse:
     points = filter_points_by_days(cached.points, days)
     if not points:
         raise AssetNotFoundError(f"Stock history for {ticker} not found")
-    return StockHistoryResponse(
+    # The points were validated before they were cached.
+    return StockHistoryResponse.model_construct(
         name=ticker,
         full_name=cached.full_name,
         interval=DAILY_INTERVAL,
@@ -65,6 +73,109 @@ def _slice_cached(cached: StockHistoryResponse, ticker: str, days: int) -> Stock
     )
 
 
+async def _load_full_history(
+    ticker: str,
+    redis_client: RedisClient | None,
+) -> tuple[list[HistoryPoint], str | None]:
+    logger.info(
+        f"Fetching stock history for {ticker} "
+        f"(period={STOCK_HISTORY_PERIOD}, interval={DAILY_INTERVAL})"
+    )
+    df = await yfinance_executor.run(_fetch_history, ticker)
+    if df.empty:
+        raise AssetNotFoundError(f"Stock history for {ticker} not found")
+
+    points = _dataframe_to_points(df)
+    if not points:
+        raise AssetNotFoundError(f"Stock history for {ticker} not found")
+
+    metadata = (await get_stock_metadata([ticker], redis_client)).get(ticker)
+    return points, metadata.full_name if metadata is not None else None
+
+
+def _overlap_matches(cached: list[HistoryPoint], fresh: list[HistoryPoint]) -> bool:
+    """Whether the refetched overlap still agrees with the cached closes.
+
+    Adjusted closes are rescaled after splits and dividends, so a mismatch means
+    every earlier cached point is stale. The last cached day may have been a
+    provisional candle and is not compared.
+    """
+    if not fresh:
+        return False
+
+    closes = {point.timestamp.date(): point.price for point in fresh}
+    first_day = fresh[0].timestamp.date()
+    for index in range(len(cached) - 2, -1, -1):
+        point = cached[index]
+        day = point.timestamp.date()
+        if day < first_day:
+            break
+        close = closes.get(day)
+        if close is not None and not math.isclose(
+            close, point.price, rel_tol=STOCK_HISTORY_OVERLAP_TOLERANCE
+        ):
+            return False
+    return True
+
+
+async def _load_missing_points(
+    ticker: str,
+    cached: CachedStockHistory,
+) -> list[HistoryPoint] | None:
+    """Extend the cached series, or return ``None`` when it has to be refetched whole."""
+    start = cached.points[-1].timestamp.date() - timedelta(days=HISTORY_INCREMENTAL_OVERLAP_DAYS)
+    logger.info(
+        f"Fetching stock history for {ticker} since {start} (interval={DAILY_INTERVAL})"
+    )
+    df = await yfinance_executor.run(_fetch_history_since, ticker, start)
+    fresh = _dataframe_to_points(df)
+    if not _overlap_matches(cached.points, fresh):
+        logger.info(f"Cached stock history for {ticker} no longer matches; refetching in full")
+        return None
+    return merge_points(cached.points, fresh)
+
+
+def _rebuild_due(cached: CachedStockHistory, now: datetime) -> bool:
+    return cached.rebuilt_at is None or now - cached.rebuilt_at >= timedelta(
+        days=STOCK_HISTORY_REBUILD_DAYS
+    )
+
+
+async def _load_history(
+    ticker: str,
+    cache_key: str,
+    redis_client: RedisClient | None,
+) -> CachedStockHistory:
+    cached = None
+    if redis_client and HISTORY_INCREMENTAL_REFRESH:
+        cached = await redis_client.get_cache(cache_key, CachedStockHistory)
+
+    now = datetime.now()
+    points = None
+    if cached and cached.points and not _rebuild_due(cached, now):
+        points = await _load_missing_points(ticker, cached)
+        full_name, rebuilt_at = cached.full_name, cached.rebuilt_at
+    if points is None:
+        points, full_name = await _load_full_history(ticker, redis_client)
+        rebuilt_at = now
+
+    full_response = CachedStockHistory(
+        name=ticker,
+        full_name=full_name,
+        interval=DAILY_INTERVAL,
+        points=points,
+        cached_at=now,
+        rebuilt_at=rebuilt_at,
+    )
+
+    if redis_client:
+        await redis_client.set_cache(
+            cache_key, full_response, REDIS_STOCK_HISTORY_INTERVAL
+        )
+
+    return full_response
+
+
 async def get_stock_history(
     ticker: str,
     days: int,
@@ -73,40 +184,19 @@ async def get_stock_history(
     ticker = ticker.upper()
     cache_key = f"stock:history:{ticker}"
 
-    if redis_client:
-        cached = await redis_client.get_cache(cache_key, StockHistoryResponse)
-        if cached and cached.points:
-            return _slice_cached(cached, ticker, days)
-
     try:
-        logger.info(
-            f"Fetching stock history for {ticker} "
-            f"(period={STOCK_HISTORY_PERIOD}, interval={DAILY_INTERVAL})"
+        full_response = await cached_fetch(
+            redis_client,
+            cache_key,
+            CachedStockHistory,
+            lambda: _load_history(ticker, cache_key, redis_client),
+            read=lambda: redis_client.get_history_entry(
+                cache_key, CachedStockHistory, days
+            ),
         )
-        df, full_name = await asyncio.to_thread(_fetch_history, ticker)
-        if df.empty:
-            raise AssetNotFoundError(f"Stock history for {ticker} not found")
-
-        points = _dataframe_to_points(df)
-        if not points:
-            raise AssetNotFoundError(f"Stock history for {ticker} not found")
-
-        cached_at = datetime.now()
-        full_response = StockHistoryResponse(
-            name=ticker,
-            full_name=full_name,
-            interval=DAILY_INTERVAL,
-            points=points,
-            cached_at=cached_at,
-        )
-
-        if redis_client:
-            await redis_client.set_cache(
-                cache_key, full_response, REDIS_STOCK_HISTORY_INTERVAL
-            )
 
         return _slice_cached(full_response, ticker, days)
-    except AssetNotFoundError:
+    except (AssetNotFoundError, ExternalServiceError):
         raise
     except Exception as e:
         logger.error(f"Error fetching stock history for {ticker}: {e}")
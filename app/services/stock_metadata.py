@@ -0,0 +1,67 @@
+import yfinance as yf
+
+from app.config import REDIS_STOCK_META_INTERVAL, STOCK_PROVIDER_NAME
+from app.database import RedisClient
+from app.schemas import StockMetadata
+from app.types.constants.stock_tickers import STOCK_TICKERS
+from app.utils.cache_fetch import cached_fetch_many
+from app.utils.logging import logger
+from app.utils.thread_executor import yfinance_executor
+
+
+def stock_meta_key(ticker: str) -> str:
+    return f"stock:meta:{ticker}"
+
+
+def _fetch_company_names(tickers: list[str]) -> dict[str, str]:
+    names: dict[str, str] = {}
+    for ticker in tickers:
+        logger.info(f"Fetching stock metadata for {ticker} from {STOCK_PROVIDER_NAME}")
+        try:
+            info = yf.Ticker(ticker).info
+        except Exception as e:
+            # One failed lookup must not fail the other tickers, or a history
+            # that only needs the name.
+            logger.warning(f"Error fetching stock metadata for {ticker}: {e}")
+            continue
+        if info and "symbol" in info and info.get("shortName"):
+            names[ticker] = info["shortName"]
+    return names
+
+
+async def _load_stock_metadata(
+    tickers: list[str],
+    redis_client: RedisClient | None,
+) -> dict[str, StockMetadata]:
+    names = {ticker: STOCK_TICKERS[ticker] for ticker in tickers if ticker in STOCK_TICKERS}
+    unknown = [ticker for ticker in tickers if ticker not in names]
+    if unknown:
+        names.update(await yfinance_executor.run(_fetch_company_names, unknown))
+
+    results = {
+        stock_meta_key(ticker): StockMetadata(name=ticker, full_name=full_name)
+        for ticker, full_name in names.items()
+    }
+    if redis_client:
+        await redis_client.set_many(results, REDIS_STOCK_META_INTERVAL)
+    return results
+
+
+async def get_stock_metadata(
+    tickers: list[str],
+    redis_client: RedisClient | None,
+) -> dict[str, StockMetadata]:
+    """Company names of ``tickers``, leaving out the ones that do not exist.
+
+    Names rarely change, so they are cached for ``REDIS_STOCK_META_INTERVAL``.
+    Tickers in ``STOCK_TICKERS`` are named from it; only the others cost a
+    ``Ticker.info`` request.
+    """
+    by_key = {stock_meta_key(ticker): ticker for ticker in tickers}
+    cached = await cached_fetch_many(
+        redis_client,
+        list(by_key),
+        StockMetadata,
+        lambda keys: _load_stock_metadata([by_key[key] for key in keys], redis_client),
+    )
+    return {by_key[cache_key]: metadata for cache_key, metadata in cached.items()}
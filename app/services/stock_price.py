@@ -1,35 +1,177 @@
 from datetime import datetime
 
+import pandas as pd
 import yfinance as yf
 
-from app.config import REDIS_STOCK_INTERVAL, STOCK_PROVIDER_NAME
+from app.config import (
+    REDIS_STOCK_INTERVAL,
+    STOCK_BATCH_MAX_SIZE,
+    STOCK_BATCH_WINDOW_MS,
+    STOCK_PROVIDER_NAME,
+)
 from app.database import RedisClient
-from app.schemas import StockResponse
-from app.utils import AssetNotFoundError, handle_error_exception
+from app.schemas import StockMetadata, StockPricesResponse, StockResponse
+from app.services.stock_metadata import get_stock_metadata
+from app.utils import AssetNotFoundError, ExternalServiceError, handle_error_exception
+from app.utils.cache_fetch import cached_fetch, cached_fetch_many
 from app.utils.logging import logger
+from app.utils.micro_batch import MicroBatcher
+from app.utils.thread_executor import yfinance_executor
 
 
-def _fetch_stock_price(ticker: str) -> StockResponse:
-    logger.info(f"Fetching stock data for {ticker} from {STOCK_PROVIDER_NAME}")
-    yf_ticker = yf.Ticker(ticker)
-    info = yf_ticker.info
-    if not info or "symbol" not in info:
-        raise AssetNotFoundError(f"Stock {ticker} not found")
+def _fetch_stock_price(ticker: str) -> float | None:
+    logger.info(f"Fetching stock price for {ticker} from {STOCK_PROVIDER_NAME}")
+    return yf.Ticker(ticker).fast_info.last_price
+
+
+def _parse_tickers(tickers: str) -> list[str]:
+    parsed = list(dict.fromkeys(
+        part.strip().upper() for part in tickers.split(",") if part.strip()
+    ))
+    if not parsed:
+        raise AssetNotFoundError("Stock ticker is empty")
+    return parsed
+
+
+def _last_close(df: pd.DataFrame | None, ticker: str) -> float | None:
+    if df is None or df.empty:
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        if ticker not in df.columns.get_level_values(0):
+            return None
+        df = df[ticker]
+    if "Close" not in df:
+        return None
+    closes = df["Close"].dropna()
+    return float(closes.iloc[-1]) if not closes.empty else None
+
+
+def _fetch_missing_price(ticker: str) -> float | ExternalServiceError | None:
+    try:
+        return _fetch_stock_price(ticker)
+    except Exception as e:
+        logger.warning(f"Retrying the stock price for {ticker} failed: {e}")
+        return ExternalServiceError(f"{STOCK_PROVIDER_NAME} price request for {ticker} failed")
+
+
+def _fetch_stock_prices(tickers: list[str]) -> dict[str, float | ExternalServiceError]:
+    """Last unadjusted daily Close per ticker, the same price ``fast_info`` reports.
+
+    ``fast_info.last_price`` is the last Close of an ``auto_adjust=False`` daily
+    history, so both sources agree while the market is open and after it closes.
+    ``yf.download`` leaves a failed ticker's column empty instead of raising;
+    those tickers are retried through ``fast_info``, which falls back to the
+    quote's ``regularMarketPrice``. Tickers neither source has a price for are
+    left out, and a retry that fails maps its ticker to the error.
+    """
+    logger.info(f"Fetching stock prices for {len(tickers)} tickers from {STOCK_PROVIDER_NAME}")
+    df = yf.download(
+        tickers,
+        period="5d",
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+    )
+    prices = {ticker: _last_close(df, ticker) for ticker in tickers}
+    for ticker, price in prices.items():
+        if not price:
+            prices[ticker] = _fetch_missing_price(ticker)
+    return {ticker: price for ticker, price in prices.items() if price}
 
-    stock_price = yf_ticker.fast_info.last_price
-    company_name = info.get("shortName")
-    if not stock_price or not company_name:
-        raise AssetNotFoundError(f"Stock {ticker} not found")
 
+def _fetch_stock_batch(tickers: list[str]) -> dict[str, float | ExternalServiceError]:
+    if len(tickers) > 1:
+        return _fetch_stock_prices(tickers)
+    # One request instead of a download; see _fetch_stock_prices for why the prices match.
+    price = _fetch_stock_price(tickers[0])
+    return {tickers[0]: price} if price else {}
+
+
+async def _fetch_stock_batch_async(
+    tickers: list[str],
+) -> dict[str, float | ExternalServiceError]:
+    return await yfinance_executor.run(_fetch_stock_batch, tickers)
+
+
+# Concurrent single-ticker misses share one bulk download.
+stock_batcher: MicroBatcher[float] = MicroBatcher(
+    "stock",
+    _fetch_stock_batch_async,
+    window=STOCK_BATCH_WINDOW_MS / 1000,
+    max_size=STOCK_BATCH_MAX_SIZE,
+)
+
+
+def _build_stock_response(metadata: StockMetadata, price: float) -> StockResponse:
     return StockResponse(
-        name=ticker,
-        full_name=company_name,
-        price=round(stock_price, 2),
+        name=metadata.name,
+        full_name=metadata.full_name,
+        price=round(price, 2),
         currency="USD",
         cached_at=datetime.now(),
     )
 
 
+async def _load_stock_prices(
+    tickers: list[str],
+    redis_client: RedisClient | None,
+) -> dict[str, StockResponse]:
+    metadata = await get_stock_metadata(tickers, redis_client)
+    known = [ticker for ticker in tickers if ticker in metadata]
+    prices = await yfinance_executor.run(_fetch_stock_prices, known) if known else {}
+    results = {
+        f"stock:{ticker}": _build_stock_response(metadata[ticker], price)
+        for ticker, price in prices.items()
+        if not isinstance(price, ExternalServiceError)
+    }
+
+    if redis_client:
+        await redis_client.set_many(results, REDIS_STOCK_INTERVAL)
+
+    # Tickers the provider has no price for, e.g. delisted ones still in
+    # STOCK_TICKERS, are left out and cached as not found. Failed requests
+    # are a provider error and must not reach the not-found cache.
+    failed = [ticker for ticker, price in prices.items() if isinstance(price, ExternalServiceError)]
+    if failed:
+        raise ExternalServiceError(
+            f"{STOCK_PROVIDER_NAME} price request failed for stocks: {', '.join(failed)}"
+        )
+
+    return results
+
+
+async def _load_stock_price(
+    ticker: str,
+    cache_key: str,
+    redis_client: RedisClient | None,
+) -> StockResponse:
+    metadata = (await get_stock_metadata([ticker], redis_client)).get(ticker)
+    if metadata is None:
+        raise AssetNotFoundError(f"Stock {ticker} not found")
+    # Request failures raise ExternalServiceError; None means the provider has no
+    # price, e.g. for a delisted ticker still in STOCK_TICKERS.
+    price = await stock_batcher.load(ticker)
+    if price is None:
+        raise AssetNotFoundError(f"Stock {ticker} not found")
+    response_data = _build_stock_response(metadata, price)
+
+    if redis_client:
+        await redis_client.set_cache(cache_key, response_data, REDIS_STOCK_INTERVAL)
+
+    return response_data
+
+
+async def get_cached_stock_price_json(
+    ticker: str,
+    redis_client: RedisClient | None,
+) -> bytes | None:
+    if redis_client is None:
+        return None
+    cache_key = f"stock:{ticker.upper()}"
+    return (await redis_client.get_many_json([cache_key], StockResponse)).get(cache_key)
+
+
 async def get_stock_price(
     ticker: str,
     redis_client: RedisClient | None,
@@ -37,20 +179,55 @@ async def get_stock_price(
     ticker = ticker.upper()
     cache_key = f"stock:{ticker}"
 
-    if redis_client:
-        cache = await redis_client.get_cache(cache_key, StockResponse)
-        if cache:
-            return cache
+    try:
+        return await cached_fetch(
+            redis_client,
+            cache_key,
+            StockResponse,
+            lambda: _load_stock_price(ticker, cache_key, redis_client),
+        )
+    except (AssetNotFoundError, ExternalServiceError):
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching stock {ticker}: {e}")
+        raise handle_error_exception(e, source=STOCK_PROVIDER_NAME) from e
+
+
+async def get_cached_stock_prices_json(
+    tickers: str,
+    redis_client: RedisClient | None,
+) -> bytes | None:
+    """Return the ``StockPricesResponse`` JSON if every ticker has a fresh cached entry."""
+    if redis_client is None:
+        return None
+    cache_keys = [f"stock:{ticker}" for ticker in _parse_tickers(tickers)]
+    cached = await redis_client.get_many_json(cache_keys, StockResponse)
+    if len(cached) < len(cache_keys):
+        return None
+    return b'{"stocks":[' + b",".join(cached[cache_key] for cache_key in cache_keys) + b"]}"
+
+
+async def get_stock_prices(
+    tickers: str,
+    redis_client: RedisClient | None,
+) -> StockPricesResponse:
+    by_key = {f"stock:{ticker}": ticker for ticker in _parse_tickers(tickers)}
 
     try:
-        response_data = _fetch_stock_price(ticker)
+        cached = await cached_fetch_many(
+            redis_client,
+            list(by_key),
+            StockResponse,
+            lambda keys: _load_stock_prices([by_key[key] for key in keys], redis_client),
+        )
 
-        if redis_client:
-            await redis_client.set_cache(cache_key, response_data, REDIS_STOCK_INTERVAL)
+        missing = [ticker for cache_key, ticker in by_key.items() if cache_key not in cached]
+        if missing:
+            raise AssetNotFoundError(f"Price not available for stocks: {', '.join(missing)}")
 
-        return response_data
-    except AssetNotFoundError:
+        return StockPricesResponse(stocks=[cached[cache_key] for cache_key in by_key])
+    except (AssetNotFoundError, ExternalServiceError):
         raise
     except Exception as e:
-        logger.error(f"Error fetching stock {ticker}: {e}")
-        raise handle_error_exception(e, source=STOCK_PROVIDER_NAME) from e
\ No newline at end of file
+        logger.error(f"Error fetching stocks [{', '.join(by_key.values())}]: {e}")
+        raise handle_error_exception(e, source=STOCK_PROVIDER_NAME) from e
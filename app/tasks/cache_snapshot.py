@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import base64
+import contextlib
+import importlib
+import json
+import math
+import os
+import tempfile
+import time
+
+from pydantic import BaseModel, ValidationError
+
+from app.config import CACHE_SNAPSHOT_MAX_KEYS, CACHE_SNAPSHOT_PATH
+from app.database import (
+    NOT_FOUND_KEY_PREFIX,
+    TRACKED_KEY_PREFIXES,
+    RedisClient,
+    model_memory,
+)
+from app.utils.logging import logger
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 500
+DEFAULT_SNAPSHOT_PATH = "cache_snapshot.json"
+# Cached values only: negative entries, leases and the schema registry are left out.
+SNAPSHOT_KEY_PREFIXES = [prefix for prefix in TRACKED_KEY_PREFIXES if prefix != NOT_FOUND_KEY_PREFIX]
+
+
+def _model_path(model_cls: type[BaseModel]) -> str:
+    return f"{model_cls.__module__}:{model_cls.__qualname__}"
+
+
+def _load_model_class(path: str) -> type[BaseModel] | None:
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith("app."):
+        return None
+    try:
+        target = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            target = getattr(target, name)
+    except (ImportError, AttributeError):
+        return None
+    return target if isinstance(target, type) and issubclass(target, BaseModel) else None
+
+
+async def _scan_cache_keys(redis_client: RedisClient) -> list[bytes | str]:
+    keys: list[bytes | str] = []
+    for prefix in SNAPSHOT_KEY_PREFIXES:
+        async for key in redis_client.client.scan_iter(
+            match=f"{prefix}*", count=SNAPSHOT_BATCH_SIZE
+        ):
+            keys.append(key)
+    return keys
+
+
+async def _hottest_keys(
+    redis_client: RedisClient, keys: list[bytes | str], max_keys: int
+) -> list[bytes | str]:
+    """Keep the ``max_keys`` keys read most recently, by ``OBJECT IDLETIME``.
+
+    Under an LFU eviction policy Redis does not track idle time; those keys
+    rank last and keep their scan order.
+    """
+    if len(keys) <= max_keys:
+        return keys
+
+    idle: list[float] = []
+    for start in range(0, len(keys), SNAPSHOT_BATCH_SIZE):
+        pipe = redis_client.client.pipeline(transaction=False)
+        for key in keys[start:start + SNAPSHOT_BATCH_SIZE]:
+            pipe.object("idletime", key)
+        results = await pipe.execute(raise_on_error=False)
+        idle.extend(result if isinstance(result, int) else math.inf for result in results)
+
+    ranked = sorted(range(len(keys)), key=idle.__getitem__)
+    return [keys[index] for index in ranked[:max_keys]]
+
+
+async def _dump_redis(redis_client: RedisClient, max_keys: int) -> list[dict]:
+    if not redis_client.available:
+        return []
+
+    keys = await _hottest_keys(redis_client, await _scan_cache_keys(redis_client), max_keys)
+
+    entries: list[dict] = []
+    for start in range(0, len(keys), SNAPSHOT_BATCH_SIZE):
+        batch = keys[start:start + SNAPSHOT_BATCH_SIZE]
+        pipe = redis_client.client.pipeline(transaction=False)
+        for key in batch:
+            pipe.pttl(key)
+            pipe.dump(key)
+        results = await pipe.execute()
+        for key, ttl_ms, value in zip(batch, results[::2], results[1::2]):
+            if value is None or ttl_ms == -2:
+                continue
+            entries.append({
+                "key": key.decode() if isinstance(key, bytes) else key,
+                "ttl_ms": max(ttl_ms, 0),
+                "value": base64.b64encode(value).decode(),
+            })
+    return entries
+
+
+def _dump_local(redis_client: RedisClient) -> list[dict]:
+    if redis_client.local_cache is None:
+        return []
+    return [
+        {
+            "key": cache_key,
+            "model": _model_path(type(model)),
+            "ttl": ttl,
+            "body": model.model_dump_json(),
+        }
+        for cache_key, model, ttl in redis_client.local_cache.entries()
+    ]
+
+
+async def _restore_redis(redis_client: RedisClient, entries: list[dict], elapsed_ms: int) -> int:
+    if not entries or not redis_client.available:
+        return 0
+
+    restored = 0
+    for start in range(0, len(entries), SNAPSHOT_BATCH_SIZE):
+        pipe = redis_client.client.pipeline(transaction=False)
+        queued = 0
+        for entry in entries[start:start + SNAPSHOT_BATCH_SIZE]:
+            ttl_ms = entry["ttl_ms"]
+            if ttl_ms > 0:
+                ttl_ms -= elapsed_ms
+                if ttl_ms <= 0:
+                    continue
+            pipe.restore(entry["key"], ttl_ms, base64.b64decode(entry["value"]))
+            queued += 1
+        if not queued:
+            continue
+        # Keys written since the snapshot fail with BUSYKEY and keep their newer value.
+        results = await pipe.execute(raise_on_error=False)
+        restored += sum(not isinstance(result, Exception) for result in results)
+    return restored
+
+
+def _restore_local(redis_client: RedisClient, entries: list[dict], elapsed: float) -> int:
+    if redis_client.local_cache is None:
+        return 0
+
+    restored = 0
+    for entry in entries:
+        ttl = entry["ttl"] - elapsed
+        model_cls = _load_model_class(entry["model"])
+        if ttl <= 0 or model_cls is None:
+            continue
+        try:
+            model = model_cls.model_validate_json(entry["body"])
+        except ValidationError:
+            continue
+        redis_client.local_cache.set(entry["key"], model, model_memory(model), ttl)
+        restored += 1
+    return restored
+
+
+async def dump_snapshot(
+    redis_client: RedisClient,
+    path: str,
+    max_keys: int = CACHE_SNAPSHOT_MAX_KEYS,
+) -> int:
+    """Write the Redis cache keys and the L1 entries to ``path``.
+
+    Only the ``max_keys`` most recently read cache keys are kept.
+    """
+    await redis_client.flush_writes()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.time(),
+        "redis": await _dump_redis(redis_client, max_keys),
+        "local": _dump_local(redis_client),
+    }
+
+    # A private temporary file per writer, so concurrent workers never share one.
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+    logger.info(
+        f"Cache snapshot saved to {path} "
+        f"({len(snapshot['redis'])} Redis keys, {len(snapshot['local'])} local entries)"
+    )
+    return len(snapshot["redis"]) + len(snapshot["local"])
+
+
+async def restore_snapshot(redis_client: RedisClient, path: str) -> int:
+    """Load a snapshot written by ``dump_snapshot``, skipping expired entries.
+
+    Redis keys that already exist are left alone, so a snapshot never replaces
+    values written after it was taken.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        logger.info(f"No cache snapshot at {path}")
+        return 0
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring cache snapshot {path} with version {snapshot.get('version')}")
+        return 0
+
+    elapsed = max(time.time() - snapshot["created_at"], 0.0)
+    redis_restored = await _restore_redis(redis_client, snapshot["redis"], int(elapsed * 1000))
+    local_restored = _restore_local(redis_client, snapshot["local"], elapsed)
+
+    logger.info(
+        f"Cache snapshot restored from {path} "
+        f"({redis_restored} Redis keys, {local_restored} local entries, {elapsed:.0f}s old)"
+    )
+    return redis_restored + local_restored
+
+
+async def _main(command: str, path: str) -> None:
+    redis_client = RedisClient(write_behind=False)
+    try:
+        if not await redis_client.test_connection():
+            raise SystemExit("Redis is not reachable")
+        if command == "dump":
+            await dump_snapshot(redis_client, path)
+        else:
+            await restore_snapshot(redis_client, path)
+    finally:
+        await redis_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dump or load the InvestAPI cache snapshot")
+    parser.add_argument("command", choices=("dump", "load"))
+    parser.add_argument("--path", default=CACHE_SNAPSHOT_PATH or DEFAULT_SNAPSHOT_PATH)
+    args = parser.parse_args()
+    asyncio.run(_main(args.command, args.path))
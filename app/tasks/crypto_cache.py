@@ -36,6 +36,7 @@ async def _refresh_crypto_cache_once(
     ttl = max(REDIS_CRYPTO_INTERVAL, CRYPTO_CACHE_REFRESH_SECONDS)
     cached_at = datetime.now()
 
+    models: dict[str, CryptoResponse] = {}
     for coin_id, coin_data in data.items():
         if not coin_data or "usd" not in coin_data:
             continue
@@ -46,18 +47,16 @@ async def _refresh_crypto_cache_once(
 
         resolved = resolve_crypto_coin(coin_id)
 
-        await redis_client.set_cache(
-            f"coin:{coin_id}",
-            CryptoResponse(
-                name=resolved.id,
-                symbol=resolved.symbol,
-                full_name=resolved.full_name,
-                price=round(price, 2),
-                cached_at=cached_at,
-            ),
-            ttl=ttl,
+        models[f"coin:{coin_id}"] = CryptoResponse(
+            name=resolved.id,
+            symbol=resolved.symbol,
+            full_name=resolved.full_name,
+            price=round(price, 2),
+            cached_at=cached_at,
         )
 
+    await redis_client.set_many(models, ttl=ttl)
+
     logger.info(f"Crypto cache refreshed (bulk {CRYPTO_PROVIDER_NAME})")
 
 
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.config import REDIS_RECONNECT_INTERVAL
+from app.database import RedisClient
+from app.utils.logging import logger
+
+
+async def redis_health_check_loop(*, redis_client: RedisClient) -> None:
+    while True:
+        try:
+            await asyncio.sleep(REDIS_RECONNECT_INTERVAL)
+            await redis_client.test_connection()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Redis health check failed: {e}")
@@ -1,8 +1,13 @@
 from app.utils.error_handler import handle_error_exception
-from app.utils.exceptions import AssetNotFoundError, ExternalServiceError
+from app.utils.exceptions import (
+    AssetNotFoundError,
+    ExecutorSaturatedError,
+    ExternalServiceError,
+)
 
 __all__ = [
     "handle_error_exception",
     "AssetNotFoundError",
     "ExternalServiceError",
+    "ExecutorSaturatedError",
 ]
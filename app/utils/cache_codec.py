@@ -0,0 +1,198 @@
+import struct
+import zlib
+from typing import Protocol, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import from_json
+
+from app.utils.logging import logger
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+T = TypeVar("T", bound=BaseModel)
+
+ENTRY_FORMAT_VERSION = 1
+_HEADER = struct.Struct(">BBBd")
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+
+class CacheCodec(Protocol):
+    codec_id: int
+    name: str
+
+    def dumps(self, model: BaseModel, exclude_defaults: bool = False) -> bytes: ...
+
+    def loads(self, data: bytes, model_cls: type[T]) -> T: ...
+
+    def parse(self, data: bytes) -> object: ...
+
+
+class JsonCodec:
+    codec_id = 1
+    name = "json"
+
+    def dumps(self, model: BaseModel, exclude_defaults: bool = False) -> bytes:
+        return model.model_dump_json(exclude_defaults=exclude_defaults).encode()
+
+    def loads(self, data: bytes, model_cls: type[T]) -> T:
+        return model_cls.model_validate_json(data)
+
+    def parse(self, data: bytes) -> object:
+        return from_json(data)
+
+
+class MsgpackCodec:
+    codec_id = 2
+    name = "msgpack"
+
+    def dumps(self, model: BaseModel, exclude_defaults: bool = False) -> bytes:
+        return msgpack.packb(model.model_dump(mode="json", exclude_defaults=exclude_defaults))
+
+    def loads(self, data: bytes, model_cls: type[T]) -> T:
+        return model_cls.model_validate(msgpack.unpackb(data))
+
+    def parse(self, data: bytes) -> object:
+        return msgpack.unpackb(data)
+
+
+_CODECS: dict[int, CacheCodec] = {JsonCodec.codec_id: JsonCodec()}
+if msgpack is not None:
+    _CODECS[MsgpackCodec.codec_id] = MsgpackCodec()
+
+
+def _compress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(body, 1)
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def _decompress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd compressed cache entry, but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression != COMPRESSION_NONE:
+        raise ValueError(f"Unknown cache compression {compression}")
+    return body
+
+
+class EntryCodec:
+    """Frames cache entries as a version byte, codec and compression ids, the soft
+    expiry and the encoded model.
+
+    Readers understand every registered codec whatever the writer is configured
+    with, and plain pydantic JSON written before the header existed, so workers
+    on different settings can share keys during a rolling upgrade.
+    """
+
+    def __init__(
+        self,
+        codec: CacheCodec | None = None,
+        compression: int = COMPRESSION_NONE,
+        compress_min_bytes: int = 0,
+    ):
+        self.codec = codec or _CODECS[JsonCodec.codec_id]
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+
+    def encode(
+        self, model: BaseModel, soft_expires_at: float, exclude_defaults: bool = False
+    ) -> tuple[bytes, int]:
+        """Return the framed entry and the uncompressed body size.
+
+        ``exclude_defaults`` leaves out fields equal to their default for a more
+        compact entry; such bodies are not complete responses.
+        """
+        body = self.codec.dumps(model, exclude_defaults)
+        compression = COMPRESSION_NONE
+        if self.compression != COMPRESSION_NONE and len(body) >= self.compress_min_bytes:
+            compression = self.compression
+        header = _HEADER.pack(
+            ENTRY_FORMAT_VERSION, self.codec.codec_id, compression, soft_expires_at
+        )
+        return header + _compress(body, compression), len(body)
+
+    def soft_expiry(self, data: bytes | str) -> float | None:
+        """Read the soft expiry from the header alone, ``None`` for legacy JSON."""
+        if isinstance(data, str):
+            data = data.encode()
+        if data[:1] == b"{":
+            return None
+        return _HEADER.unpack_from(data)[3]
+
+    def decode_json(self, data: bytes | str) -> tuple[bytes, float | None] | None:
+        """Return the JSON body and soft expiry without building the model.
+
+        ``None`` means the entry is not JSON encoded and has to go through ``decode``.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if data[:1] == b"{":
+            return data, None
+
+        version, codec_id, compression, soft_expires_at = _HEADER.unpack_from(data)
+        if version != ENTRY_FORMAT_VERSION or codec_id != JsonCodec.codec_id:
+            return None
+        return _decompress(data[_HEADER.size:], compression), soft_expires_at
+
+    def decode(
+        self, data: bytes | str, model_cls: type[T]
+    ) -> tuple[T, float | None, int]:
+        """Return the model, its soft expiry (``None`` for legacy JSON) and body size."""
+        codec, body, soft_expires_at = self._unframe(data)
+        return codec.loads(body, model_cls), soft_expires_at, len(body)
+
+    def decode_raw(self, data: bytes | str) -> tuple[object, float | None, int]:
+        """Like ``decode``, but return the parsed body instead of a validated model."""
+        codec, body, soft_expires_at = self._unframe(data)
+        return codec.parse(body), soft_expires_at, len(body)
+
+    def _unframe(self, data: bytes | str) -> tuple[CacheCodec, bytes, float | None]:
+        if isinstance(data, str):
+            data = data.encode()
+        if data[:1] == b"{":
+            return _CODECS[JsonCodec.codec_id], data, None
+
+        version, codec_id, compression, soft_expires_at = _HEADER.unpack_from(data)
+        if version != ENTRY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache entry version {version}")
+        codec = _CODECS.get(codec_id)
+        if codec is None:
+            raise ValueError(f"Unsupported cache codec {codec_id}")
+
+        return codec, _decompress(data[_HEADER.size:], compression), soft_expires_at
+
+
+def build_entry_codec(codec_name: str, compression_name: str, compress_min_bytes: int) -> EntryCodec:
+    codec = next(
+        (codec for codec in _CODECS.values() if codec.name == codec_name.lower()),
+        None,
+    )
+    if codec is None:
+        logger.warning(f"Cache codec {codec_name} is not available, using json")
+
+    compression = {
+        "none": COMPRESSION_NONE,
+        "zlib": COMPRESSION_ZLIB,
+        "zstd": COMPRESSION_ZSTD,
+    }.get(compression_name.lower(), COMPRESSION_NONE)
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed, compressing cache with zlib")
+        compression = COMPRESSION_ZLIB
+
+    return EntryCodec(codec, compression, compress_min_bytes)
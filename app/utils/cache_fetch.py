@@ -0,0 +1,292 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import (
+    REDIS_FETCH_LEASE_MS,
+    REDIS_FETCH_LEASE_POLL_MS,
+    REDIS_FETCH_LEASE_WAIT_MS,
+)
+from app.database import CacheEntry, RedisClient
+from app.utils.exceptions import AssetNotFoundError
+from app.utils.logging import logger
+from app.utils.metrics import metrics
+from app.utils.single_flight import single_flight
+
+T = TypeVar("T", bound=BaseModel)
+
+_background_refreshes: set[asyncio.Task] = set()
+
+
+async def _wait_for_cache(
+    redis_client: RedisClient,
+    cache_key: str,
+    model_cls: type[T],
+) -> T | None:
+    deadline = time.monotonic() + REDIS_FETCH_LEASE_WAIT_MS / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(REDIS_FETCH_LEASE_POLL_MS / 1000)
+        entry = await redis_client.get_entry(cache_key, model_cls)
+        if entry is not None and not entry.stale:
+            return entry.value
+        if not await redis_client.lease_held(cache_key):
+            return None
+    return None
+
+
+async def _wait_for_many(
+    redis_client: RedisClient,
+    cache_keys: list[str],
+    model_cls: type[T],
+) -> tuple[dict[str, T], set[str]]:
+    """Wait for the lease holders' writes; return the values and the keys found missing."""
+    results: dict[str, T] = {}
+    not_found: set[str] = set()
+    deadline = time.monotonic() + REDIS_FETCH_LEASE_WAIT_MS / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(REDIS_FETCH_LEASE_POLL_MS / 1000)
+        pending = [
+            cache_key
+            for cache_key in cache_keys
+            if cache_key not in results and cache_key not in not_found
+        ]
+        entries = await redis_client.get_many_entries(pending, model_cls)
+        results.update(
+            {cache_key: entry.value for cache_key, entry in entries.items() if not entry.stale}
+        )
+        pending = [cache_key for cache_key in pending if cache_key not in results]
+        if pending:
+            not_found.update(await redis_client.get_many_not_found(pending))
+        if len(results) + len(not_found) == len(cache_keys):
+            break
+    return results, not_found
+
+
+def _count_not_found_hits(cache_keys: list[str]) -> None:
+    for cache_key in cache_keys:
+        metrics.increment("cache_not_found_hits", prefix=cache_key.split(":", 1)[0])
+
+
+async def _raise_if_not_found(redis_client: RedisClient, cache_key: str) -> None:
+    detail = await redis_client.get_not_found(cache_key)
+    if detail is not None:
+        _count_not_found_hits([cache_key])
+        raise AssetNotFoundError(detail)
+
+
+def _remember_not_found(
+    redis_client: RedisClient | None,
+    cache_key: str,
+    load: Callable[[], Awaitable[T]],
+) -> Callable[[], Awaitable[T]]:
+    async def load_or_remember() -> T:
+        try:
+            return await load()
+        except AssetNotFoundError as e:
+            if redis_client is not None:
+                await redis_client.set_not_found(cache_key, e.detail)
+            raise
+
+    return load_or_remember
+
+
+def _remember_many_not_found(
+    redis_client: RedisClient | None,
+    load_many: Callable[[list[str]], Awaitable[dict[str, T]]],
+) -> Callable[[list[str]], Awaitable[dict[str, T]]]:
+    async def load_or_remember(cache_keys: list[str]) -> dict[str, T]:
+        loaded = await load_many(cache_keys)
+        missing = [cache_key for cache_key in cache_keys if cache_key not in loaded]
+        if redis_client is not None and missing:
+            await redis_client.set_many_not_found(
+                {cache_key: f"{cache_key} not found" for cache_key in missing}
+            )
+        return loaded
+
+    return load_or_remember
+
+
+async def _fetch_with_lease(
+    redis_client: RedisClient,
+    cache_key: str,
+    model_cls: type[T],
+    load: Callable[[], Awaitable[T]],
+) -> T:
+    token = await redis_client.acquire_lease(cache_key, REDIS_FETCH_LEASE_MS)
+    if token is None:
+        cached = await _wait_for_cache(redis_client, cache_key, model_cls)
+        if cached is not None:
+            return cached
+        await _raise_if_not_found(redis_client, cache_key)
+        logger.warning(f"No {cache_key} cache written by lease holder, fetching directly")
+        return await load()
+
+    try:
+        if token:
+            entry = await redis_client.get_entry(cache_key, model_cls)
+            if entry is not None and not entry.stale:
+                return entry.value
+        return await load()
+    finally:
+        await redis_client.release_lease(cache_key, token)
+
+
+async def _fetch_many_with_lease(
+    redis_client: RedisClient,
+    cache_keys: list[str],
+    model_cls: type[T],
+    load_many: Callable[[list[str]], Awaitable[dict[str, T]]],
+) -> dict[str, T]:
+    tokens = await redis_client.acquire_leases(cache_keys, REDIS_FETCH_LEASE_MS)
+    own = [cache_key for cache_key, token in tokens.items() if token is not None]
+    held = [cache_key for cache_key, token in tokens.items() if token is None]
+
+    async def load_own() -> dict[str, T]:
+        return await load_many(own) if own else {}
+
+    async def wait_held() -> tuple[dict[str, T], set[str]]:
+        return await _wait_for_many(redis_client, held, model_cls) if held else ({}, set())
+
+    try:
+        loaded, (waited, not_found) = await asyncio.gather(load_own(), wait_held())
+    finally:
+        await redis_client.release_leases(
+            {cache_key: tokens[cache_key] for cache_key in own}
+        )
+
+    results = {**loaded, **waited}
+    leftovers = [
+        cache_key for cache_key in held if cache_key not in waited and cache_key not in not_found
+    ]
+    if leftovers:
+        logger.warning(
+            f"No cache written by lease holders for {len(leftovers)} keys, fetching directly"
+        )
+        results.update(await load_many(leftovers))
+    return results
+
+
+async def coalesced_fetch(
+    redis_client: RedisClient | None,
+    cache_key: str,
+    model_cls: type[T],
+    load: Callable[[], Awaitable[T]],
+) -> T:
+    """Run ``load`` once per key in this process and, with Redis, once per fleet.
+
+    Concurrent misses in the worker share one single-flight call. Across workers
+    the first one to take the Redis fetch lease calls the provider while the
+    others wait for the cache it writes; without Redis only the single-flight
+    applies.
+    """
+    if redis_client is None:
+        return await single_flight.do(cache_key, load)
+    return await single_flight.do(
+        cache_key,
+        lambda: _fetch_with_lease(redis_client, cache_key, model_cls, load),
+    )
+
+
+async def coalesced_fetch_many(
+    redis_client: RedisClient | None,
+    cache_keys: list[str],
+    model_cls: type[T],
+    load_many: Callable[[list[str]], Awaitable[dict[str, T]]],
+) -> dict[str, T]:
+    if redis_client is None:
+        return await single_flight.do_many(cache_keys, load_many)
+    return await single_flight.do_many(
+        cache_keys,
+        lambda keys: _fetch_many_with_lease(redis_client, keys, model_cls, load_many),
+    )
+
+
+def _refresh_in_background(name: str, refresh: Awaitable[object]) -> None:
+    async def run() -> None:
+        try:
+            await refresh
+        except Exception as e:
+            logger.error(f"Background refresh of {name} failed: {e}")
+
+    task = asyncio.create_task(run())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def cached_fetch(
+    redis_client: RedisClient | None,
+    cache_key: str,
+    model_cls: type[T],
+    load: Callable[[], Awaitable[T]],
+    read: Callable[[], Awaitable[CacheEntry[T] | None]] | None = None,
+) -> T:
+    """Serve ``cache_key`` from cache, revalidating stale entries in the background.
+
+    ``read`` replaces the cache lookup of the fast path, e.g. to read only a
+    window of a history entry. Misses and refreshes always load the whole entry.
+    When ``load`` raises ``AssetNotFoundError`` the error is cached for
+    ``REDIS_NOT_FOUND_INTERVAL`` and replayed to later misses of the key.
+    """
+    load = _remember_not_found(redis_client, cache_key, load)
+    if redis_client is not None:
+        if read is not None:
+            entry = await read()
+        else:
+            entry = await redis_client.get_entry(cache_key, model_cls)
+        if entry is not None:
+            if entry.stale and cache_key not in single_flight:
+                _refresh_in_background(
+                    cache_key, coalesced_fetch(redis_client, cache_key, model_cls, load)
+                )
+            return entry.value
+        await _raise_if_not_found(redis_client, cache_key)
+
+    return await coalesced_fetch(redis_client, cache_key, model_cls, load)
+
+
+async def cached_fetch_many(
+    redis_client: RedisClient | None,
+    cache_keys: list[str],
+    model_cls: type[T],
+    load_many: Callable[[list[str]], Awaitable[dict[str, T]]],
+) -> dict[str, T]:
+    """Batched ``cached_fetch``; keys ``load_many`` does not return are left out.
+
+    Those keys are cached as not found for ``REDIS_NOT_FOUND_INTERVAL`` and
+    skipped by later calls until then.
+    """
+    load_many = _remember_many_not_found(redis_client, load_many)
+    results: dict[str, T] = {}
+    stale: list[str] = []
+    if redis_client is not None:
+        for cache_key, entry in (await redis_client.get_many_entries(cache_keys, model_cls)).items():
+            results[cache_key] = entry.value
+            if entry.stale and cache_key not in single_flight:
+                stale.append(cache_key)
+
+    if stale:
+        _refresh_in_background(
+            f"{len(stale)} keys",
+            coalesced_fetch_many(redis_client, stale, model_cls, load_many),
+        )
+
+    missing = [cache_key for cache_key in cache_keys if cache_key not in results]
+    if missing and redis_client is not None:
+        not_found = await redis_client.get_many_not_found(missing)
+        _count_not_found_hits(list(not_found))
+        missing = [cache_key for cache_key in missing if cache_key not in not_found]
+    if missing:
+        results.update(await coalesced_fetch_many(redis_client, missing, model_cls, load_many))
+    return results
+
+
+async def cancel_background_refreshes() -> None:
+    for task in list(_background_refreshes):
+        task.cancel()
+    await asyncio.gather(*_background_refreshes, return_exceptions=True)
+
+
+async def wait_background_refreshes() -> None:
+    await asyncio.gather(*_background_refreshes, return_exceptions=True)
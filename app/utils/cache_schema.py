@@ -0,0 +1,78 @@
+import hashlib
+import json
+import re
+import time
+from functools import lru_cache
+
+from pydantic import BaseModel
+
+from app.utils.logging import logger
+
+SCHEMA_REGISTRY_PREFIX = "schema:"
+LEGACY_VERSION = ""
+
+_VERSION_SUFFIX = re.compile(r"@[0-9a-f]{8}$")
+
+
+@lru_cache(maxsize=None)
+def schema_version(model_cls: type[BaseModel]) -> str:
+    """Short hash of the JSON schema of ``model_cls``; changes with any field change."""
+    schema = json.dumps(model_cls.model_json_schema(), sort_keys=True)
+    return hashlib.sha1(schema.encode()).hexdigest()[:8]
+
+
+def versioned_key(cache_key: str, version: str) -> str:
+    if version == LEGACY_VERSION:
+        return cache_key
+    return f"{cache_key}@{version}"
+
+
+def unversioned_key(key: str) -> str:
+    return _VERSION_SUFFIX.sub("", key)
+
+
+class SchemaRegistry:
+    """Tracks the schema versions of each cached model that the fleet still writes.
+
+    Every worker bumps its own version in the ``schema:{model}`` sorted set, scored
+    by the last time it was seen. Versions seen within ``dual_read_seconds``
+    are peers whose keys are read when the worker's own key is missing. The
+    unversioned keys written before versioning count as a peer for
+    ``dual_read_seconds`` after a model is first registered.
+    """
+
+    def __init__(self, dual_read_seconds: int, refresh_seconds: int):
+        self._dual_read_seconds = dual_read_seconds
+        self._refresh_seconds = refresh_seconds
+        self._peers: dict[type[BaseModel], tuple[float, list[str]]] = {}
+
+    async def peers(self, client, model_cls: type[BaseModel]) -> list[str]:
+        """Return the live versions of ``model_cls`` other than ours, newest first."""
+        known = self._peers.get(model_cls)
+        if known is not None and known[0] > time.monotonic():
+            return known[1]
+
+        version = schema_version(model_cls)
+        registry_key = f"{SCHEMA_REGISTRY_PREFIX}{model_cls.__name__}"
+        now = time.time()
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.zadd(registry_key, {LEGACY_VERSION: now}, nx=True)
+            pipe.zadd(registry_key, {version: now})
+            pipe.zrangebyscore(
+                registry_key, now - self._dual_read_seconds, "+inf", withscores=True
+            )
+            _, _, live = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error while registering {model_cls.__name__} schema: {e}")
+            return known[1] if known is not None else []
+
+        live = [
+            (member.decode() if isinstance(member, bytes) else member, score)
+            for member, score in live
+        ]
+        # Unversioned keys predate every versioned one, whatever their score.
+        live.sort(key=lambda item: (item[0] != LEGACY_VERSION, item[1]), reverse=True)
+        peers = [member for member, _ in live if member != version]
+        self._peers[model_cls] = (time.monotonic() + self._refresh_seconds, peers)
+        return peers
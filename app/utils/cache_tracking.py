@@ -0,0 +1,101 @@
+import asyncio
+from typing import Callable
+
+import redis.asyncio as aioredis
+
+from app.utils.logging import logger
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+
+class ClientTracking:
+    """Redis client tracking in broadcast mode, redirected to a listener connection.
+
+    One connection subscribes to the invalidation channel. A second one turns
+    on tracking for the cache key prefixes and redirects its notifications to
+    the first, so a write to any of those keys, by any client, reaches
+    ``on_invalidate`` with the Redis key names. ``on_invalidate(None)`` means
+    the keyspace was flushed or tracking was lost, and everything cached
+    locally has to go.
+    """
+
+    def __init__(
+        self,
+        prefixes: list[str],
+        on_invalidate: Callable[[list[str] | None], None],
+        ping_interval: float,
+        retry_interval: float,
+    ):
+        self._prefixes = prefixes
+        self._on_invalidate = on_invalidate
+        self._ping_interval = ping_interval
+        self._retry_interval = retry_interval
+        self._active = False
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def _set_active(self, active: bool) -> None:
+        if active == self._active:
+            return
+        self._active = active
+        if not active:
+            self._on_invalidate(None)
+
+    def handle(self, message: list) -> None:
+        kind, channel, keys = (message + [None, None, None])[:3]
+        if isinstance(kind, bytes):
+            kind = kind.decode()
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        if kind != "message" or channel != INVALIDATION_CHANNEL:
+            return
+        if keys is None:
+            self._on_invalidate(None)
+            return
+        self._on_invalidate([key.decode() if isinstance(key, bytes) else key for key in keys])
+
+    async def run(self, client: aioredis.Redis) -> None:
+        while True:
+            try:
+                await self._listen(client.connection_pool)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis client tracking lost: {e}")
+            finally:
+                self._set_active(False)
+            await asyncio.sleep(self._retry_interval)
+
+    async def _listen(self, pool) -> None:
+        listener = await pool.get_connection()
+        tracker = None
+        try:
+            # Subscribed connections only answer PING, which is sent by hand below.
+            listener.health_check_interval = 0
+            await listener.send_command("CLIENT", "ID")
+            client_id = await listener.read_response()
+            await listener.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+            await listener.read_response()
+
+            tracker = await pool.get_connection()
+            prefixes = [arg for prefix in self._prefixes for arg in ("PREFIX", prefix)]
+            await tracker.send_command(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefixes
+            )
+            await tracker.read_response()
+            self._set_active(True)
+            logger.info(f"Redis client tracking on for {', '.join(self._prefixes)}")
+
+            while True:
+                message = await listener.read_response(timeout=self._ping_interval)
+                if message is None:
+                    await listener.send_command("PING")
+                    continue
+                self.handle(message)
+        finally:
+            for connection in (listener, tracker):
+                if connection is not None:
+                    await connection.disconnect()
+                    await pool.release(connection)
@@ -9,3 +9,8 @@ class ExternalServiceError(Exception):
         self.detail = detail
         self.status_code = status_code
         super().__init__(detail)
+
+
+class ExecutorSaturatedError(ExternalServiceError):
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail, status_code=503)
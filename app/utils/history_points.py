@@ -2,7 +2,30 @@ from datetime import date, datetime, timedelta
 
 from app.schemas.history_responses import DAILY_INTERVAL, HistoryPoint
 
-__all__ = ["DAILY_INTERVAL", "HistoryPoint", "filter_points_by_days", "collapse_to_daily"]
+__all__ = [
+    "DAILY_INTERVAL",
+    "HistoryPoint",
+    "filter_points_by_days",
+    "collapse_to_daily",
+    "merge_points",
+    "construct_point",
+]
+
+_POINT_FIELDS = frozenset(HistoryPoint.model_fields)
+
+
+def construct_point(timestamp: datetime, price: float, volume: float | None) -> HistoryPoint:
+    """Build a point from values we serialized ourselves, skipping validation.
+
+    Same result as ``HistoryPoint.model_construct`` without its per-field
+    bookkeeping, which matters when decoding thousands of cached points.
+    """
+    point = object.__new__(HistoryPoint)
+    object.__setattr__(point, "__dict__", {"timestamp": timestamp, "price": price, "volume": volume})
+    object.__setattr__(point, "__pydantic_fields_set__", set(_POINT_FIELDS))
+    object.__setattr__(point, "__pydantic_extra__", None)
+    object.__setattr__(point, "__pydantic_private__", None)
+    return point
 
 
 def filter_points_by_days(points: list[HistoryPoint], days: int) -> list[HistoryPoint]:
@@ -10,6 +33,14 @@ def filter_points_by_days(points: list[HistoryPoint], days: int) -> list[History
     return [point for point in points if point.timestamp >= cutoff]
 
 
+def merge_points(points: list[HistoryPoint], newer: list[HistoryPoint]) -> list[HistoryPoint]:
+    """Replace the tail of ``points`` from the first timestamp of ``newer`` on."""
+    if not newer:
+        return list(points)
+    start = newer[0].timestamp
+    return [point for point in points if point.timestamp < start] + newer
+
+
 def collapse_to_daily(points: list[HistoryPoint]) -> list[HistoryPoint]:
     if not points:
         return []
@@ -0,0 +1,45 @@
+from collections import Counter
+
+
+class Metrics:
+    """In-process counters, gauges and histograms, keyed by name and labels in
+    Prometheus notation."""
+
+    def __init__(self) -> None:
+        self._counters: Counter[str] = Counter()
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> str:
+        if not labels:
+            return name
+        rendered = ",".join(f'{label}="{value}"' for label, value in sorted(labels.items()))
+        return f"{name}{{{rendered}}}"
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        self._counters[self._key(name, labels)] += amount
+
+    def set(self, name: str, value: int, **labels: str) -> None:
+        self._counters[self._key(name, labels)] = value
+
+    def observe(
+        self, name: str, value: float, buckets: tuple[float, ...], **labels: str
+    ) -> None:
+        """Add ``value`` to the cumulative ``{name}_bucket``, ``_sum`` and ``_count`` series."""
+        for bound in buckets:
+            if value <= bound:
+                self._counters[self._key(f"{name}_bucket", {**labels, "le": str(bound)})] += 1
+        self._counters[self._key(f"{name}_bucket", {**labels, "le": "+Inf"})] += 1
+        self._counters[self._key(f"{name}_sum", labels)] += value
+        self._counters[self._key(f"{name}_count", labels)] += 1
+
+    def get(self, name: str, **labels: str) -> float:
+        return self._counters[self._key(name, labels)]
+
+    def snapshot(self) -> dict[str, float]:
+        return dict(self._counters)
+
+    def reset(self) -> None:
+        self._counters.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from app.utils.logging import logger
+from app.utils.metrics import metrics
+
+R = TypeVar("R")
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class MicroBatcher(Generic[R]):
+    """Collects keys requested within ``window`` seconds into one ``load_many`` call.
+
+    The first key of a batch starts the window; the batch is sent when it ends
+    or as soon as ``max_size`` keys are waiting. Every caller gets the value
+    loaded for its own key, ``None`` if ``load_many`` left it out, the exception
+    ``load_many`` returned for that key alone, or the exception that failed the
+    whole batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load_many: Callable[[list[str]], Awaitable[dict[str, R | Exception]]],
+        window: float,
+        max_size: int,
+    ) -> None:
+        self._name = name
+        self._load_many = load_many
+        self._window = window
+        self._max_size = max_size
+        self._pending: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def load(self, key: str) -> R | None:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._max_size:
+                self._send()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window, self._send)
+        # Shielded so one cancelled caller does not fail the others waiting on the key.
+        return await asyncio.shield(future)
+
+    def _send(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: dict[str, asyncio.Future]) -> None:
+        metrics.observe("micro_batch_size", len(batch), BATCH_SIZE_BUCKETS, batcher=self._name)
+        try:
+            results = await self._load_many(list(batch))
+        except Exception as e:
+            logger.error(f"Error while loading {self._name} batch of {len(batch)}: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Marks the exception retrieved when every caller has gone.
+                    future.add_done_callback(lambda done: done.exception())
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            result = results.get(key)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                future.add_done_callback(lambda done: done.exception())
+            else:
+                future.set_result(result)
@@ -0,0 +1,58 @@
+import redis.asyncio as aioredis
+
+from app.utils.logging import logger
+
+
+class ReplicaRouter:
+    """Round-robin over the read replicas that are up and within ``max_lag``.
+
+    A replica is taken out of rotation when a read on it fails, or when
+    ``check`` finds its link to the primary down or silent for longer than
+    ``max_lag`` seconds. The next ``check`` puts it back once it has caught up.
+    ``reader`` returns ``None`` when no replica is usable.
+    """
+
+    def __init__(self, replicas: list[aioredis.Redis], max_lag: int):
+        self._replicas = replicas
+        self._max_lag = max_lag
+        self._healthy = list(replicas)
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def healthy(self) -> int:
+        return len(self._healthy)
+
+    def reader(self) -> aioredis.Redis | None:
+        if not self._healthy:
+            return None
+        self._next = (self._next + 1) % len(self._healthy)
+        return self._healthy[self._next]
+
+    def mark_down(self, replica: aioredis.Redis, reason: str) -> None:
+        if replica in self._healthy:
+            self._healthy.remove(replica)
+            logger.warning(f"Redis replica out of rotation: {reason}")
+
+    async def _is_healthy(self, replica: aioredis.Redis) -> bool:
+        try:
+            info = await replica.info("replication")
+        except Exception as e:
+            logger.warning(f"Redis replica health check failed: {e}")
+            return False
+        return (
+            info.get("master_link_status") == "up"
+            and int(info.get("master_last_io_seconds_ago", self._max_lag + 1)) <= self._max_lag
+        )
+
+    async def check(self) -> None:
+        healthy = [replica for replica in self._replicas if await self._is_healthy(replica)]
+        if len(healthy) != len(self._healthy):
+            logger.info(f"{len(healthy)}/{len(self._replicas)} Redis replicas in rotation")
+        self._healthy = healthy
+
+    async def close(self) -> None:
+        for replica in self._replicas:
+            await replica.close()
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from app.utils.exceptions import AssetNotFoundError
+
+R = TypeVar("R")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one shared task.
+
+    The shared task is shielded from its callers, so a cancelled request does not
+    abort the upstream fetch the other waiters are still awaiting.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    def _start(self, key: str, call: Awaitable[R]) -> asyncio.Future:
+        future = asyncio.ensure_future(call)
+        self._calls[key] = future
+
+        def forget(done: asyncio.Future) -> None:
+            if self._calls.get(key) is done:
+                del self._calls[key]
+            if not done.cancelled():
+                done.exception()
+
+        future.add_done_callback(forget)
+        return future
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[R]]) -> R:
+        future = self._calls.get(key)
+        if future is None:
+            future = self._start(key, fn())
+        return await asyncio.shield(future)
+
+    async def do_many(
+        self,
+        keys: list[str],
+        fn: Callable[[list[str]], Awaitable[dict[str, R]]],
+    ) -> dict[str, R]:
+        """Run ``fn`` once for the keys nobody is fetching yet and join the rest.
+
+        A key ``fn`` leaves out raises ``AssetNotFoundError`` in a ``do`` caller
+        joining it, and is left out of the result here, like a joined key whose
+        own fetch was not found.
+        """
+        own = [key for key in keys if key not in self._calls]
+        if own:
+            batch = asyncio.ensure_future(fn(own))
+
+            async def pick(key: str) -> R:
+                results = await batch
+                if key not in results:
+                    raise AssetNotFoundError(f"{key} not found")
+                return results[key]
+
+            for key in own:
+                self._start(key, pick(key))
+
+        futures = [self._calls.get(key) for key in keys]
+        values = await asyncio.gather(
+            *(asyncio.shield(future) for future in futures), return_exceptions=True
+        )
+        results: dict[str, R] = {}
+        for key, value in zip(keys, values):
+            if isinstance(value, AssetNotFoundError):
+                continue
+            if isinstance(value, BaseException):
+                raise value
+            results[key] = value
+        return results
+
+
+single_flight = SingleFlight()
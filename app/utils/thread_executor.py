@@ -0,0 +1,90 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.config import YFINANCE_MAX_QUEUE, YFINANCE_MAX_WORKERS
+from app.utils.exceptions import ExecutorSaturatedError
+from app.utils.logging import logger
+from app.utils.metrics import metrics
+
+R = TypeVar("R")
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class BoundedExecutor:
+    """Thread pool for blocking provider calls with a bounded backlog.
+
+    At most ``max_workers`` calls run at once and ``max_queue`` more wait for a
+    thread. Past that, ``run`` raises ``ExecutorSaturatedError`` right away
+    instead of letting requests pile up behind a slow provider. Queue wait and
+    run time are recorded per executor.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self._name = name
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._capacity = max_workers + max_queue
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        if self._pending >= self._capacity:
+            metrics.increment("executor_rejected", executor=self._name)
+            raise ExecutorSaturatedError(f"Too many pending {self._name} calls, try again later")
+
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        timings: dict[str, float] = {}
+
+        def call() -> R:
+            started_at = time.perf_counter()
+            timings["wait"] = started_at - queued_at
+            try:
+                return fn(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started_at
+
+        def done(_future: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release, timings)
+            except RuntimeError:
+                pass  # The loop is already closed.
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix=self._name
+            )
+        self._pending += 1
+        self._report_pending()
+        future = self._pool.submit(call)
+        # The slot is freed when the thread finishes, even if the caller was cancelled.
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, timings: dict[str, float]) -> None:
+        self._pending -= 1
+        self._report_pending()
+        for stage in ("wait", "run"):
+            if stage in timings:
+                metrics.observe(
+                    f"executor_{stage}_seconds", timings[stage], SECONDS_BUCKETS,
+                    executor=self._name,
+                )
+
+    def _report_pending(self) -> None:
+        metrics.set("executor_pending", self._pending, executor=self._name)
+
+    def shutdown(self) -> None:
+        if self._pool is None:
+            return
+        logger.info(f"Shutting down {self._name} executor with {self._pending} pending calls")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+yfinance_executor = BoundedExecutor("yfinance", YFINANCE_MAX_WORKERS, YFINANCE_MAX_QUEUE)
@@ -0,0 +1,86 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from app.utils.logging import logger
+from app.utils.metrics import metrics
+
+# Queues the commands of one cache write on a Redis pipeline.
+Write = Callable[[Any], None]
+
+
+class WriteBehindQueue:
+    """Bounded FIFO of cache writes, flushed in pipelined batches by one task.
+
+    Writes reach Redis in the order they were queued. When the queue is full,
+    new writes are dropped and counted: the caller already holds the value in
+    its L1, so a drop only costs other workers a miss.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[Write]], Awaitable[None]],
+        max_pending: int,
+        batch_size: int,
+    ) -> None:
+        self._flush = flush
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._pending: deque[Write] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, write: Write) -> bool:
+        if len(self._pending) >= self._max_pending:
+            self._drop(1, "full")
+            return False
+
+        self._pending.append(write)
+        self._report_depth()
+        self._idle.clear()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return True
+
+    def _drop(self, count: int, reason: str) -> None:
+        self.dropped += count
+        metrics.increment("cache_write_behind_dropped", count, reason=reason)
+
+    def _report_depth(self) -> None:
+        metrics.set("cache_write_behind_depth", len(self._pending))
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(self._batch_size, len(self._pending)))
+                ]
+                self._report_depth()
+                try:
+                    await self._flush(batch)
+                    metrics.increment("cache_write_behind_flushed", len(batch))
+                except Exception as e:
+                    logger.error(f"Error while flushing {len(batch)} cache writes: {e}")
+                    self._drop(len(batch), "error")
+            self._idle.set()
+
+    async def flush(self) -> None:
+        """Wait until every write queued so far has been sent."""
+        await self._idle.wait()
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
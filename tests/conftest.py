@@ -1,3 +1,5 @@
+import fnmatch
+import pickle
 from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock
@@ -5,6 +7,7 @@ from unittest.mock import MagicMock
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ResponseError
 
 from app.main import app
 from app.schemas import (
@@ -157,18 +160,188 @@ class FakeAiohttpSession:
         return None
 
 
+class FakeRedisPipeline:
+    def __init__(self, backend: "FakeRedisBackend") -> None:
+        self._backend = backend
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args: object, **kwargs: object) -> "FakeRedisPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self, raise_on_error: bool = True) -> list[object]:
+        self._backend.round_trips += 1
+        commands, self._commands = self._commands, []
+        results = []
+        for name, args, kwargs in commands:
+            try:
+                results.append(await getattr(self._backend, name)(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        self._backend.round_trips -= len(commands)
+        return results
+
+
 class FakeRedisBackend:
     def __init__(self) -> None:
         self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.idle: dict[str, int] = {}
+        self.round_trips = 0
 
     async def ping(self) -> bool:
         return True
 
     async def get(self, key: str) -> str | None:
+        self.round_trips += 1
         return self.store.get(key)
 
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
     async def setex(self, key: str, ttl: int, value: str) -> None:
+        self.round_trips += 1
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        nx: bool = False,
+        px: int | None = None,
+    ) -> bool | None:
+        self.round_trips += 1
+        if nx and key in self.store:
+            return None
         self.store[key] = value
+        if px is not None:
+            self.ttls[key] = max(px // 1000, 1)
+        return True
+
+    async def exists(self, *keys: str) -> int:
+        self.round_trips += 1
+        return sum(key in self.store for key in keys)
+
+    async def delete(self, *keys: str) -> int:
+        self.round_trips += 1
+        deleted = 0
+        for key in keys:
+            if self.store.pop(key, None) is not None:
+                deleted += 1
+            self.ttls.pop(key, None)
+        return deleted
+
+    async def expire(self, key: str, ttl: int, nx: bool = False, gt: bool = False) -> bool:
+        self.round_trips += 1
+        if key not in self.store:
+            return False
+        if nx and key in self.ttls:
+            return False
+        if gt and self.ttls.get(key, -1) >= ttl:
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    async def zadd(
+        self, key: str, mapping: dict[bytes | str, float], nx: bool = False
+    ) -> int:
+        self.round_trips += 1
+        zset = self.store.setdefault(key, {})
+        added = {member: score for member, score in mapping.items() if member not in zset}
+        zset.update(added if nx else mapping)
+        return len(added)
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        min: float | str,
+        max: float | str,
+        withscores: bool = False,
+    ) -> list:
+        self.round_trips += 1
+        low, high = float(min), float(max)
+        zset = self.store.get(key) or {}
+        return [
+            (member, score) if withscores else member
+            for member, score in sorted(zset.items(), key=lambda item: item[1])
+            if low <= score <= high
+        ]
+
+    async def hset(self, key: str, mapping: dict[str, object]) -> int:
+        self.round_trips += 1
+        fields = self.store.setdefault(key, {})
+        added = sum(field not in fields for field in mapping)
+        fields.update(mapping)
+        return added
+
+    async def hget(self, key: str, field: str) -> object | None:
+        self.round_trips += 1
+        return (self.store.get(key) or {}).get(field)
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        self.round_trips += 1
+        hash_fields = self.store.get(key) or {}
+        return sum(hash_fields.pop(field, None) is not None for field in fields)
+
+    async def hmget(self, key: str, fields: list[str]) -> list[object | None]:
+        self.round_trips += 1
+        return [(self.store.get(key) or {}).get(field) for field in fields]
+
+    async def eval(self, _script: str, _numkeys: int, key: str, token: str) -> int:
+        # Only the compare-and-delete fetch lease release script is evaluated.
+        if self.store.get(key) != token:
+            self.round_trips += 1
+            return 0
+        return await self.delete(key)
+
+    async def scan_iter(self, match: str | None = None, count: int | None = None):
+        for key in list(self.store):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def object(self, infotype: str, key: str) -> int | None:
+        self.round_trips += 1
+        if infotype != "idletime":
+            raise ResponseError(f"Unknown OBJECT subcommand {infotype}")
+        return self.idle.get(key, 0) if key in self.store else None
+
+    async def dbsize(self) -> int:
+        self.round_trips += 1
+        return len(self.store)
+
+    async def memory_usage(self, key: str) -> int | None:
+        self.round_trips += 1
+        value = self.store.get(key)
+        return None if value is None else 64 + len(repr(value))
+
+    async def pttl(self, key: str) -> int:
+        self.round_trips += 1
+        if key not in self.store:
+            return -2
+        return self.ttls[key] * 1000 if key in self.ttls else -1
+
+    async def dump(self, key: str) -> bytes | None:
+        self.round_trips += 1
+        return pickle.dumps(self.store[key]) if key in self.store else None
+
+    async def restore(self, key: str, ttl_ms: int, value: bytes) -> bool:
+        self.round_trips += 1
+        if key in self.store:
+            raise ResponseError("BUSYKEY Target key name already exists.")
+        self.store[key] = pickle.loads(value)
+        if ttl_ms:
+            self.ttls[key] = max(ttl_ms // 1000, 1)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
 
     async def close(self) -> None:
         return None
@@ -183,7 +356,7 @@ def fake_redis_backend() -> FakeRedisBackend:
 def redis_client(fake_redis_backend: FakeRedisBackend):
     from app.database import RedisClient
 
-    client = RedisClient()
+    client = RedisClient(schema_versioning=False, write_behind=False)
     client._client = fake_redis_backend
     return client
 
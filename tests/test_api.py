@@ -3,10 +3,12 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from app.main import app
 from app.types.enums.enums import AssetType
 from app.utils import AssetNotFoundError
 from app.schemas import (
     CryptoPricesResponse,
+    StockPricesResponse,
     StockResponse,
     SteamResponse,
     StockHistoryResponse,
@@ -47,6 +49,64 @@ async def test_stock_endpoint_returns_service_result(client, monkeypatch, sample
     assert stock.asset_type == AssetType.STOCK
 
 
+@pytest.mark.asyncio
+async def test_stock_endpoint_serves_cached_json(client, redis_client, monkeypatch, sample_stock):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    app.state.redis_client = redis_client
+    service = AsyncMock()
+    monkeypatch.setattr("app.routers.assets.get_stock_price", service)
+
+    response = await client.get("/stock/amd")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == sample_stock.model_dump_json().encode()
+    service.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_crypto_endpoint_serves_cached_json(client, redis_client, monkeypatch, sample_crypto):
+    await redis_client.set_cache("coin:solana", sample_crypto, ttl=900)
+    app.state.redis_client = redis_client
+    service = AsyncMock()
+    monkeypatch.setattr("app.routers.assets.get_crypto_prices", service)
+
+    response = await client.get("/crypto/solana")
+
+    assert response.status_code == 200
+    prices = CryptoPricesResponse.model_validate(response.json())
+    assert prices.coins == [sample_crypto]
+    service.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_endpoint_serves_cached_json(client, redis_client, monkeypatch, sample_stock):
+    nvda = sample_stock.model_copy(update={"name": "NVDA", "full_name": "NVIDIA Corporation"})
+    await redis_client.set_many({"stock:AMD": sample_stock, "stock:NVDA": nvda}, ttl=900)
+    app.state.redis_client = redis_client
+    service = AsyncMock()
+    monkeypatch.setattr("app.routers.assets.get_stock_prices", service)
+
+    response = await client.get("/stock/nvda,amd")
+
+    assert response.status_code == 200
+    prices = StockPricesResponse.model_validate(response.json())
+    assert prices.stocks == [nvda, sample_stock]
+    service.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_endpoint_returns_service_result(client, monkeypatch, sample_stock):
+    service = AsyncMock(return_value=StockPricesResponse(stocks=[sample_stock]))
+    monkeypatch.setattr("app.routers.assets.get_stock_prices", service)
+
+    response = await client.get("/stock/AMD,FAKE")
+
+    assert response.status_code == 200
+    assert response.json()["stocks"][0]["name"] == "AMD"
+    service.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_stock_endpoint_not_found(client, monkeypatch):
     monkeypatch.setattr(
@@ -78,6 +138,12 @@ async def test_stock_history_endpoint_returns_service_result(
     assert history.asset_type == AssetType.STOCK
 
 
+def test_stock_history_schema_hides_cache_bookkeeping():
+    properties = app.openapi()["components"]["schemas"]["StockHistoryResponse"]["properties"]
+
+    assert "rebuilt_at" not in properties
+
+
 @pytest.mark.asyncio
 async def test_crypto_history_endpoint_returns_service_result(
     client, monkeypatch, sample_crypto_history
@@ -0,0 +1,112 @@
+import importlib.util
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.schemas import HistoryPoint, StockHistoryResponse, StockResponse
+from app.utils.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    COMPRESSION_ZSTD,
+    EntryCodec,
+    JsonCodec,
+    MsgpackCodec,
+    build_entry_codec,
+)
+
+SOFT_EXPIRES_AT = 1_800_000_000.5
+
+
+def _long_history(size: int = 15_000) -> StockHistoryResponse:
+    start = datetime(1980, 1, 1)
+    return StockHistoryResponse(
+        name="AMD",
+        full_name="Advanced Micro Devices, Inc.",
+        interval="1d",
+        points=[
+            HistoryPoint(
+                timestamp=start + timedelta(days=day),
+                price=round(10 + day * 0.0137, 4),
+                volume=float(1_000_000 + day * 37),
+            )
+            for day in range(size)
+        ],
+        cached_at=datetime(2026, 5, 22, 12, 0, 0),
+    )
+
+
+def test_json_round_trip(sample_stock: StockResponse):
+    codec = EntryCodec(JsonCodec())
+
+    payload, size = codec.encode(sample_stock, SOFT_EXPIRES_AT)
+    model, soft_expires_at, decoded_size = codec.decode(payload, StockResponse)
+
+    assert payload[0] == 1
+    assert model == sample_stock
+    assert soft_expires_at == SOFT_EXPIRES_AT
+    assert size == decoded_size == len(sample_stock.model_dump_json())
+
+
+def test_msgpack_round_trip(sample_stock_history: StockHistoryResponse):
+    pytest.importorskip("msgpack")
+    codec = EntryCodec(MsgpackCodec())
+
+    payload, _ = codec.encode(sample_stock_history, SOFT_EXPIRES_AT)
+
+    assert codec.decode(payload, StockHistoryResponse)[0] == sample_stock_history
+    assert EntryCodec(JsonCodec()).decode(payload, StockHistoryResponse)[0] == sample_stock_history
+
+
+def test_compresses_only_above_threshold(sample_stock: StockResponse):
+    codec = EntryCodec(JsonCodec(), COMPRESSION_ZLIB, compress_min_bytes=10_000)
+    small, _ = codec.encode(sample_stock, SOFT_EXPIRES_AT)
+    large, size = codec.encode(_long_history(500), SOFT_EXPIRES_AT)
+
+    assert small[2] == COMPRESSION_NONE
+    assert large[2] == COMPRESSION_ZLIB
+    assert len(large) < size
+    assert codec.decode(large, StockHistoryResponse)[0] == _long_history(500)
+
+
+def test_decodes_legacy_json(sample_stock: StockResponse):
+    model, soft_expires_at, _ = EntryCodec().decode(sample_stock.model_dump_json(), StockResponse)
+
+    assert model == sample_stock
+    assert soft_expires_at is None
+
+
+def test_rejects_unknown_version(sample_stock: StockResponse):
+    payload, _ = EntryCodec().encode(sample_stock, SOFT_EXPIRES_AT)
+
+    with pytest.raises(ValueError, match="Unsupported cache entry version"):
+        EntryCodec().decode(b"\x09" + payload[1:], StockResponse)
+
+
+def test_build_entry_codec_falls_back_to_json():
+    codec = build_entry_codec("nope", "gzip", 0)
+
+    assert codec.codec.name == "json"
+    assert codec.compression == COMPRESSION_NONE
+
+
+def test_codec_sizes_against_plain_json():
+    history = _long_history()
+    candidates = {"plain json": None, "json+zlib": EntryCodec(JsonCodec(), COMPRESSION_ZLIB)}
+    if importlib.util.find_spec("zstandard"):
+        candidates["json+zstd"] = EntryCodec(JsonCodec(), COMPRESSION_ZSTD)
+        if importlib.util.find_spec("msgpack"):
+            candidates["msgpack+zstd"] = EntryCodec(MsgpackCodec(), COMPRESSION_ZSTD)
+
+    sizes: dict[str, int] = {}
+    for name, codec in candidates.items():
+        if codec is None:
+            payload = history.model_dump_json().encode()
+            decoded = StockHistoryResponse.model_validate_json(payload)
+        else:
+            payload, _ = codec.encode(history, SOFT_EXPIRES_AT)
+            decoded, soft_expires_at, _ = codec.decode(payload, StockHistoryResponse)
+            assert soft_expires_at == SOFT_EXPIRES_AT
+        assert decoded == history
+        sizes[name] = len(payload)
+
+    assert sizes["json+zlib"] < sizes["plain json"] / 4
@@ -0,0 +1,199 @@
+import asyncio
+
+import pytest
+
+import app.database as database
+from app.database import LEASE_KEY_PREFIX, NOT_FOUND_KEY_PREFIX
+from app.schemas import CryptoResponse, StockResponse
+from app.utils import AssetNotFoundError
+from app.utils.cache_fetch import (
+    cached_fetch,
+    cached_fetch_many,
+    coalesced_fetch,
+    coalesced_fetch_many,
+    wait_background_refreshes,
+)
+from app.utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def fast_lease_polling(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("app.utils.cache_fetch.REDIS_FETCH_LEASE_POLL_MS", 1)
+    monkeypatch.setattr("app.utils.cache_fetch.REDIS_FETCH_LEASE_WAIT_MS", 200)
+
+
+@pytest.mark.asyncio
+async def test_without_redis_calls_load(sample_stock):
+    async def load() -> StockResponse:
+        return sample_stock
+
+    assert await coalesced_fetch(None, "stock:AMD", StockResponse, load) == sample_stock
+
+
+@pytest.mark.asyncio
+async def test_lease_released_after_load(redis_client, sample_stock):
+    async def load() -> StockResponse:
+        assert f"{LEASE_KEY_PREFIX}stock:AMD" in redis_client._client.store
+        return sample_stock
+
+    result = await coalesced_fetch(redis_client, "stock:AMD", StockResponse, load)
+
+    assert result == sample_stock
+    assert f"{LEASE_KEY_PREFIX}stock:AMD" not in redis_client._client.store
+
+
+@pytest.mark.asyncio
+async def test_waits_for_lease_holder(redis_client, sample_stock):
+    redis_client._client.store[f"{LEASE_KEY_PREFIX}stock:AMD"] = "other-worker"
+
+    async def other_worker_writes() -> None:
+        await asyncio.sleep(0.01)
+        redis_client._client.store["stock:AMD"] = sample_stock.model_dump_json()
+
+    async def load() -> StockResponse:
+        pytest.fail("lease holder fetches, this worker must not")
+
+    writer = asyncio.create_task(other_worker_writes())
+    result = await coalesced_fetch(redis_client, "stock:AMD", StockResponse, load)
+    await writer
+
+    assert result == sample_stock
+
+
+@pytest.mark.asyncio
+async def test_fetches_when_lease_holder_gives_up(redis_client, sample_stock):
+    redis_client._client.store[f"{LEASE_KEY_PREFIX}stock:AMD"] = "other-worker"
+    calls = 0
+
+    async def other_worker_fails() -> None:
+        await asyncio.sleep(0.01)
+        del redis_client._client.store[f"{LEASE_KEY_PREFIX}stock:AMD"]
+
+    async def load() -> StockResponse:
+        nonlocal calls
+        calls += 1
+        return sample_stock
+
+    failer = asyncio.create_task(other_worker_fails())
+    result = await coalesced_fetch(redis_client, "stock:AMD", StockResponse, load)
+    await failer
+
+    assert result == sample_stock
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_many_waits_only_for_held_keys(redis_client, sample_crypto):
+    redis_client._client.store[f"{LEASE_KEY_PREFIX}coin:solana"] = "other-worker"
+    bitcoin = sample_crypto.model_copy(update={"name": "bitcoin"})
+    loaded: list[list[str]] = []
+
+    async def other_worker_writes() -> None:
+        await asyncio.sleep(0.01)
+        redis_client._client.store["coin:solana"] = sample_crypto.model_dump_json()
+
+    async def load_many(keys: list[str]) -> dict[str, CryptoResponse]:
+        loaded.append(keys)
+        return {key: bitcoin for key in keys}
+
+    writer = asyncio.create_task(other_worker_writes())
+    result = await coalesced_fetch_many(
+        redis_client, ["coin:solana", "coin:bitcoin"], CryptoResponse, load_many
+    )
+    await writer
+
+    assert loaded == [["coin:bitcoin"]]
+    assert result["coin:solana"] == sample_crypto
+    assert result["coin:bitcoin"] == bitcoin
+    assert f"{LEASE_KEY_PREFIX}coin:bitcoin" not in redis_client._client.store
+
+
+def _expire_soft_ttl(redis_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    redis_client.local_cache.clear()
+    later = database.time.time() + 100_000
+    monkeypatch.setattr(database.time, "time", lambda: later)
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_serves_stale_and_revalidates(
+    redis_client, sample_stock, monkeypatch
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    _expire_soft_ttl(redis_client, monkeypatch)
+    refreshed = sample_stock.model_copy(update={"price": 200.0})
+    calls = 0
+
+    async def load() -> StockResponse:
+        nonlocal calls
+        calls += 1
+        await redis_client.set_cache("stock:AMD", refreshed, ttl=900)
+        return refreshed
+
+    result = await cached_fetch(redis_client, "stock:AMD", StockResponse, load)
+    await wait_background_refreshes()
+
+    assert result == sample_stock
+    assert calls == 1
+    assert (await redis_client.get_cache("stock:AMD", StockResponse)).price == 200.0
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_many_serves_stale_and_fetches_missing(
+    redis_client, sample_crypto, monkeypatch
+):
+    await redis_client.set_cache("coin:solana", sample_crypto, ttl=300)
+    _expire_soft_ttl(redis_client, monkeypatch)
+    loaded: list[list[str]] = []
+
+    async def load_many(keys: list[str]) -> dict[str, CryptoResponse]:
+        loaded.append(keys)
+        return {key: sample_crypto for key in keys}
+
+    result = await cached_fetch_many(
+        redis_client, ["coin:solana", "coin:bitcoin"], CryptoResponse, load_many
+    )
+    await wait_background_refreshes()
+
+    assert set(result) == {"coin:solana", "coin:bitcoin"}
+    assert sorted(loaded) == [["coin:bitcoin"], ["coin:solana"]]
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_cached_and_replayed(redis_client):
+    calls = 0
+
+    async def load() -> StockResponse:
+        nonlocal calls
+        calls += 1
+        raise AssetNotFoundError("Stock FAKE not found")
+
+    metrics.reset()
+    for _ in range(3):
+        with pytest.raises(AssetNotFoundError, match="Stock FAKE not found"):
+            await cached_fetch(redis_client, "stock:FAKE", StockResponse, load)
+        redis_client.local_cache.clear()
+
+    assert calls == 1
+    assert f"{NOT_FOUND_KEY_PREFIX}stock:FAKE" in redis_client._client.store
+    assert metrics.get("cache_not_found_hits", prefix="stock") == 2
+
+
+@pytest.mark.asyncio
+async def test_many_not_found_keys_are_skipped(redis_client, sample_crypto):
+    loaded: list[list[str]] = []
+
+    async def load_many(keys: list[str]) -> dict[str, CryptoResponse]:
+        loaded.append(keys)
+        return {key: sample_crypto for key in keys if key == "coin:solana"}
+
+    metrics.reset()
+    first = await cached_fetch_many(
+        redis_client, ["coin:solana", "coin:typo"], CryptoResponse, load_many
+    )
+    second = await cached_fetch_many(
+        redis_client, ["coin:solana", "coin:typo"], CryptoResponse, load_many
+    )
+
+    assert list(first) == list(second) == ["coin:solana"]
+    assert loaded == [["coin:solana", "coin:typo"], ["coin:solana"]]
+    assert metrics.get("cache_not_found_hits", prefix="coin") == 1
@@ -0,0 +1,97 @@
+import pytest
+from pydantic import create_model
+
+from app.database import RedisClient
+from app.schemas import StockResponse
+from app.utils.cache_schema import (
+    LEGACY_VERSION,
+    SCHEMA_REGISTRY_PREFIX,
+    schema_version,
+    versioned_key,
+)
+
+# Same model name as the deployed one, with a field added in a later release.
+StockResponseNext = create_model(
+    "StockResponse", __base__=StockResponse, exchange=(str | None, None)
+)
+
+
+@pytest.fixture
+def versioned_client(fake_redis_backend) -> RedisClient:
+    client = RedisClient(schema_versioning=True, write_behind=False)
+    client._client = fake_redis_backend
+    return client
+
+
+def test_schema_version_changes_with_fields():
+    assert schema_version(StockResponse) == schema_version(StockResponse)
+    assert schema_version(StockResponse) != schema_version(StockResponseNext)
+    assert versioned_key("stock:AMD", LEGACY_VERSION) == "stock:AMD"
+
+
+@pytest.mark.asyncio
+async def test_keys_are_namespaced_and_registered(
+    versioned_client, fake_redis_backend, sample_stock
+):
+    await versioned_client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    version = schema_version(StockResponse)
+    assert f"stock:AMD@{version}" in fake_redis_backend.store
+    assert "stock:AMD" not in fake_redis_backend.store
+    registry = fake_redis_backend.store[f"{SCHEMA_REGISTRY_PREFIX}StockResponse"]
+    assert set(registry) == {LEGACY_VERSION, version}
+
+
+@pytest.mark.asyncio
+async def test_reads_unversioned_keys_during_rollout(
+    versioned_client, redis_client, sample_stock
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    entry = await versioned_client.get_entry("stock:AMD", StockResponse)
+
+    assert entry.value == sample_stock
+    assert entry.stale is False
+
+
+@pytest.mark.asyncio
+async def test_old_and_new_schema_workers_do_not_thrash(
+    fake_redis_backend, sample_stock
+):
+    old_worker = RedisClient(schema_versioning=True, write_behind=False)
+    new_worker = RedisClient(schema_versioning=True, write_behind=False)
+    old_worker._client = new_worker._client = fake_redis_backend
+
+    await old_worker.set_cache("stock:AMD", sample_stock, ttl=900)
+    dual_read = await new_worker.get_many(["stock:AMD"], StockResponseNext)
+    await new_worker.set_cache(
+        "stock:AMD", StockResponseNext(**sample_stock.model_dump(), exchange="NASDAQ"), ttl=900
+    )
+    old_worker.local_cache.clear()
+    new_worker.local_cache.clear()
+
+    assert dual_read["stock:AMD"].name == "AMD"
+    assert await old_worker.get_cache("stock:AMD", StockResponse) == sample_stock
+    assert (await new_worker.get_cache("stock:AMD", StockResponseNext)).exchange == "NASDAQ"
+
+
+@pytest.mark.asyncio
+async def test_incompatible_peer_entry_is_a_miss(versioned_client, fake_redis_backend):
+    fake_redis_backend.store["stock:AMD"] = '{"name": "AMD"}'
+
+    assert await versioned_client.get_cache("stock:AMD", StockResponse) is None
+
+
+@pytest.mark.asyncio
+async def test_registry_is_not_queried_on_every_read(
+    versioned_client, fake_redis_backend, sample_stock
+):
+    await versioned_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    versioned_client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    await versioned_client.get_cache("stock:AMD", StockResponse)
+    await versioned_client.get_cache("stock:MISSING", StockResponse)
+
+    # one GET each, plus one GET of the unversioned peer key for the miss
+    assert fake_redis_backend.round_trips == 3
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from app.database import RedisClient
+from app.schemas import StockHistoryResponse, StockResponse
+from app.tasks.cache_snapshot import dump_snapshot, restore_snapshot
+from tests.conftest import FakeRedisBackend
+
+
+def _fresh_client():
+    client = RedisClient(schema_versioning=False, write_behind=False)
+    client._client = FakeRedisBackend()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip_restores_redis_and_local_cache(
+    redis_client, sample_stock: StockResponse, sample_stock_history, tmp_path
+):
+    path = str(tmp_path / "snapshot.json")
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    await redis_client.set_cache("stock:history:AMD", sample_stock_history, ttl=86400)
+    await redis_client.acquire_lease("stock:NVDA", 10_000)
+
+    await dump_snapshot(redis_client, path)
+    restarted = _fresh_client()
+    restored = await restore_snapshot(restarted, path)
+
+    assert restored > 0
+    assert "lease:stock:NVDA" not in restarted.client.store
+    assert restarted.client.store["stock:AMD"] == redis_client.client.store["stock:AMD"]
+    assert restarted.local_cache.get("stock:AMD", StockResponse) == sample_stock
+    restarted.local_cache.clear()
+    assert await restarted.get_cache("stock:AMD", StockResponse) == sample_stock
+    assert (
+        await restarted.get_cache("stock:history:AMD", StockHistoryResponse)
+        == sample_stock_history
+    )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_keeps_recently_read_cache_keys(redis_client, sample_stock, tmp_path):
+    path = tmp_path / "snapshot.json"
+    backend = redis_client.client
+    for ticker, idle in (("AMD", 500), ("NVDA", 5), ("INTC", 50)):
+        await redis_client.set_cache(f"stock:{ticker}", sample_stock, ttl=900)
+        backend.idle[f"stock:{ticker}"] = idle
+    backend.store["missing:stock:FAKE"] = "1"
+    backend.store["schema:stock"] = "{}"
+    backend.store["other:key"] = "value"
+
+    await dump_snapshot(redis_client, str(path), max_keys=2)
+
+    snapshot = json.loads(path.read_text())
+    assert [entry["key"] for entry in snapshot["redis"]] == ["stock:NVDA", "stock:INTC"]
+    assert [item.name for item in tmp_path.iterdir()] == ["snapshot.json"]
+
+
+@pytest.mark.asyncio
+async def test_restore_keeps_newer_redis_values(redis_client, sample_stock, tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    await dump_snapshot(redis_client, path)
+
+    restarted = _fresh_client()
+    newer = sample_stock.model_copy(update={"price": 200.0})
+    await restarted.set_cache("stock:AMD", newer, ttl=900)
+    restarted.local_cache.clear()
+    await restore_snapshot(restarted, path)
+    restarted.local_cache.clear()
+
+    assert (await restarted.get_cache("stock:AMD", StockResponse)).price == 200.0
+
+
+@pytest.mark.asyncio
+async def test_restore_skips_expired_entries(redis_client, sample_stock, tmp_path):
+    path = tmp_path / "snapshot.json"
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    await dump_snapshot(redis_client, str(path))
+    snapshot = json.loads(path.read_text())
+    snapshot["created_at"] -= 86400
+    path.write_text(json.dumps(snapshot))
+
+    restarted = _fresh_client()
+
+    assert await restore_snapshot(restarted, str(path)) == 0
+    assert restarted.client.store == {}
+
+
+@pytest.mark.asyncio
+async def test_restore_without_snapshot_file(redis_client, tmp_path):
+    assert await restore_snapshot(redis_client, str(tmp_path / "missing.json")) == 0
@@ -0,0 +1,78 @@
+import pytest
+
+from app.main import app
+from app.schemas import CryptoResponse, StockResponse
+from app.services import get_cache_stats
+from app.utils import ExternalServiceError
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_grouped_by_prefix(
+    redis_client, sample_stock: StockResponse, sample_crypto: CryptoResponse
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    await redis_client.set_many(
+        {"coin:bitcoin": sample_crypto, "coin:solana": sample_crypto}, ttl=20
+    )
+    await redis_client.set_not_found("stock:FAKE", "Ticker FAKE not found")
+    redis_client.client.store["lease:stock:AMD"] = b"token"
+
+    stats = await get_cache_stats(redis_client, sample_size=100)
+
+    assert stats.total_keys == stats.sampled_keys == 5
+    assert set(stats.prefixes) == {"coin", "lease", "missing", "stock"}
+    assert stats.prefixes["coin"].sampled_keys == 2
+    assert stats.prefixes["coin"].ttl == {"<1m": 2}
+    assert stats.prefixes["stock"].ttl == {"<1h": 1}
+    assert stats.prefixes["lease"].ttl == {"persistent": 1}
+    assert stats.prefixes["stock"].memory_bytes > 0
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_scales_sample_to_key_count(redis_client, sample_crypto: CryptoResponse):
+    await redis_client.set_many(
+        {f"coin:{index}": sample_crypto for index in range(10)}, ttl=900
+    )
+
+    stats = await get_cache_stats(redis_client, sample_size=5)
+
+    assert stats.sampled_keys == 5
+    assert stats.prefixes["coin"].estimated_keys == 10
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_need_redis():
+    with pytest.raises(ExternalServiceError):
+        await get_cache_stats(None, sample_size=10)
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint_hidden_without_admin_key(client, monkeypatch):
+    monkeypatch.setattr("app.routers.dependencies.ADMIN_API_KEY", None)
+
+    response = await client.get("/admin/cache/stats")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint_rejects_wrong_key(client, monkeypatch):
+    monkeypatch.setattr("app.routers.dependencies.ADMIN_API_KEY", "secret")
+
+    response = await client.get("/admin/cache/stats", headers={"X-Admin-Key": "guess"})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint(client, redis_client, sample_stock, monkeypatch):
+    monkeypatch.setattr("app.routers.dependencies.ADMIN_API_KEY", "secret")
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    app.state.redis_client = redis_client
+
+    response = await client.get(
+        "/admin/cache/stats", params={"sample": 10}, headers={"X-Admin-Key": "secret"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["prefixes"]["stock"]["sampled_keys"] == 1
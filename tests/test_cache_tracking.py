@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+import app.database as database
+from app.database import RedisClient
+from app.schemas import StockHistoryResponse, StockResponse
+from app.utils.cache_tracking import INVALIDATION_CHANNEL, ClientTracking
+
+
+class FakeConnection:
+    def __init__(self, responses: list) -> None:
+        self.responses = responses
+        self.commands: list[tuple] = []
+        self.health_check_interval = 30
+
+    async def send_command(self, *args: object) -> None:
+        self.commands.append(args)
+
+    async def read_response(self, timeout: float | None = None):
+        if not self.responses:
+            raise ConnectionError("Connection closed by server.")
+        return self.responses.pop(0)
+
+    async def disconnect(self) -> None:
+        return None
+
+
+class FakePool:
+    def __init__(self, connections: list[FakeConnection]) -> None:
+        self.connections = connections
+        self.released: list[FakeConnection] = []
+
+    async def get_connection(self) -> FakeConnection:
+        return self.connections.pop(0)
+
+    async def release(self, connection: FakeConnection) -> None:
+        self.released.append(connection)
+
+
+def _message(keys):
+    return [b"message", INVALIDATION_CHANNEL.encode(), keys]
+
+
+@pytest.mark.asyncio
+async def test_listen_redirects_broadcast_tracking_and_forwards_keys():
+    invalidated = []
+    tracking = ClientTracking(["stock:", "coin:"], invalidated.append, 30, 5)
+    listener = FakeConnection(
+        [7, [b"subscribe", INVALIDATION_CHANNEL.encode(), 1], _message([b"stock:AMD"])]
+    )
+    tracker = FakeConnection([b"OK"])
+    pool = FakePool([listener, tracker])
+
+    with pytest.raises(ConnectionError):
+        await tracking._listen(pool)
+
+    assert tracker.commands == [
+        ("CLIENT", "TRACKING", "ON", "REDIRECT", 7, "BCAST", "PREFIX", "stock:", "PREFIX", "coin:")
+    ]
+    assert invalidated == [["stock:AMD"]]
+    assert pool.released == [listener, tracker]
+
+
+@pytest.mark.asyncio
+async def test_lost_tracking_drops_everything():
+    invalidated = []
+    tracking = ClientTracking(["stock:"], invalidated.append, 30, 0)
+    pool = FakePool([FakeConnection([1, [b"subscribe", b"x", 1]]), FakeConnection([b"OK"])])
+    client = type("Client", (), {"connection_pool": pool})()
+
+    task = asyncio.create_task(tracking.run(client))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert tracking.active is False
+    assert invalidated == [None]
+
+
+def _tracked_client(fake_redis_backend):
+    client = RedisClient(schema_versioning=True, write_behind=False, client_tracking=True)
+    client._client = fake_redis_backend
+    client.tracking._active = True
+    return client
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_versioned_key_from_local_cache(
+    fake_redis_backend, sample_stock: StockResponse
+):
+    client = _tracked_client(fake_redis_backend)
+    await client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_key = next(key for key in fake_redis_backend.store if key.startswith("stock:AMD@"))
+
+    client.tracking.handle(_message([redis_key.encode()]))
+
+    assert client.local_cache.get("stock:AMD", StockResponse) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_of_history_points_drops_windows(
+    fake_redis_backend, sample_stock_history: StockHistoryResponse
+):
+    client = _tracked_client(fake_redis_backend)
+    client.local_cache.set("stock:history:AMD", sample_stock_history, 100, 3600)
+    client.local_cache.set("stock:history:AMD:14d", sample_stock_history, 100, 3600)
+    client.local_cache.set("stock:history:AMDX", sample_stock_history, 100, 3600)
+
+    client.tracking.handle(_message([b"stock:history:AMD@0123abcd:points"]))
+
+    assert len(client.local_cache) == 1
+    assert client.local_cache.get("stock:history:AMDX", StockHistoryResponse) is not None
+
+
+@pytest.mark.asyncio
+async def test_tracked_entries_outlive_local_ttl(fake_redis_backend, sample_stock, monkeypatch):
+    client = _tracked_client(fake_redis_backend)
+    await client.set_cache("stock:AMD", sample_stock, ttl=900)
+    later = database.time.monotonic() + client.local_cache.ttl_for("stock:AMD") + 1
+    monkeypatch.setattr(database.time, "monotonic", lambda: later)
+
+    assert client.local_cache.get("stock:AMD", StockResponse) == sample_stock
+
+
+@pytest.mark.asyncio
+async def test_flush_notification_clears_local_cache(fake_redis_backend, sample_stock):
+    client = _tracked_client(fake_redis_backend)
+    await client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    client.tracking.handle(_message(None))
+
+    assert len(client.local_cache) == 0
@@ -0,0 +1,35 @@
+import pytest
+
+from app.schemas import CryptoResponse
+from app.tasks.crypto_cache import _refresh_crypto_cache_once
+from tests.conftest import FakeAiohttpResponse
+
+
+@pytest.mark.asyncio
+async def test_refresh_writes_all_coins_in_one_round_trip(redis_client, fake_http_session):
+    session = fake_http_session(
+        FakeAiohttpResponse(
+            {
+                "bitcoin": {"usd": 75000.0},
+                "ethereum": {"usd": 2000.0},
+                "broken": {"usd": None},
+            }
+        )
+    )
+
+    await _refresh_crypto_cache_once(redis_client, session)
+
+    assert redis_client._client.round_trips == 1
+    assert set(redis_client._client.store) == {"coin:bitcoin", "coin:ethereum"}
+    cached = await redis_client.get_cache("coin:bitcoin", CryptoResponse)
+    assert cached.symbol == "BTC"
+    assert cached.price == 75000.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_skipped_without_redis(fake_http_session):
+    session = fake_http_session(
+        FakeAiohttpResponse({}, raise_for_status=AssertionError("HTTP must not be called"))
+    )
+
+    await _refresh_crypto_cache_once(None, session)
@@ -3,10 +3,11 @@ from datetime import datetime, timedelta
 import pytest
 from fastapi import HTTPException
 
-from app.config import CRYPTO_HISTORY_PERIOD
+from app.config import CRYPTO_HISTORY_PERIOD, HISTORY_INCREMENTAL_OVERLAP_DAYS
 from app.schemas.history_responses import CryptoHistoryResponse, HistoryPoint
-from app.services.crypto_history import get_crypto_history
+from app.services.crypto_history import _load_history, get_crypto_history
 from app.utils import AssetNotFoundError
+from app.utils.crypto_parser import resolve_crypto_coin
 from tests.conftest import FakeAiohttpGetCtx, FakeAiohttpResponse
 
 
@@ -124,3 +125,41 @@ async def test_crypto_history_http_error(fake_http_session):
         await get_crypto_history("solana", 30, None, session)
 
     assert exc_info.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_crypto_history_refresh_fetches_only_missing_days(redis_client):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    cached = CryptoHistoryResponse(
+        name="solana",
+        symbol="SOL",
+        full_name="Solana",
+        points=[
+            HistoryPoint(timestamp=today - timedelta(days=offset), price=float(offset))
+            for offset in (CRYPTO_HISTORY_PERIOD + 5, 100, 2)
+        ],
+        cached_at=datetime(2026, 5, 22, 12, 0, 0),
+    )
+    await redis_client.set_cache("coin:history:solana", cached, ttl=600)
+
+    today_ms = int(today.timestamp() * 1000)
+    payload = {
+        "prices": [[today_ms - 86_400_000, 11.0], [today_ms, 22.0]],
+        "total_volumes": [[today_ms - 86_400_000, 1.0], [today_ms, 2.0]],
+    }
+    captured: dict[str, str] = {}
+
+    class CapturingSession:
+        def get(self, url: str, **_kwargs: object) -> FakeAiohttpGetCtx:
+            captured["url"] = url
+            return FakeAiohttpGetCtx(FakeAiohttpResponse(payload))
+
+    result = await _load_history(
+        resolve_crypto_coin("solana"), "coin:history:solana", redis_client, CapturingSession()
+    )
+
+    missing_days = (
+        datetime.now() - cached.points[-1].timestamp
+    ).days + HISTORY_INCREMENTAL_OVERLAP_DAYS
+    assert f"days={missing_days}&interval=daily" in captured["url"]
+    assert [point.price for point in result.points] == [100.0, 2.0, 11.0, 22.0]
@@ -1,10 +1,12 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 
 from app.schemas import CryptoResponse
 from app.services.crypto_price import get_crypto_prices
 from app.utils import AssetNotFoundError
-from tests.conftest import FakeAiohttpResponse, sample_crypto
+from tests.conftest import FakeAiohttpGetCtx, FakeAiohttpResponse, sample_crypto
 
 
 @pytest.mark.asyncio
@@ -121,3 +123,44 @@ async def test_crypto_http_error(fake_http_session):
         await get_crypto_prices("solana", None, session)
 
     assert exc_info.value.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_crypto_batch_uses_single_cache_round_trips(
+    redis_client, sample_crypto, fake_http_session
+):
+    session = fake_http_session(
+        FakeAiohttpResponse({"bitcoin": {"usd": 75000.0}, "ethereum": {"usd": 2000.0}})
+    )
+    await redis_client.set_cache("coin:solana", sample_crypto, ttl=300)
+    redis_client._client.round_trips = 0
+
+    result = await get_crypto_prices("solana,bitcoin,ethereum", redis_client, session)
+
+    assert [coin.name for coin in result.coins] == ["solana", "bitcoin", "ethereum"]
+    # cache read, not-found read, fetch lease acquire, cache write, fetch lease release
+    assert redis_client._client.round_trips == 5
+    assert "coin:bitcoin" in redis_client._client.store
+    assert "coin:ethereum" in redis_client._client.store
+
+
+@pytest.mark.asyncio
+async def test_crypto_concurrent_misses_fetch_once(redis_client):
+
+    urls: list[str] = []
+
+    class CountingSession:
+        def get(self, url: str, **_kwargs: object) -> FakeAiohttpGetCtx:
+            urls.append(url)
+            return FakeAiohttpGetCtx(
+                FakeAiohttpResponse({"bitcoin": {"usd": 1.0}, "ethereum": {"usd": 2.0}})
+            )
+
+    session = CountingSession()
+    results = await asyncio.gather(
+        get_crypto_prices("bitcoin,ethereum", redis_client, session),
+        get_crypto_prices("ethereum", redis_client, session),
+    )
+
+    assert len(urls) == 1
+    assert results[1].coins[0].price == 2.0
@@ -1,10 +1,25 @@
 import json
+from datetime import datetime, timedelta
 
 import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
 
+import app.database as database
+from app.config import REDIS_STALE_FACTOR, REDIS_TTL_JITTER
+from app.database import POINT_MEMORY_BYTES, LocalCache, RedisClient
 from app.types.enums.enums import AssetType
-from app.schemas import CryptoResponse, StockResponse, SteamResponse
-from tests.conftest import FIXED_TIME
+from app.schemas import (
+    CryptoResponse,
+    HistoryPoint,
+    StockHistoryResponse,
+    StockResponse,
+    SteamResponse,
+)
+from app.utils.cache_codec import EntryCodec, MsgpackCodec, msgpack
+from app.utils.history_points import filter_points_by_days
+from app.utils.metrics import metrics
+from app.utils.redis_replicas import ReplicaRouter
+from tests.conftest import FIXED_TIME, FakeRedisBackend
 
 
 @pytest.mark.asyncio
@@ -63,9 +78,800 @@ async def test_test_connection_success(redis_client):
 
 @pytest.mark.asyncio
 async def test_test_connection_ping_false(monkeypatch):
-    from app.database import RedisClient
-
     backend = type("B", (), {"ping": lambda self: False})()
     client = RedisClient()
     client._client = backend  # type: ignore[assignment]
     assert await client.test_connection() is False
+
+
+@pytest.mark.asyncio
+async def test_get_many_returns_typed_hits(redis_client, sample_stock: StockResponse):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client._client.store["stock:BAD"] = json.dumps({"name": "broken"})
+    redis_client._client.round_trips = 0
+
+    cached = await redis_client.get_many(
+        ["stock:AMD", "stock:MISSING", "stock:BAD"], StockResponse
+    )
+
+    assert list(cached) == ["stock:AMD"]
+    assert isinstance(cached["stock:AMD"], StockResponse)
+    assert redis_client._client.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_empty_keys(redis_client):
+    assert await redis_client.get_many([], StockResponse) == {}
+    assert redis_client._client.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_set_many_single_round_trip(redis_client, sample_stock: StockResponse):
+    other = sample_stock.model_copy(update={"name": "NVDA"})
+
+    await redis_client.set_many({"stock:AMD": sample_stock, "stock:NVDA": other}, ttl=900)
+
+    assert redis_client._client.round_trips == 1
+    assert set(redis_client._client.ttls) == {"stock:AMD", "stock:NVDA"}
+    assert (await redis_client.get_cache("stock:NVDA", StockResponse)).name == "NVDA"
+
+
+@pytest.mark.asyncio
+async def test_set_many_rejects_non_positive_ttl(redis_client, sample_stock: StockResponse):
+    await redis_client.set_many({"stock:AMD": sample_stock}, ttl=0)
+
+    assert redis_client._client.store == {}
+
+
+def _local_cache(**overrides) -> "LocalCache":
+    options = {
+        "max_entries": 10,
+        "max_memory": 10_000,
+        "prefix_ttls": {"stock": 30, "coin": 30, "steam": 60},
+        "history_ttl": 300,
+    }
+    options.update(overrides)
+    return LocalCache(**options)
+
+
+def test_local_cache_ttl_by_prefix():
+    cache = _local_cache()
+
+    assert cache.ttl_for("stock:AMD") == 30
+    assert cache.ttl_for("steam:730:Case") == 60
+    assert cache.ttl_for("coin:history:bitcoin") == 300
+    assert cache.ttl_for("stock:history:AMD") == 300
+    assert cache.ttl_for("other:key") == 0
+
+
+def test_local_cache_evicts_least_recently_used(sample_stock: StockResponse):
+    cache = _local_cache(max_entries=2)
+    cache.set("stock:A", sample_stock, 10, ttl=900)
+    cache.set("stock:B", sample_stock, 10, ttl=900)
+    assert cache.get("stock:A", StockResponse) is not None
+
+    cache.set("stock:C", sample_stock, 10, ttl=900)
+
+    assert cache.get("stock:B", StockResponse) is None
+    assert cache.get("stock:A", StockResponse) is not None
+    assert cache.get("stock:C", StockResponse) is not None
+
+
+def test_local_cache_respects_memory_budget(sample_stock: StockResponse):
+    cache = _local_cache(max_memory=100)
+    cache.set("stock:A", sample_stock, 60, ttl=900)
+    cache.set("stock:B", sample_stock, 60, ttl=900)
+    cache.set("stock:HUGE", sample_stock, 500, ttl=900)
+
+    assert len(cache) == 1
+    assert cache.size == 60
+    assert cache.get("stock:B", StockResponse) is not None
+
+
+@pytest.mark.asyncio
+async def test_local_cache_charged_with_model_memory(redis_client):
+    history = _daily_history(1000)
+    await redis_client.set_cache("stock:history:AMD", history, ttl=3600)
+
+    charged = redis_client.local_cache.size
+    assert charged >= 1000 * POINT_MEMORY_BYTES
+    assert charged > 10 * len(history.model_dump_json())
+
+
+def test_local_cache_never_outlives_redis_ttl(monkeypatch, sample_stock: StockResponse):
+    now = 1000.0
+    monkeypatch.setattr(database.time, "monotonic", lambda: now)
+    cache = _local_cache()
+    cache.set("stock:AMD", sample_stock, 10, ttl=5)
+
+    now = 1004.0
+    assert cache.get("stock:AMD", StockResponse) is not None
+    now = 1006.0
+    assert cache.get("stock:AMD", StockResponse) is None
+
+
+def test_local_cache_checks_model_type(sample_stock: StockResponse):
+    cache = _local_cache()
+    cache.set("stock:AMD", sample_stock, 10, ttl=900)
+
+    assert cache.get("stock:AMD", CryptoResponse) is None
+
+
+@pytest.mark.asyncio
+async def test_get_cache_served_from_local_cache(redis_client, sample_stock: StockResponse):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client._client.round_trips = 0
+
+    cached = await redis_client.get_cache("stock:AMD", StockResponse)
+
+    assert cached == sample_stock
+    assert redis_client._client.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_get_cache_populates_local_cache(redis_client, sample_stock: StockResponse):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+
+    await redis_client.get_cache("stock:AMD", StockResponse)
+    redis_client._client.round_trips = 0
+    cached = await redis_client.get_cache("stock:AMD", StockResponse)
+
+    assert cached == sample_stock
+    assert redis_client._client.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_set_cache_keeps_stale_copy_past_soft_ttl(
+    redis_client, sample_stock: StockResponse, monkeypatch
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    hard = redis_client._client.ttls["stock:AMD"]
+    assert 900 * (1 - REDIS_TTL_JITTER) * REDIS_STALE_FACTOR <= hard
+    assert hard <= 900 * (1 + REDIS_TTL_JITTER) * REDIS_STALE_FACTOR + 1
+
+
+@pytest.mark.asyncio
+async def test_get_entry_marks_stale_after_soft_expiry(
+    redis_client, sample_stock: StockResponse, monkeypatch
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+
+    fresh = await redis_client.get_entry("stock:AMD", StockResponse)
+    later = database.time.time() + 2000
+    monkeypatch.setattr(database.time, "time", lambda: later)
+    redis_client.local_cache.clear()
+    stale = await redis_client.get_entry("stock:AMD", StockResponse)
+
+    assert fresh.stale is False
+    assert stale.stale is True
+    assert stale.value == sample_stock
+    assert len(redis_client.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_entry_reads_legacy_payload_as_fresh(redis_client, sample_stock: StockResponse):
+    redis_client._client.store["stock:AMD"] = sample_stock.model_dump_json()
+
+    entry = await redis_client.get_entry("stock:AMD", StockResponse)
+
+    assert entry.value == sample_stock
+    assert entry.stale is False
+
+
+@pytest.mark.asyncio
+async def test_get_many_json_returns_stored_bytes(redis_client, sample_stock: StockResponse):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+
+    cached = await redis_client.get_many_json(["stock:AMD", "stock:MISSING"], StockResponse)
+
+    assert cached == {"stock:AMD": sample_stock.model_dump_json().encode()}
+
+
+@pytest.mark.asyncio
+async def test_get_many_json_skips_stale_entries(
+    redis_client, sample_stock: StockResponse, monkeypatch
+):
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+    later = database.time.time() + 2000
+    monkeypatch.setattr(database.time, "time", lambda: later)
+
+    assert await redis_client.get_many_json(["stock:AMD"], StockResponse) == {}
+
+
+@pytest.mark.asyncio
+async def test_get_many_json_skips_non_json_codec(redis_client, sample_stock: StockResponse):
+    if msgpack is None:
+        pytest.skip("msgpack is not installed")
+    redis_client._codec = EntryCodec(MsgpackCodec())
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+
+    assert await redis_client.get_many_json(["stock:AMD"], StockResponse) == {}
+
+
+@pytest.mark.asyncio
+async def test_set_many_jitters_expiry(redis_client, sample_crypto: CryptoResponse):
+    await redis_client.set_many(
+        {f"coin:{index}": sample_crypto for index in range(20)}, ttl=900
+    )
+
+    assert len(set(redis_client._client.ttls.values())) > 1
+
+
+def _daily_history(days: int) -> StockHistoryResponse:
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    return StockHistoryResponse(
+        name="AMD",
+        full_name="Advanced Micro Devices, Inc.",
+        interval="1d",
+        points=[
+            HistoryPoint(
+                timestamp=today - timedelta(days=offset),
+                price=100.0 + offset,
+                volume=None if offset % 2 else 1000.0,
+            )
+            for offset in reversed(range(days))
+        ],
+        cached_at=FIXED_TIME,
+    )
+
+
+@pytest.fixture
+def zset_redis_client(fake_redis_backend):
+    client = RedisClient(
+        history_storage="zset", schema_versioning=False, history_slices=[], write_behind=False
+    )
+    client._client = fake_redis_backend
+    return client
+
+
+@pytest.mark.asyncio
+async def test_zset_history_stores_points_and_meta(zset_redis_client, fake_redis_backend):
+    history = _daily_history(30)
+    await zset_redis_client.set_cache("stock:history:AMD", history, ttl=86400)
+
+    assert "stock:history:AMD" not in fake_redis_backend.store
+    assert len(fake_redis_backend.store["stock:history:AMD:points"]) == 30
+    assert fake_redis_backend.store["stock:history:AMD:meta"]["points"] == 30
+    assert (
+        fake_redis_backend.ttls["stock:history:AMD:points"]
+        == fake_redis_backend.ttls["stock:history:AMD:meta"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_zset_history_reads_only_requested_window(zset_redis_client, fake_redis_backend):
+    history = _daily_history(30)
+    await zset_redis_client.set_cache("stock:history:AMD", history, ttl=86400)
+    zset_redis_client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    week = await zset_redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+    full = await zset_redis_client.get_entry("stock:history:AMD", StockHistoryResponse)
+
+    assert fake_redis_backend.round_trips == 2
+    assert week.stale is False
+    assert week.value.full_name == history.full_name
+    assert week.value.points == filter_points_by_days(history.points, 7)
+    assert full.value == history
+
+
+@pytest.mark.asyncio
+async def test_zset_history_window_served_from_local_cache(
+    zset_redis_client, fake_redis_backend
+):
+    await zset_redis_client.set_cache("stock:history:AMD", _daily_history(30), ttl=86400)
+    await zset_redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+    fake_redis_backend.round_trips = 0
+
+    week = await zset_redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+
+    assert fake_redis_backend.round_trips == 0
+    assert len(week.value.points) == 7
+
+
+@pytest.mark.asyncio
+async def test_zset_history_miss(zset_redis_client):
+    assert (
+        await zset_redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_zset_history_rewrite_is_transactional(fake_redis_backend, monkeypatch):
+    client = RedisClient(
+        history_storage="zset", schema_versioning=False, history_slices=[], write_behind=False
+    )
+    client._client = fake_redis_backend
+    transactions = []
+    pipeline = fake_redis_backend.pipeline
+
+    def recording_pipeline(transaction: bool = True):
+        transactions.append(transaction)
+        return pipeline(transaction)
+
+    monkeypatch.setattr(fake_redis_backend, "pipeline", recording_pipeline)
+
+    await client.set_cache("stock:history:AMD", _daily_history(30), ttl=3600)
+
+    assert transactions == [True]
+
+
+@pytest.mark.asyncio
+async def test_zset_history_untrusted_decode_validates_points(
+    zset_redis_client, fake_redis_backend
+):
+    history = _daily_history(30)
+    await zset_redis_client.set_cache("stock:history:AMD", history, ttl=3600)
+    client = RedisClient(
+        history_storage="zset", schema_versioning=False, trusted_decode=False, write_behind=False
+    )
+    client._client = fake_redis_backend
+
+    entry = await client.get_history_entry("stock:history:AMD", StockHistoryResponse)
+
+    assert entry.value == history
+
+
+@pytest.mark.asyncio
+async def test_trusted_history_decode_matches_validated(fake_redis_backend):
+    """Points read from Redis without validation equal the validated ones."""
+    history = _daily_history(1_000)
+    entries = {}
+    for trusted in (False, True):
+        client = RedisClient(
+            history_storage="zset",
+            schema_versioning=False,
+            trusted_decode=trusted,
+            write_behind=False,
+        )
+        client._client = fake_redis_backend
+        await client.set_cache("stock:history:AMD", history, ttl=3600)
+        client.local_cache.clear()
+        entries[trusted] = await client.get_history_entry(
+            "stock:history:AMD", StockHistoryResponse
+        )
+
+    trusted_value = entries[True].value
+    assert trusted_value == entries[False].value == history
+    for point, original in zip(trusted_value.points, history.points):
+        assert type(point.timestamp) is datetime
+        assert point.timestamp == original.timestamp
+        assert point.timestamp.tzinfo is None
+        assert point.volume == original.volume
+    assert trusted_value.model_dump_json() == history.model_dump_json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec_name", ["json", "msgpack"])
+async def test_trusted_blob_history_decode_matches_validated(fake_redis_backend, codec_name):
+    if codec_name == "msgpack" and msgpack is None:
+        pytest.skip("msgpack is not installed")
+    history = _daily_history(1_000)
+    entries = {}
+    for trusted in (False, True):
+        client = RedisClient(
+            schema_versioning=False,
+            history_slices=[],
+            trusted_decode=trusted,
+            write_behind=False,
+        )
+        client._client = fake_redis_backend
+        client._codec = EntryCodec(MsgpackCodec() if codec_name == "msgpack" else None)
+        await client.set_cache("stock:history:AMD", history, ttl=3600)
+        client.local_cache.clear()
+        entries[trusted] = await client.get_entry("stock:history:AMD", StockHistoryResponse)
+
+    trusted_value = entries[True].value
+    assert isinstance(fake_redis_backend.store["stock:history:AMD"], bytes)
+    assert trusted_value == entries[False].value == history
+    assert entries[True].stale is False
+    assert all(type(point.timestamp) is datetime for point in trusted_value.points)
+    assert trusted_value.model_dump_json() == history.model_dump_json()
+
+
+@pytest.mark.asyncio
+async def test_blob_history_entry_returns_every_point(fake_redis_backend):
+    client = RedisClient(schema_versioning=False, history_slices=[], write_behind=False)
+    client._client = fake_redis_backend
+    history = _daily_history(30)
+    await client.set_cache("stock:history:AMD", history, ttl=86400)
+    client.local_cache.clear()
+
+    entry = await client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+
+    assert entry.value == history
+
+
+@pytest.mark.asyncio
+async def test_history_slices_written_with_full_entry(redis_client, fake_redis_backend):
+    history = _daily_history(400)
+    await redis_client.set_cache("stock:history:AMD", history, ttl=86400)
+
+    assert set(fake_redis_backend.store) == {
+        "stock:history:AMD",
+        "stock:history:AMD:7d",
+        "stock:history:AMD:30d",
+        "stock:history:AMD:90d",
+        "stock:history:AMD:365d",
+    }
+    assert fake_redis_backend.ttls["stock:history:AMD:7d"] == fake_redis_backend.ttls["stock:history:AMD"]
+
+
+@pytest.mark.asyncio
+async def test_history_entry_read_from_covering_slice(redis_client, fake_redis_backend):
+    history = _daily_history(400)
+    await redis_client.set_cache("stock:history:AMD", history, ttl=86400)
+    redis_client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    entry = await redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 20)
+
+    assert entry.value.points == filter_points_by_days(history.points, 30)
+    assert fake_redis_backend.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_history_slices_regenerated_on_write(redis_client):
+    await redis_client.set_cache("stock:history:AMD", _daily_history(10), ttl=86400)
+    newer = _daily_history(10).model_copy(update={"full_name": "AMD Inc."})
+    await redis_client.set_cache("stock:history:AMD", newer, ttl=86400)
+    redis_client.local_cache.clear()
+
+    entry = await redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+
+    assert entry.value.full_name == "AMD Inc."
+
+
+@pytest.mark.asyncio
+async def test_zset_history_slices_written_with_points(fake_redis_backend):
+    client = RedisClient(
+        history_storage="zset", schema_versioning=False, history_slices=[7], write_behind=False
+    )
+    client._client = fake_redis_backend
+    history = _daily_history(60)
+    await client.set_cache("stock:history:AMD", history, ttl=86400)
+    client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    entry = await client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+
+    assert fake_redis_backend.round_trips == 1
+    assert fake_redis_backend.ttls["stock:history:AMD:7d"] == fake_redis_backend.ttls["stock:history:AMD:points"]
+    assert entry.value.points == history.points[-7:]
+
+
+@pytest.mark.asyncio
+async def test_reads_counted_per_prefix(redis_client, sample_stock: StockResponse, monkeypatch):
+    metrics.reset()
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    redis_client.local_cache.clear()
+
+    await redis_client.get_entry("stock:AMD", StockResponse)
+    await redis_client.get_many_entries(["stock:AMD", "stock:NVDA"], StockResponse)
+    await redis_client.get_history_entry("stock:history:AMD", StockHistoryResponse, 7)
+    later = database.time.time() + 2000
+    monkeypatch.setattr(database.time, "time", lambda: later)
+    redis_client.local_cache.clear()
+    await redis_client.get_entry("stock:AMD", StockResponse)
+
+    assert metrics.get("cache_hits", prefix="stock") == 3
+    assert metrics.get("cache_stale_hits", prefix="stock") == 1
+    assert metrics.get("cache_misses", prefix="stock") == 1
+    assert metrics.get("cache_misses", prefix="stock:history") == 1
+    assert metrics.get("cache_decode_seconds_count", prefix="stock") == 2
+    assert metrics.get("cache_value_bytes_bucket", prefix="stock", le="+Inf") == 2
+
+
+@pytest.mark.asyncio
+async def test_read_errors_counted_per_prefix(redis_client):
+    class BrokenBackend(FakeRedisBackend):
+        async def get(self, key: str) -> str | None:
+            raise RuntimeError("boom")
+
+    metrics.reset()
+    redis_client._client = BrokenBackend()
+
+    assert await redis_client.get_entry("coin:bitcoin", CryptoResponse) is None
+    assert metrics.get("cache_errors", prefix="coin") == 1
+
+
+@pytest.fixture
+def hash_redis_client(fake_redis_backend):
+    client = RedisClient(
+        spot_storage="hash", schema_versioning=False, history_slices=[], write_behind=False
+    )
+    client._client = fake_redis_backend
+    return client
+
+
+@pytest.mark.asyncio
+async def test_hash_spot_prices_share_one_hash(
+    hash_redis_client, fake_redis_backend, sample_crypto: CryptoResponse
+):
+    await hash_redis_client.set_many(
+        {"coin:bitcoin": sample_crypto, "coin:solana": sample_crypto}, ttl=900
+    )
+    await hash_redis_client.set_cache("stock:history:AMD", _daily_history(3), ttl=900)
+
+    assert set(fake_redis_backend.store) == {"coin:prices", "stock:history:AMD"}
+    assert set(fake_redis_backend.store["coin:prices"]) == {"bitcoin", "solana"}
+    assert fake_redis_backend.ttls["coin:prices"] > 900
+
+
+@pytest.mark.asyncio
+async def test_hash_spot_prices_read_with_one_hmget(
+    hash_redis_client, fake_redis_backend, sample_crypto: CryptoResponse
+):
+    await hash_redis_client.set_many(
+        {"coin:bitcoin": sample_crypto, "coin:solana": sample_crypto}, ttl=900
+    )
+    hash_redis_client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    cached = await hash_redis_client.get_many(
+        ["coin:bitcoin", "coin:solana", "coin:missing"], CryptoResponse
+    )
+
+    assert fake_redis_backend.round_trips == 1
+    assert cached == {"coin:bitcoin": sample_crypto, "coin:solana": sample_crypto}
+
+
+@pytest.mark.asyncio
+async def test_hash_spot_values_leave_out_defaults(
+    hash_redis_client, fake_redis_backend, sample_crypto: CryptoResponse
+):
+    await hash_redis_client.set_cache("coin:bitcoin", sample_crypto, ttl=900)
+    hash_redis_client.local_cache.clear()
+
+    stored = fake_redis_backend.store["coin:prices"]["bitcoin"]
+
+    assert b"asset_type" not in stored
+    assert b"currency" not in stored
+    assert await hash_redis_client.get_cache("coin:bitcoin", CryptoResponse) == sample_crypto
+    assert await hash_redis_client.get_many_json(["coin:bitcoin"], CryptoResponse) == {
+        "coin:bitcoin": sample_crypto.model_dump_json().encode()
+    }
+
+
+@pytest.mark.asyncio
+async def test_hash_spot_field_goes_stale_then_expires(
+    hash_redis_client, fake_redis_backend, sample_stock: StockResponse, monkeypatch
+):
+    await hash_redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    now = database.time.time()
+
+    hash_redis_client.local_cache.clear()
+    monkeypatch.setattr(database.time, "time", lambda: now + 1000)
+    stale = await hash_redis_client.get_entry("stock:AMD", StockResponse)
+
+    monkeypatch.setattr(database.time, "time", lambda: now + 5000)
+    await hash_redis_client.set_cache("stock:NVDA", sample_stock, ttl=900)
+    hash_redis_client.local_cache.clear()
+    expired = await hash_redis_client.get_many(
+        ["stock:AMD", "stock:NVDA"], StockResponse
+    )
+
+    assert stale.stale is True
+    assert stale.value == sample_stock
+    assert list(expired) == ["stock:NVDA"]
+    assert list(fake_redis_backend.store["stock:prices"]) == ["NVDA"]
+
+
+@pytest.fixture
+def write_behind_redis_client(fake_redis_backend):
+    client = RedisClient(schema_versioning=False, write_behind=True)
+    client._client = fake_redis_backend
+    return client
+
+
+@pytest.mark.asyncio
+async def test_write_behind_set_cache_returns_before_redis_write(
+    write_behind_redis_client, fake_redis_backend, sample_stock: StockResponse
+):
+    await write_behind_redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    assert fake_redis_backend.store == {}
+    assert await write_behind_redis_client.get_cache("stock:AMD", StockResponse) == sample_stock
+
+    await write_behind_redis_client.flush_writes()
+
+    assert "stock:AMD" in fake_redis_backend.store
+    assert len(write_behind_redis_client.write_behind) == 0
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_writes_into_one_pipeline(
+    write_behind_redis_client, fake_redis_backend, sample_crypto: CryptoResponse
+):
+    await write_behind_redis_client.set_many({"coin:solana": sample_crypto}, ttl=900)
+    await write_behind_redis_client.set_cache("coin:bitcoin", sample_crypto, ttl=900)
+    await write_behind_redis_client.set_not_found("coin:fake", "Coin fake not found")
+
+    await write_behind_redis_client.flush_writes()
+
+    assert fake_redis_backend.round_trips == 1
+    assert {"coin:solana", "coin:bitcoin", "missing:coin:fake"} <= set(fake_redis_backend.store)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_releases_lease_after_value(
+    write_behind_redis_client, fake_redis_backend, sample_stock: StockResponse
+):
+    token = await write_behind_redis_client.acquire_lease("stock:AMD", 10_000)
+    await write_behind_redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    await write_behind_redis_client.release_lease("stock:AMD", token)
+
+    assert await write_behind_redis_client.lease_held("stock:AMD") is True
+
+    await write_behind_redis_client.close()
+
+    assert await write_behind_redis_client.lease_held("stock:AMD") is False
+    assert "stock:AMD" in fake_redis_backend.store
+
+
+@pytest.mark.asyncio
+async def test_connection_error_switches_to_memory_fallback(
+    redis_client, fake_redis_backend, sample_stock: StockResponse, monkeypatch
+):
+    async def refuse(*_args: object, **_kwargs: object) -> None:
+        raise RedisConnectionError("Connection refused")
+
+    monkeypatch.setattr(fake_redis_backend, "get", refuse)
+    monkeypatch.setattr(fake_redis_backend, "ping", refuse)
+
+    assert await redis_client.get_cache("stock:AMD", StockResponse) is None
+    assert redis_client.available is False
+
+    fake_redis_backend.round_trips = 0
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    cached = await redis_client.get_cache("stock:AMD", StockResponse)
+
+    assert cached == sample_stock
+    assert fake_redis_backend.round_trips == 0
+    assert "stock:AMD" not in fake_redis_backend.store
+    assert await redis_client.acquire_lease("stock:AMD", 1000) == ""
+    assert await redis_client.test_connection() is False
+
+
+@pytest.mark.asyncio
+async def test_test_connection_leaves_memory_fallback(
+    redis_client, fake_redis_backend, sample_stock: StockResponse, monkeypatch
+):
+    async def refuse() -> bool:
+        return False
+
+    monkeypatch.setattr(fake_redis_backend, "ping", refuse)
+    await redis_client.test_connection()
+    await redis_client.set_many({"stock:AMD": sample_stock}, ttl=900)
+    assert len(redis_client.fallback_cache) == 1
+
+    monkeypatch.undo()
+    assert await redis_client.test_connection() is True
+    assert redis_client.available is True
+    assert len(redis_client.fallback_cache) == 0
+
+    redis_client.local_cache.clear()
+    assert await redis_client.get_cache("stock:AMD", StockResponse) is None
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    assert "stock:AMD" in fake_redis_backend.store
+
+
+def test_build_redis_uses_unix_socket(monkeypatch):
+    monkeypatch.setattr(database, "REDIS_SOCKET_PATH", "/run/redis/redis.sock")
+    monkeypatch.setattr(database, "REDIS_MAX_CONNECTIONS", 7)
+
+    pool = database.build_redis().connection_pool
+
+    assert pool.connection_kwargs["path"] == "/run/redis/redis.sock"
+    assert pool.max_connections == 7
+
+
+def test_build_redis_for_replica_endpoint():
+    pool = database.build_redis("replica-1:6380").connection_pool
+
+    assert pool.connection_kwargs["host"] == "replica-1"
+    assert pool.connection_kwargs["port"] == 6380
+
+
+class FakeReplica(FakeRedisBackend):
+    def __init__(self, link_status: str = "up", last_io: int = 1) -> None:
+        super().__init__()
+        self.replication = {
+            "master_link_status": link_status,
+            "master_last_io_seconds_ago": last_io,
+        }
+
+    async def info(self, _section: str) -> dict:
+        return self.replication
+
+
+class BrokenReplica(FakeReplica):
+    async def get(self, key: str) -> str | None:
+        raise ConnectionError("replica is gone")
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        raise ConnectionError("replica is gone")
+
+
+def _replicated(redis_client, replicas):
+    redis_client._replicas = ReplicaRouter(replicas, max_lag=10)
+    return redis_client
+
+
+def _copy_store(source: FakeRedisBackend, *targets: FakeRedisBackend) -> None:
+    for target in targets:
+        target.store.update(source.store)
+
+
+@pytest.mark.asyncio
+async def test_reads_go_round_robin_to_replicas(
+    redis_client, fake_redis_backend, sample_stock: StockResponse
+):
+    replicas = [FakeReplica(), FakeReplica()]
+    _replicated(redis_client, replicas)
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    _copy_store(fake_redis_backend, *replicas)
+    fake_redis_backend.round_trips = 0
+
+    for _ in range(4):
+        redis_client.local_cache.clear()
+        assert await redis_client.get_cache("stock:AMD", StockResponse) == sample_stock
+
+    assert [replica.round_trips for replica in replicas] == [2, 2]
+    assert fake_redis_backend.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_replica_miss_falls_back_to_primary(
+    redis_client, fake_redis_backend, sample_crypto: CryptoResponse
+):
+    replica = FakeReplica()
+    _replicated(redis_client, [replica])
+    await redis_client.set_many(
+        {"coin:solana": sample_crypto, "coin:bitcoin": sample_crypto}, ttl=900
+    )
+    replica.store["coin:solana"] = fake_redis_backend.store["coin:solana"]
+    redis_client.local_cache.clear()
+    fake_redis_backend.round_trips = 0
+
+    cached = await redis_client.get_many(["coin:solana", "coin:bitcoin"], CryptoResponse)
+
+    assert set(cached) == {"coin:solana", "coin:bitcoin"}
+    assert fake_redis_backend.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_leaves_rotation(
+    redis_client, fake_redis_backend, sample_stock: StockResponse
+):
+    broken, healthy = BrokenReplica(), FakeReplica()
+    _replicated(redis_client, [broken, healthy])
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+    _copy_store(fake_redis_backend, healthy)
+
+    for _ in range(3):
+        redis_client.local_cache.clear()
+        assert await redis_client.get_cache("stock:AMD", StockResponse) == sample_stock
+
+    assert redis_client.replicas.healthy == 1
+    assert redis_client.available is True
+
+
+@pytest.mark.asyncio
+async def test_health_check_rotates_lagging_replicas(redis_client):
+    lagging, detached = FakeReplica(last_io=60), FakeReplica(link_status="down")
+    _replicated(redis_client, [lagging, detached, FakeReplica()])
+
+    await redis_client.test_connection()
+    assert redis_client.replicas.healthy == 1
+
+    lagging.replication["master_last_io_seconds_ago"] = 0
+    await redis_client.test_connection()
+    assert redis_client.replicas.healthy == 2
@@ -1,7 +1,12 @@
 from datetime import datetime
 
 from app.schemas.history_responses import HistoryPoint
-from app.utils.history_points import collapse_to_daily, filter_points_by_days
+from app.utils.history_points import (
+    collapse_to_daily,
+    construct_point,
+    filter_points_by_days,
+    merge_points,
+)
 
 
 def test_collapse_to_daily_keeps_last_price_per_day():
@@ -31,3 +36,28 @@ def test_filter_points_by_days():
 
     assert len(filtered) == 1
     assert filtered[0].price == 2.0
+
+
+def test_merge_points_replaces_overlapping_tail():
+    points = [
+        HistoryPoint(timestamp=datetime(2026, 5, day), price=float(day)) for day in range(1, 6)
+    ]
+    newer = [
+        HistoryPoint(timestamp=datetime(2026, 5, 4), price=40.0),
+        HistoryPoint(timestamp=datetime(2026, 5, 6), price=60.0),
+    ]
+
+    merged = merge_points(points, newer)
+
+    assert [point.price for point in merged] == [1.0, 2.0, 3.0, 40.0, 60.0]
+    assert merge_points(points, []) == points
+
+
+def test_construct_point_matches_validated_point():
+    validated = HistoryPoint(timestamp=datetime(2026, 5, 1), price=10.5, volume=None)
+
+    constructed = construct_point(datetime(2026, 5, 1), 10.5, None)
+
+    assert constructed == validated
+    assert constructed.model_dump_json() == validated.model_dump_json()
+    assert constructed.model_fields_set == validated.model_fields_set
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.utils.micro_batch import MicroBatcher
+
+
+def _recording_loader(batches: list[list[str]], missing: set[str] = frozenset()):
+    async def load_many(keys: list[str]) -> dict[str, str]:
+        batches.append(keys)
+        return {key: key.lower() for key in keys if key not in missing}
+
+    return load_many
+
+
+@pytest.mark.asyncio
+async def test_keys_within_window_share_one_load():
+    batches: list[list[str]] = []
+    batcher = MicroBatcher("test", _recording_loader(batches, {"FAKE"}), window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        batcher.load("AMD"), batcher.load("NVDA"), batcher.load("AMD"), batcher.load("FAKE")
+    )
+
+    assert batches == [["AMD", "NVDA", "FAKE"]]
+    assert results == ["amd", "nvda", "amd", None]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_sent_before_window_ends():
+    batches: list[list[str]] = []
+    batcher = MicroBatcher("test", _recording_loader(batches), window=60, max_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.load("AMD"), batcher.load("NVDA")), timeout=1
+    )
+
+    assert batches == [["AMD", "NVDA"]]
+    assert results == ["amd", "nvda"]
+
+
+@pytest.mark.asyncio
+async def test_batch_error_reaches_every_caller():
+    async def load_many(_keys: list[str]) -> dict[str, str]:
+        raise RuntimeError("yahoo down")
+
+    batcher = MicroBatcher("test", load_many, window=0.01, max_size=10)
+
+    results = await asyncio.gather(
+        batcher.load("AMD"), batcher.load("NVDA"), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["yahoo down", "yahoo down"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_others_waiting():
+    batches: list[list[str]] = []
+    batcher = MicroBatcher("test", _recording_loader(batches), window=0.01, max_size=10)
+
+    cancelled = asyncio.create_task(batcher.load("AMD"))
+    waiting = asyncio.create_task(batcher.load("AMD"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting == "amd"
+    assert len(batcher) == 0
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.utils import AssetNotFoundError
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_do_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(flight.do("stock:AMD", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_do_shares_exception():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        await release.wait()
+        raise ValueError("upstream down")
+
+    waiters = [asyncio.create_task(flight.do("stock:AMD", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_do_runs_again_after_completion():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", fetch) == 1
+    assert await flight.do("key", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_abort_fetch():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_do_many_joins_in_flight_keys():
+    flight = SingleFlight()
+    batches: list[list[str]] = []
+    release = asyncio.Event()
+
+    async def fetch(keys: list[str]) -> dict[str, str]:
+        batches.append(keys)
+        await release.wait()
+        return {key: key.upper() for key in keys}
+
+    first = asyncio.create_task(flight.do_many(["coin:a", "coin:b"], fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(flight.do_many(["coin:b", "coin:c"], fetch))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == {"coin:a": "COIN:A", "coin:b": "COIN:B"}
+    assert await second == {"coin:b": "COIN:B", "coin:c": "COIN:C"}
+    assert batches == [["coin:a", "coin:b"], ["coin:c"]]
+
+
+@pytest.mark.asyncio
+async def test_do_joining_key_left_out_of_batch_is_not_found():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch(keys: list[str]) -> dict[str, str]:
+        await release.wait()
+        return {"coin:a": "A"}
+
+    batch = asyncio.create_task(flight.do_many(["coin:a", "coin:b"], fetch))
+    await asyncio.sleep(0)
+    single = asyncio.create_task(flight.do("coin:b", lambda: pytest.fail("must join")))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await batch == {"coin:a": "A"}
+    with pytest.raises(AssetNotFoundError, match="coin:b"):
+        await single
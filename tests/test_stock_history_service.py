@@ -1,11 +1,26 @@
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
 import pandas as pd
 import pytest
 from fastapi import HTTPException
 
-from app.schemas.history_responses import StockHistoryResponse
-from app.services.stock_history import get_stock_history
+from app.config import (
+    HISTORY_INCREMENTAL_OVERLAP_DAYS,
+    STOCK_HISTORY_PERIOD,
+    STOCK_HISTORY_REBUILD_DAYS,
+)
+from app.database import RedisClient
+from app.schemas.history_responses import (
+    CachedStockHistory,
+    HistoryPoint,
+    StockHistoryResponse,
+)
+from app.services.stock_history import (
+    _dataframe_to_points,
+    _load_history,
+    get_stock_history,
+)
 from app.utils import AssetNotFoundError
 from tests.conftest import FIXED_TIME, sample_stock_history
 
@@ -26,14 +41,38 @@ async def test_stock_history_success(mock_yfinance_history):
 
     result = await get_stock_history("amd", 90, None)
 
-    assert isinstance(result, StockHistoryResponse)
+    assert type(result) is StockHistoryResponse
+    assert "rebuilt_at" not in result.model_dump()
     assert result.name == "AMD"
-    assert result.full_name == "Advanced Micro Devices, Inc."
+    assert result.full_name == "Advanced Micro Devices Inc. Common Stock"
     assert result.interval == "1d"
     assert len(result.points) == 1
     assert result.points[0].price == 105.5
 
 
+@pytest.mark.asyncio
+async def test_stock_history_without_company_name(monkeypatch):
+    def failing_info(_self: object) -> None:
+        raise ConnectionError("Connection reset by peer")
+
+    def ticker_factory(_symbol: str) -> MagicMock:
+        ticker = MagicMock()
+        type(ticker).info = property(failing_info)
+        ticker.history.return_value = pd.DataFrame(
+            {"Close": [12.5], "Volume": [10.0]},
+            index=[pd.Timestamp(datetime.now().date())],
+        )
+        return ticker
+
+    # History and metadata share the yfinance module.
+    monkeypatch.setattr("app.services.stock_history.yf.Ticker", ticker_factory)
+
+    result = await get_stock_history("zzzq", 90, None)
+
+    assert result.full_name is None
+    assert [point.price for point in result.points] == [12.5]
+
+
 @pytest.mark.asyncio
 async def test_stock_history_not_found_empty(mock_yfinance_history):
     mock_yfinance_history(pd.DataFrame())
@@ -74,3 +113,179 @@ async def test_stock_history_unexpected_error(monkeypatch):
         await get_stock_history("AMD", 30, None)
 
     assert exc_info.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_stock_history_sorted_set_storage_slices_in_redis(
+    fake_redis_backend, mock_yfinance_history
+):
+    redis_client = RedisClient(
+        history_storage="zset", schema_versioning=False, write_behind=False
+    )
+    redis_client._client = fake_redis_backend
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    closes = [100.0 + offset for offset in range(60)]
+    df = pd.DataFrame(
+        {"Close": closes, "Volume": [1000.0] * 60},
+        index=[pd.Timestamp(today - timedelta(days=59 - offset)) for offset in range(60)],
+    )
+    mock_yfinance_history(df, {"shortName": "Advanced Micro Devices, Inc."})
+
+    first = await get_stock_history("AMD", 30, redis_client)
+
+    def fail_if_yfinance_called() -> None:
+        pytest.fail("yfinance must not be called on cache hit")
+
+    mock_yfinance_history(pd.DataFrame(), on_call=fail_if_yfinance_called)
+    redis_client.local_cache.clear()
+    week = await get_stock_history("AMD", 7, redis_client)
+
+    assert len(fake_redis_backend.store["stock:history:AMD:points"]) == 60
+    assert len(first.points) == 30
+    assert [point.price for point in week.points] == closes[-7:]
+    assert week.full_name == "Advanced Micro Devices Inc. Common Stock"
+
+
+@pytest.mark.asyncio
+async def test_stock_history_refresh_fetches_only_missing_days(
+    redis_client, monkeypatch
+):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    cached = CachedStockHistory(
+        name="AMD",
+        full_name="Advanced Micro Devices, Inc.",
+        interval="1d",
+        points=[
+            HistoryPoint(timestamp=today - timedelta(days=offset), price=float(offset))
+            for offset in (400, 10, 5)
+        ],
+        cached_at=FIXED_TIME,
+        rebuilt_at=datetime.now(),
+    )
+    await redis_client.set_cache("stock:history:AMD", cached, ttl=3600)
+
+    ticker = MagicMock()
+    ticker.history.return_value = pd.DataFrame(
+        {"Close": [55.0, 44.0], "Volume": [10.0, 20.0]},
+        index=[pd.Timestamp(today - timedelta(days=5)), pd.Timestamp(today)],
+    )
+    monkeypatch.setattr("app.services.stock_history.yf.Ticker", lambda _symbol: ticker)
+
+    result = await _load_history("AMD", "stock:history:AMD", redis_client)
+
+    start = (today - timedelta(days=5 + HISTORY_INCREMENTAL_OVERLAP_DAYS)).date()
+    ticker.history.assert_called_once_with(start=start.isoformat(), interval="1d")
+    assert [point.price for point in result.points] == [400.0, 10.0, 55.0, 44.0]
+    assert result.full_name == cached.full_name
+    assert result.rebuilt_at == cached.rebuilt_at
+    stored = await redis_client.get_cache("stock:history:AMD", CachedStockHistory)
+    assert stored.points == result.points
+
+
+def _cached_amd_history(today: datetime, rebuilt_at: datetime) -> CachedStockHistory:
+    return CachedStockHistory(
+        name="AMD",
+        full_name="Advanced Micro Devices, Inc.",
+        interval="1d",
+        points=[
+            HistoryPoint(timestamp=today - timedelta(days=offset), price=float(offset))
+            for offset in (400, 3, 2, 1)
+        ],
+        cached_at=FIXED_TIME,
+        rebuilt_at=rebuilt_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stock_history_refresh_reloads_when_overlap_changed(
+    redis_client, monkeypatch
+):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    await redis_client.set_cache(
+        "stock:history:AMD", _cached_amd_history(today, datetime.now()), ttl=3600
+    )
+
+    ticker = MagicMock()
+    # A split rescaled the adjusted closes of the overlapping days.
+    tail = pd.DataFrame(
+        {"Close": [1.5, 1.0, 0.5], "Volume": [10.0, 20.0, 30.0]},
+        index=[pd.Timestamp(today - timedelta(days=offset)) for offset in (3, 2, 1)],
+    )
+    full = pd.DataFrame(
+        {"Close": [200.0, 1.5, 1.0, 0.5], "Volume": [1.0, 10.0, 20.0, 30.0]},
+        index=[pd.Timestamp(today - timedelta(days=offset)) for offset in (400, 3, 2, 1)],
+    )
+    ticker.history.side_effect = lambda **kwargs: full if "period" in kwargs else tail
+    monkeypatch.setattr("app.services.stock_history.yf.Ticker", lambda _symbol: ticker)
+
+    result = await _load_history("AMD", "stock:history:AMD", redis_client)
+
+    assert ticker.history.call_count == 2
+    assert ticker.history.call_args.kwargs["period"] == STOCK_HISTORY_PERIOD
+    assert [point.price for point in result.points] == [200.0, 1.5, 1.0, 0.5]
+    assert result.rebuilt_at == result.cached_at
+
+
+@pytest.mark.asyncio
+async def test_stock_history_refresh_reloads_old_series(redis_client, monkeypatch):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    rebuilt_at = datetime.now() - timedelta(days=STOCK_HISTORY_REBUILD_DAYS + 1)
+    await redis_client.set_cache(
+        "stock:history:AMD", _cached_amd_history(today, rebuilt_at), ttl=3600
+    )
+
+    ticker = MagicMock()
+    ticker.history.return_value = pd.DataFrame(
+        {"Close": [3.0, 2.0, 1.0]},
+        index=[pd.Timestamp(today - timedelta(days=offset)) for offset in (3, 2, 1)],
+    )
+    monkeypatch.setattr("app.services.stock_history.yf.Ticker", lambda _symbol: ticker)
+
+    result = await _load_history("AMD", "stock:history:AMD", redis_client)
+
+    ticker.history.assert_called_once_with(period=STOCK_HISTORY_PERIOD, interval="1d")
+    assert [point.price for point in result.points] == [3.0, 2.0, 1.0]
+    assert result.rebuilt_at > rebuilt_at
+
+
+@pytest.fixture
+def large_history_frame() -> pd.DataFrame:
+    """15k daily rows like a ``period=max`` download, with gaps and a timezone."""
+    rows = 15_000
+    index = pd.date_range("1965-01-04", periods=rows, freq="D", tz="America/New_York")
+    closes = [100.0 + offset * 0.123456 for offset in range(rows)]
+    volumes = [float(offset * 1000) for offset in range(rows)]
+    for offset in range(0, rows, 97):
+        closes[offset] = float("nan")
+    for offset in range(0, rows, 31):
+        volumes[offset] = float("nan")
+    return pd.DataFrame({"Close": closes, "Volume": volumes}, index=index)
+
+
+def _iterrows_points(df: pd.DataFrame) -> list[HistoryPoint]:
+    points = []
+    for index, row in df.iterrows():
+        if pd.isna(row["Close"]):
+            continue
+        points.append(
+            HistoryPoint(
+                timestamp=index.to_pydatetime().replace(tzinfo=None),
+                price=round(float(row["Close"]), 4),
+                volume=None if pd.isna(row["Volume"]) else round(float(row["Volume"]), 4),
+            )
+        )
+    return points
+
+
+def test_dataframe_to_points_matches_row_conversion(large_history_frame):
+    """Column-wise conversion against the per-row ``iterrows`` walk it replaced."""
+    points = _dataframe_to_points(large_history_frame)
+
+    assert points == _iterrows_points(large_history_frame)
+    assert len(points) == len(large_history_frame) - len(range(0, 15_000, 97))
+    # The exchange-local wall time is kept and the timezone dropped.
+    assert points[0].timestamp == datetime(1965, 1, 5)
+    assert all(point.timestamp.tzinfo is None for point in points)
+    assert points[30].timestamp == datetime(1965, 2, 4)
+    assert points[30].volume is None
+    assert points[31].volume == 32_000.0
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, PropertyMock
+
+import pytest
+
+from app.config import REDIS_STOCK_META_INTERVAL
+from app.schemas import StockMetadata
+from app.services.stock_metadata import get_stock_metadata
+from app.services.stock_price import get_stock_price
+
+
+@pytest.mark.asyncio
+async def test_known_tickers_named_without_yfinance(redis_client, fake_redis_backend, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.stock_metadata.yf.Ticker",
+        lambda _symbol: pytest.fail("yfinance must not be called for known tickers"),
+    )
+
+    metadata = await get_stock_metadata(["AMD", "NVDA"], redis_client)
+
+    assert metadata["NVDA"] == StockMetadata(name="NVDA", full_name="NVIDIA Corporation Common Stock")
+    assert fake_redis_backend.ttls["stock:meta:AMD"] > REDIS_STOCK_META_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_unknown_ticker_named_from_info_once(redis_client, monkeypatch):
+    calls = 0
+
+    def ticker_factory(_symbol: str) -> MagicMock:
+        nonlocal calls
+        calls += 1
+        ticker = MagicMock()
+        ticker.info = {"symbol": "ZZZQ", "shortName": "Zed Holdings"}
+        return ticker
+
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", ticker_factory)
+
+    first = await get_stock_metadata(["ZZZQ"], redis_client)
+    redis_client.local_cache.clear()
+    second = await get_stock_metadata(["ZZZQ"], redis_client)
+
+    assert calls == 1
+    assert first == second == {"ZZZQ": StockMetadata(name="ZZZQ", full_name="Zed Holdings")}
+
+
+@pytest.mark.asyncio
+async def test_unknown_ticker_without_info_is_left_out(redis_client, monkeypatch):
+    ticker = MagicMock()
+    ticker.info = None
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", lambda _symbol: ticker)
+
+    assert await get_stock_metadata(["TYPO"], redis_client) == {}
+    assert await redis_client.get_not_found("stock:meta:TYPO") is not None
+
+
+@pytest.mark.asyncio
+async def test_price_miss_does_not_read_info(redis_client, monkeypatch):
+    ticker = MagicMock()
+    type(ticker).info = PropertyMock(side_effect=AssertionError("Ticker.info must not be read"))
+    ticker.fast_info = MagicMock(last_price=150.256)
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", lambda _symbol: ticker)
+
+    result = await get_stock_price("AMD", redis_client)
+
+    assert result.price == 150.26
+    assert result.full_name == "Advanced Micro Devices Inc. Common Stock"
@@ -1,9 +1,14 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pandas as pd
 import pytest
 from fastapi import HTTPException
 
 from app.schemas import StockResponse
-from app.services.stock_price import get_stock_price
-from app.utils import AssetNotFoundError
+from app.services.stock_metadata import get_stock_metadata
+from app.services.stock_price import get_stock_price, get_stock_prices
+from app.utils import AssetNotFoundError, ExecutorSaturatedError, ExternalServiceError
 from tests.conftest import sample_stock
 
 
@@ -30,11 +35,42 @@ async def test_stock_not_found_no_symbol(mock_yfinance_ticker):
 
 
 @pytest.mark.asyncio
-async def test_stock_not_found_missing_price(mock_yfinance_ticker):
+async def test_stock_without_provider_price_is_not_found(redis_client, mock_yfinance_ticker):
     mock_yfinance_ticker({"symbol": "AMD", "shortName": "AMD"}, None)
 
     with pytest.raises(AssetNotFoundError, match="Stock AMD not found"):
-        await get_stock_price("AMD", None)
+        await get_stock_price("AMD", redis_client)
+
+    assert await redis_client.get_not_found("stock:AMD") is not None
+
+
+def _connection_reset(_self: object) -> None:
+    raise ConnectionError("Connection reset by peer")
+
+
+def _ticker_with_failing_price(_symbol: str) -> MagicMock:
+    ticker = MagicMock()
+    type(ticker.fast_info).last_price = property(_connection_reset)
+    return ticker
+
+
+@pytest.mark.asyncio
+async def test_stock_failed_price_request_is_provider_error(redis_client, monkeypatch):
+    def download(tickers, **_kwargs):
+        return _download_frame({"AMD": [None, None], "NVDA": [120.0, 121.0]})
+
+    monkeypatch.setattr("app.services.stock_price.yf.download", download)
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", _ticker_with_failing_price)
+
+    results = await asyncio.gather(
+        get_stock_price("AMD", redis_client),
+        get_stock_price("NVDA", redis_client),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], ExternalServiceError)
+    assert results[1].price == 121.0
+    assert await redis_client.get_not_found("stock:AMD") is None
 
 
 @pytest.mark.asyncio
@@ -61,3 +97,236 @@ async def test_stock_unexpected_error(monkeypatch):
         await get_stock_price("AMD", None)
 
     assert exc_info.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_stock_concurrent_misses_fetch_once(redis_client, monkeypatch):
+    calls = 0
+
+    def ticker_factory(_symbol: str) -> MagicMock:
+        nonlocal calls
+        calls += 1
+        ticker = MagicMock()
+        ticker.info = {"symbol": "AMD", "shortName": "Advanced Micro Devices, Inc."}
+        ticker.fast_info = MagicMock(last_price=150.0)
+        return ticker
+
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", ticker_factory)
+
+    results = await asyncio.gather(
+        *(get_stock_price("AMD", redis_client) for _ in range(5))
+    )
+
+    assert calls == 1
+    assert all(result.price == 150.0 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stock_not_found_is_negative_cached(redis_client, monkeypatch):
+    calls = 0
+
+    def ticker_factory(_symbol: str) -> MagicMock:
+        nonlocal calls
+        calls += 1
+        ticker = MagicMock()
+        ticker.info = None
+        return ticker
+
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", ticker_factory)
+
+    for _ in range(2):
+        with pytest.raises(AssetNotFoundError, match="Stock TYPO not found"):
+            await get_stock_price("typo", redis_client)
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stock_saturated_executor_returns_503(monkeypatch):
+    async def saturated(*_args):
+        raise ExecutorSaturatedError("Too many pending yfinance calls, try again later")
+
+    monkeypatch.setattr("app.services.stock_price.yfinance_executor.run", saturated)
+
+    with pytest.raises(ExecutorSaturatedError) as exc_info:
+        await get_stock_price("AMD", None)
+
+    assert exc_info.value.status_code == 503
+
+
+def _ticker_without_info(_symbol: str):
+    ticker = MagicMock()
+    ticker.info = None
+    return ticker
+
+
+def _download_frame(closes: dict[str, list[float | None]]):
+    index = pd.date_range("2026-05-18", periods=2, freq="D")
+    return pd.concat(
+        {
+            ticker: pd.DataFrame({"Close": values, "Volume": [1.0] * len(values)}, index=index)
+            for ticker, values in closes.items()
+        },
+        axis=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_fetches_misses_in_one_download(redis_client, sample_stock, monkeypatch):
+    downloads: list[list[str]] = []
+
+    def download(tickers, **_kwargs):
+        downloads.append(list(tickers))
+        return _download_frame({"NVDA": [120.0, 121.456], "MSFT": [410.0, None]})
+
+    monkeypatch.setattr("app.services.stock_price.yf.download", download)
+    await redis_client.set_cache("stock:AMD", sample_stock, ttl=900)
+
+    result = await get_stock_prices("nvda, AMD,msft,nvda", redis_client)
+
+    assert downloads == [["NVDA", "MSFT"]]
+    assert [stock.name for stock in result.stocks] == ["NVDA", "AMD", "MSFT"]
+    assert result.stocks[0].price == 121.46
+    assert result.stocks[0].full_name == "NVIDIA Corporation Common Stock"
+    assert result.stocks[2].price == 410.0
+    assert await redis_client.get_cache("stock:NVDA", StockResponse) == result.stocks[0]
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_unknown_ticker_is_not_found(redis_client, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.stock_price.yf.download",
+        lambda tickers, **_kwargs: _download_frame({"NVDA": [120.0, 121.0], "FAKE": [None, None]}),
+    )
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", _ticker_without_info)
+
+    with pytest.raises(AssetNotFoundError, match="Price not available for stocks: FAKE"):
+        await get_stock_prices("NVDA,FAKE", redis_client)
+
+    assert await redis_client.get_cache("stock:NVDA", StockResponse) is not None
+    assert await redis_client.get_not_found("stock:FAKE") is not None
+
+
+def _ticker_with_price(last_price: float | None):
+    def factory(_symbol: str) -> MagicMock:
+        return MagicMock(fast_info=MagicMock(last_price=last_price))
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_retries_empty_download_column(redis_client, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.stock_price.yf.download",
+        lambda tickers, **_kwargs: _download_frame({"NVDA": [120.0, 121.0], "MSFT": [None, None]}),
+    )
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", _ticker_with_price(412.5))
+
+    result = await get_stock_prices("NVDA,MSFT", redis_client)
+
+    assert [stock.price for stock in result.stocks] == [121.0, 412.5]
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_known_ticker_without_price_is_not_found(redis_client, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.stock_price.yf.download",
+        lambda tickers, **_kwargs: _download_frame({"NVDA": [120.0, 121.0], "MSFT": [None, None]}),
+    )
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", _ticker_with_price(None))
+
+    with pytest.raises(AssetNotFoundError, match="Price not available for stocks: MSFT"):
+        await get_stock_prices("NVDA,MSFT", redis_client)
+
+    assert await redis_client.get_cache("stock:NVDA", StockResponse) is not None
+    assert await redis_client.get_not_found("stock:MSFT") is not None
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_failed_price_request_is_provider_error(redis_client, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.stock_price.yf.download",
+        lambda tickers, **_kwargs: _download_frame({"NVDA": [120.0, 121.0], "MSFT": [None, None]}),
+    )
+    monkeypatch.setattr("app.services.stock_price.yf.Ticker", _ticker_with_failing_price)
+
+    with pytest.raises(ExternalServiceError, match="price request failed for stocks: MSFT"):
+        await get_stock_prices("NVDA,MSFT", redis_client)
+
+    assert await redis_client.get_cache("stock:NVDA", StockResponse) is not None
+    assert await redis_client.get_not_found("stock:MSFT") is None
+
+
+@pytest.mark.asyncio
+async def test_stock_batch_survives_failed_metadata_lookup(redis_client, monkeypatch):
+    def ticker_factory(symbol: str) -> MagicMock:
+        ticker = MagicMock()
+        if symbol == "ZZZQ":
+            type(ticker).info = property(_connection_reset)
+        else:
+            ticker.info = {"symbol": symbol, "shortName": "Yyyq Corp"}
+        return ticker
+
+    monkeypatch.setattr(
+        "app.services.stock_price.yf.download",
+        lambda tickers, **_kwargs: _download_frame({"YYYQ": [10.0, 11.0]}),
+    )
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", ticker_factory)
+
+    with pytest.raises(AssetNotFoundError, match="Price not available for stocks: ZZZQ"):
+        await get_stock_prices("ZZZQ,YYYQ", redis_client)
+
+    assert (await redis_client.get_cache("stock:YYYQ", StockResponse)).price == 11.0
+
+
+@pytest.mark.asyncio
+async def test_stock_concurrent_misses_for_different_tickers_share_one_download(
+    redis_client, monkeypatch
+):
+    downloads: list[list[str]] = []
+
+    def download(tickers, **_kwargs):
+        downloads.append(list(tickers))
+        return _download_frame({"NVDA": [120.0, 121.0], "MSFT": [410.0, 411.0], "FAKE": [None, None]})
+
+    monkeypatch.setattr("app.services.stock_price.yf.download", download)
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", _ticker_without_info)
+
+    results = await asyncio.gather(
+        get_stock_price("NVDA", redis_client),
+        get_stock_price("MSFT", redis_client),
+        get_stock_price("FAKE", redis_client),
+        return_exceptions=True,
+    )
+
+    assert downloads == [["NVDA", "MSFT"]]
+    assert results[0].price == 121.0
+    assert results[1].price == 411.0
+    assert isinstance(results[2], AssetNotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_stock_single_request_joining_batch_left_out_ticker_is_not_found(monkeypatch):
+    release = asyncio.Event()
+
+    def download(tickers, **_kwargs):
+        return _download_frame({"NVDA": [120.0, 121.0]})
+
+    async def slow_metadata(tickers, redis_client):
+        await release.wait()
+        return await get_stock_metadata(tickers, redis_client)
+
+    monkeypatch.setattr("app.services.stock_price.yf.download", download)
+    monkeypatch.setattr("app.services.stock_metadata.yf.Ticker", _ticker_without_info)
+    monkeypatch.setattr("app.services.stock_price.get_stock_metadata", slow_metadata)
+
+    batch = asyncio.create_task(get_stock_prices("ZZZQ,NVDA", None))
+    await asyncio.sleep(0)
+    single = asyncio.create_task(get_stock_price("ZZZQ", None))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(AssetNotFoundError, match="ZZZQ"):
+        await batch
+    with pytest.raises(AssetNotFoundError, match="ZZZQ"):
+        await single
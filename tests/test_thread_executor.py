@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils import ExecutorSaturatedError
+from app.utils.metrics import metrics
+from app.utils.thread_executor import BoundedExecutor
+
+
+@pytest.mark.asyncio
+async def test_runs_calls_off_the_event_loop():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=2)
+    loop_thread = threading.get_ident()
+
+    result = await executor.run(lambda value: (value, threading.get_ident()), 7)
+
+    assert result[0] == 7
+    assert result[1] != loop_thread
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_saturated_executor_fails_fast():
+    metrics.reset()
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ExecutorSaturatedError) as exc_info:
+        await executor.run(release.wait)
+
+    assert exc_info.value.status_code == 503
+    assert metrics.get("executor_rejected", executor="test") == 1
+
+    release.set()
+    await asyncio.gather(*running)
+    await asyncio.sleep(0)
+    assert len(executor) == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_records_wait_and_run_time():
+    metrics.reset()
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+
+    await executor.run(lambda: None)
+    await asyncio.sleep(0)
+
+    assert metrics.get("executor_wait_seconds_count", executor="test") == 1
+    assert metrics.get("executor_run_seconds_count", executor="test") == 1
+    assert metrics.get("executor_pending", executor="test") == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_free_the_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+
+    def fail() -> None:
+        raise RuntimeError("yahoo down")
+
+    with pytest.raises(RuntimeError, match="yahoo down"):
+        await executor.run(fail)
+    await asyncio.sleep(0)
+
+    assert await executor.run(lambda: "ok") == "ok"
+    executor.shutdown()
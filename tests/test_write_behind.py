@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.utils.metrics import metrics
+from app.utils.write_behind import WriteBehindQueue
+
+
+class RecordingPipe:
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+
+    def setex(self, key: str) -> None:
+        self.commands.append(key)
+
+
+def _write(key: str):
+    return lambda pipe: pipe.setex(key)
+
+
+@pytest.mark.asyncio
+async def test_writes_flushed_in_order_and_batched():
+    batches: list[list[str]] = []
+
+    async def flush(writes) -> None:
+        pipe = RecordingPipe()
+        for write in writes:
+            write(pipe)
+        batches.append(pipe.commands)
+
+    queue = WriteBehindQueue(flush, max_pending=10, batch_size=2)
+    for index in range(5):
+        assert queue.put(_write(f"stock:{index}"))
+    assert len(queue) == 5
+
+    await queue.flush()
+
+    assert batches == [["stock:0", "stock:1"], ["stock:2", "stock:3"], ["stock:4"]]
+    assert len(queue) == 0
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_writes():
+    metrics.reset()
+    release = asyncio.Event()
+
+    async def flush(_writes) -> None:
+        await release.wait()
+
+    queue = WriteBehindQueue(flush, max_pending=2, batch_size=10)
+    results = [queue.put(_write(f"stock:{index}")) for index in range(3)]
+
+    assert results == [True, True, False]
+    assert queue.dropped == 1
+    assert metrics.get("cache_write_behind_dropped", reason="full") == 1
+    assert metrics.get("cache_write_behind_depth") == 2
+
+    release.set()
+    await queue.close()
+    assert metrics.get("cache_write_behind_depth") == 0
+    assert metrics.get("cache_write_behind_flushed") == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_counts_dropped_writes():
+    metrics.reset()
+
+    async def flush(_writes) -> None:
+        raise ConnectionError("Redis is gone")
+
+    queue = WriteBehindQueue(flush, max_pending=10, batch_size=10)
+    queue.put(_write("stock:AMD"))
+    queue.put(_write("stock:NVDA"))
+    await queue.flush()
+
+    assert queue.dropped == 2
+    assert metrics.get("cache_write_behind_dropped", reason="error") == 2
+    await queue.close()